@@ -1,17 +1,35 @@
 from __future__ import annotations
 
+import functools as _functools
+import itertools as _itertools
 import json as _json
 import pathlib as _pathlib
+import threading as _threading
 from typing import TYPE_CHECKING as _TYPE_CHECKING
 
-from . import array, basic, compile, logical, object_
+from . import (
+    adaptive,
+    array,
+    basic,
+    batch as _batch,
+    cache as _cache,
+    columnar as _columnar,
+    compile,
+    format as _format,
+    iterative as _iterative,
+    logical,
+    memo as _memo,
+    object_,
+    parallel,
+    regex,
+)
 from .format import FORMATS as _FORMATS
 from .resolve import HANDLERS as _HANDLERS, RefTracker as _RefTracker
 from .types import Context as _Context
 
 if _TYPE_CHECKING:
-    from collections.abc import Callable, Iterator
-    from typing import Any
+    from collections.abc import Callable, Iterable, Iterator, Sequence
+    from typing import Any, Literal
 
     from .types import Format, Json, Schema, ValidationError
 
@@ -28,6 +46,7 @@ class Validator:
     """
 
     _metavalidator = None
+    _metavalidator_lock = _threading.Lock()
 
     def __init__(
         self,
@@ -35,7 +54,15 @@ class Validator:
         formats: dict[str, Format] | bool = True,
         handlers: dict[str, Handler] | None = None,
         check_schema: bool = True,
+        iterative: bool = False,
+        lazy: bool = False,
+        adaptive: bool = False,
+        format_memo: int = 0,
+        memo: bool = False,
     ) -> None:
+        if iterative and lazy:
+            raise ValueError("iterative validators cannot be compiled lazily")
+
         if check_schema:
             type(self).check_schema(schema)
 
@@ -46,38 +73,168 @@ class Validator:
         else:
             formats = _FORMATS | formats  # extend with custom formats
 
+        if format_memo:
+            # Remember recent results of pure formats, see `format.pure`
+            formats = _format.memoised(formats, format_memo)
+
         handlers = _HANDLERS | (handlers or {})
         tracker = _RefTracker(schema, handlers=handlers)
-        self._context = _Context(formats=formats, tracker=tracker)
+        self._context = _Context(
+            formats=formats,
+            tracker=tracker,
+            lazy=lazy,
+            adaptive=adaptive,
+            memo=_memo.Memo() if memo else None,
+        )
 
         # NOTE: if there were no $ref item in the schema, we wouldn't need a tracker,
         # it just obscures the logic. However, given that refs exist and can be circular
         # we have to track where we are and where we've been within the schemas:
+        # (when lazy, refs are compiled on first use rather than queued)
         while tracker:
             uri = tracker.pop()
-            with tracker._resolver.resolving(uri) as sub_defn:
-                tracker.compiled[uri] = compile.compile_(sub_defn, self._context)
+            # (a no-op if a ref already compiled this uri, see `compile.link`)
+            compile.link(uri, compile.compile_, tracker.compiled, self._context)
+            compile.link(uri, compile.compile_check, tracker.checks, self._context)
+            if iterative:
+                with tracker._resolver.resolving(uri) as sub_defn:
+                    _iterative.compile_uri(uri, sub_defn, self._context)
 
         self._validator = tracker.entrypoint
+        self._check = tracker.entrypoint_check
+
+        # Compiled on first use, see `columnar_errors`
+        self._schema = schema
+        self._planned = False
+        self._columns: Callable[[Sequence[Any]], list[int]] | None = None
+
+        # Walk instances with an explicit stack, so deep documents can't overflow
+        self._node = tracker.entrypoint_node if iterative else None
+        if self._node is not None:
+            self._check = _functools.partial(_iterative.check, self._node)
+
+        # Each validation gets its own table of subschema outcomes, see `memo`
+        # (the iterative machine always remembers its own)
+        if self._context.memo is not None and self._node is None:
+            self._check = self._context.memo.scoped(self._check)
+            self._validator = self._context.memo.scoped(self._validator)
 
     # Simple validation functions:
 
     def is_valid(self, instance: Any) -> bool:
         """Check whether the given instance is valid."""
-        return not any(self._validator(instance, []))
+        return self._check(instance)
 
     def validate(self, instance: Any) -> None:
         """Validate the instance and raise a ValidationError if it is invalid."""
-        for err in self._validator(instance, []):
+        if self._node is not None:
+            if err := _iterative.first_error(self._node, instance):
+                raise err
+            return
+
+        # Most instances are valid: only build errors once we know we need one
+        if self._check(instance):
+            return
+
+        for err in self.iter_errors(instance):
             raise err
 
+    def validate_many(
+        self,
+        instances: Iterable[Any],
+        mode: Literal["flag", "first", "all"] = "flag",
+        chunksize: int = _batch.CHUNK_SIZE,
+        pause_gc: bool = False,
+        workers: int = 1,
+    ) -> _batch.BatchResult:
+        """Validate many instances, returning which are valid and why not.
+
+        The result holds a byte per instance (1 if valid) and, unless `mode` is
+        "flag", the first or all errors of each invalid instance. See
+        `jsonscreamer.batch` for `chunksize`, `pause_gc` and `workers` (threads).
+        """
+        if mode == "flag":
+            explain = None
+        elif mode == "first":
+            explain = self._first_errors
+        elif mode == "all":
+            explain = self._all_errors
+        else:
+            raise ValueError(f"unknown mode: {mode!r}")
+
+        return _batch.validate_many(
+            self._check, explain, instances, chunksize, pause_gc, workers
+        )
+
     def iter_errors(self, instance: Any) -> Iterator[ValidationError]:
         """Iterate over all validation errors for the instance."""
-        yield from self._validator(instance, [])
+        if self._node is not None:
+            return iter(_iterative.all_errors(self._node, instance))
+        errors: list[ValidationError] = []
+        self._validator(instance, [], errors)
+        return iter(errors)
+
+    def columnar_errors(
+        self, records: Sequence[Any]
+    ) -> dict[int, list[ValidationError]]:
+        """Validate a batch of records, returning the errors of the invalid ones.
+
+        When the schema describes flat records (see `jsonscreamer.columnar`), the
+        batch is checked a property at a time, and only the records which fail
+        are validated one by one for their errors. Iterative validators check
+        each record whole, as the columns are checked recursively.
+        """
+        if not self._planned and self._node is None:
+            with self._context.lock:
+                if not self._planned:  # else another thread planned it
+                    self._columns = _columnar.suspects(self._schema, self._context)
+                    self._planned = True
+
+        find = self._columns
+        if find is None:
+            suspects = [ix for ix, r in enumerate(records) if not self._check(r)]
+        else:
+            suspects = find(records)
+
+        errors = {ix: list(self.iter_errors(records[ix])) for ix in suspects}
+        return {ix: errs for ix, errs in errors.items() if errs}
+
+    def _first_errors(self, instance: Any) -> list[ValidationError]:
+        if self._node is not None:
+            err = _iterative.first_error(self._node, instance)
+            return [] if err is None else [err]
+        return list(_itertools.islice(self.iter_errors(instance), 1))
+
+    def _all_errors(self, instance: Any) -> list[ValidationError]:
+        return list(self.iter_errors(instance))
+
+    def format_info(self) -> dict[str, Any]:
+        """Hit and miss counts for each memoised format, see `format_memo`."""
+        formats = self._context.formats
+        infos = {
+            name: getattr(format, "cache_info", None)
+            for name, format in formats.items()
+        }
+        return {name: info() for name, info in infos.items() if info is not None}
 
     # These are a little more baroque - but basically aimed at loading / creating
     # a schema validator at most once:
 
+    @classmethod
+    def cached(
+        cls,
+        schema: Schema | bool = True,
+        formats: dict[str, Format] | bool = True,
+        handlers: dict[str, Handler] | None = None,
+        **options: Any,
+    ) -> Validator:
+        """Return a shared Validator for the schema, compiling it at most once.
+
+        Takes the same arguments as the constructor, see `jsonscreamer.cache`.
+        """
+        default_cache = _cache.default_cache()
+        return default_cache.get(schema, formats=formats, handlers=handlers, **options)
+
     @classmethod
     def check_schema(cls, schema: Any) -> None:
         """Validate the schema and raise a ValidationError if it is invalid.
@@ -90,13 +247,25 @@ class Validator:
     def metavalidator(cls) -> Validator:
         """Return the Validator for draft 07 schemas."""
         if cls._metavalidator is None:
-            here = _pathlib.Path(__file__).parent
-            with (here / "_metaschemas" / "draft07.json").open() as f:
-                metaschema = _json.load(f)
+            with cls._metavalidator_lock:
+                if cls._metavalidator is None:  # else another thread built it
+                    here = _pathlib.Path(__file__).parent
+                    with (here / "_metaschemas" / "draft07.json").open() as f:
+                        metaschema = _json.load(f)
 
-            cls._metavalidator = cls(metaschema, check_schema=False)
+                    cls._metavalidator = cls(metaschema, check_schema=False)
 
         return cls._metavalidator
 
 
-__all__ = ["Validator", "array", "basic", "compile", "logical", "object_"]
+__all__ = [
+    "Validator",
+    "adaptive",
+    "array",
+    "basic",
+    "compile",
+    "logical",
+    "object_",
+    "parallel",
+    "regex",
+]
@@ -0,0 +1,92 @@
+"""Checks which learn what order to run in from the instances they see.
+
+Enabled with `Validator(schema, adaptive=True)`. For its first `WINDOW` calls,
+each check counts how often each of its parts decided the outcome: the keyword
+which failed, or the `anyOf` branch which matched. It then sorts its parts so
+the most decisive come first, and stops counting.
+
+Only the order in which checks run changes, never their outcome. Errors are
+unaffected, since those always run every keyword.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING as _TYPE_CHECKING
+
+if _TYPE_CHECKING:
+    from .types import Check, Json
+
+WINDOW = 1000
+
+
+def dispatch(table: dict[type, tuple[Check, ...]], fallback: Check) -> Check:
+    """An adaptive version of the `type(x)` dispatch built by `compile_check`.
+
+    Keywords are reordered per type, so the one which most often fails comes first.
+    """
+    failures = {t: [0] * len(fused) for t, fused in table.items()}
+    remaining = WINDOW
+
+    def check(x: Json) -> bool:
+        nonlocal remaining
+        fused = table.get(type(x))
+        if fused is None:
+            return fallback(x)
+
+        if remaining > 0:
+            remaining -= 1
+            ok = True
+            for ix, c in enumerate(fused):
+                if not c(x):
+                    failures[type(x)][ix] += 1
+                    ok = False
+                    break
+
+            if remaining <= 0:
+                for t, counts in failures.items():
+                    table[t] = _by_count(table[t], counts)
+
+            return ok
+
+        for c in fused:
+            if not c(x):
+                return False
+        return True
+
+    return check
+
+
+def first_match(checkers: list[Check]) -> Check:
+    """An adaptive `anyOf`: the branch which most often matches comes first."""
+    order = tuple(checkers)
+    matches = [0] * len(order)
+    remaining = WINDOW
+
+    def check(x: Json) -> bool:
+        nonlocal order, remaining
+        if remaining > 0:
+            remaining -= 1
+            ok = False
+            for ix, c in enumerate(order):
+                if c(x):
+                    matches[ix] += 1
+                    ok = True
+                    break
+
+            if remaining <= 0:
+                order = _by_count(order, matches)
+
+            return ok
+
+        for c in order:
+            if c(x):
+                return True
+        return False
+
+    return check
+
+
+def _by_count(checks: tuple[Check, ...], counts: list[int]) -> tuple[Check, ...]:
+    # Stable, so ties keep their cost order (see `compile._CHECK_COSTS`)
+    ranked = sorted(range(len(checks)), key=lambda ix: -counts[ix])
+    return tuple(checks[ix] for ix in ranked)
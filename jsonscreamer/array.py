@@ -4,24 +4,63 @@ import functools
 from typing import TYPE_CHECKING as _TYPE_CHECKING
 
 from .basic import (
+    _check_type_guard,
+    _freeze,
+    _max_len_check,
     _max_len_validator,
+    _min_len_check,
     _min_len_validator,
-    _strict_bool_nested,
     _type_guard,
 )
-from .compile import compile_ as _compile, register as _register
+from .compile import (
+    compile_ as _compile,
+    compile_branch_check as _compile_branch_check,
+    compile_check as _compile_check,
+    register as _register,
+    register_check as _register_check,
+    register_check_group as _register_check_group,
+)
 from .types import ValidationError
 
 if _TYPE_CHECKING:
-    from collections.abc import Iterable
-    from typing import TypeVar
+    from collections.abc import Callable
+
+    from .types import Check, Context, Json, Path, Schema, Validator
 
-    from .types import Context, Json, Path, Schema, Validator
+# Arrays of numbers at least this long are checked in bulk, see `_numbers_in_bulk`
+BULK_SIZE = 8
 
-    _T = TypeVar("_T")
+# Keywords which don't affect validation, so don't stand in the way of bulk checks
+ANNOTATION_KEYWORDS = frozenset(
+    ("title", "description", "$comment", "default", "examples")
+)
+_BULK_KEYWORDS = ANNOTATION_KEYWORDS | {
+    "type",
+    "minimum",
+    "maximum",
+    "exclusiveMinimum",
+    "exclusiveMaximum",
+    "multipleOf",
+}
+_BULK_TYPES = {"number": frozenset((int, float)), "integer": frozenset((int,))}
+# Larger integers don't survive the trip to a float array
+_EXACT_INTS = 2**53
+# Up to here, `x % value == 0` for integers agrees with `basic._is_multiple`,
+# whose float division can't round a remainder away
+_EXACT_REMAINDERS = 2**52
+
+try:
+    import numpy as _np  # pyright: ignore[reportMissingImports]
+except (
+    ImportError
+):  # optional: without it, fractional `multipleOf` is checked item by item
+    _np = None
 
 
 _array_guard = functools.partial(_type_guard, schema_types=("array",), py_types=list)
+_array_check_guard = functools.partial(
+    _check_type_guard, schema_types=("array",), py_types=list
+)
 
 
 @_register
@@ -31,6 +70,12 @@ def min_items(defn: Schema, context: Context) -> Validator | None:
     return guard(_min_len_validator(value, "minItems"))
 
 
+@_register_check
+def min_items_check(defn: Schema, context: Context) -> Check | None:
+    guard = _array_check_guard(defn)
+    return guard(_min_len_check(defn["minItems"]))
+
+
 @_register
 def max_items(defn: Schema, context: Context) -> Validator | None:
     value: int = defn["maxItems"]
@@ -38,32 +83,24 @@ def max_items(defn: Schema, context: Context) -> Validator | None:
     return guard(_max_len_validator(value, "maxItems"))
 
 
+@_register_check
+def max_items_check(defn: Schema, context: Context) -> Check | None:
+    guard = _array_check_guard(defn)
+    return guard(_max_len_check(defn["maxItems"]))
+
+
+def _is_unique(x: list[Json]) -> bool:
+    # NOTE: frozen, so that e.g. [1, true] and [{"a": 0}, {"a": false}] are unique
+    return len(set(map(_freeze, x))) == len(x)
+
+
 def _unique_checker(
-    x: Json, path: list[str | int], _second_run: bool = False
-) -> Iterable[ValidationError]:
-    # Happy path first, then fall back to more expensive expressions
-    if _second_run:
-        x = _strict_bool_nested(x)  # type: ignore
-
-    ok = True
-    try:
-        ok = len(x) == len(set(x))  # type: ignore (guarded)
-    except TypeError:
-        # No choice but to fall back to O(n^2) algorithm
-        seen = []
-        for item in x:  # type: ignore (guarded)
-            if item in seen:
-                ok = False
-                break
-            seen.append(item)
-
-    if not ok and not _second_run:
-        # Edge case: both booleans and integers in the array
-        # checking this false positive will be slower..
-        ok = not any(_unique_checker(x, path, _second_run=True))
-
-    if not ok:
-        yield ValidationError(tuple(path), f"{x!r} has repeated items", "uniqueItems")
+    x: list[Json], path: list[str | int], errors: list[ValidationError]
+) -> None:
+    if not _is_unique(x):
+        errors.append(
+            ValidationError(tuple(path), f"{x!r} has repeated items", "uniqueItems")
+        )
 
 
 @_register
@@ -73,16 +110,11 @@ def unique_items(defn: Schema, context: Context) -> Validator | None:
         return guard(_unique_checker)
 
 
-def _path_push_iterator(
-    path: Path, iterable: Iterable[_T], offset: int = 0
-) -> Iterable[_T]:
-    path.append(0)  # front-load memory allocation
-    try:
-        for ix, item in enumerate(iterable):
-            path[-1] = ix + offset
-            yield item
-    finally:
-        path.pop()
+@_register_check
+def unique_items_check(defn: Schema, context: Context) -> Check | None:
+    if defn["uniqueItems"]:
+        guard = _array_check_guard(defn)
+        return guard(_is_unique)
 
 
 @_register
@@ -92,21 +124,141 @@ def items(defn: Schema, context: Context) -> Validator | None:
         validators = [_compile(d, context) for d in value]
 
         @_array_guard(defn)
-        def validate(x: list[Json], path: Path) -> Iterable[ValidationError]:
-            for v, i in _path_push_iterator(path, zip(validators, x)):
-                yield from v(i, path)
+        def validate(x: list[Json], path: Path, errors: list[ValidationError]) -> None:
+            path.append(0)  # front-load memory allocation
+            for ix, (v, i) in enumerate(zip(validators, x)):
+                path[-1] = ix
+                v(i, path, errors)
+            path.pop()
 
     else:
         validator = _compile(value, context)
+        bulk = _numbers_in_bulk(value)
 
         @_array_guard(defn)
-        def validate(x: list[Json], path: Path) -> Iterable[ValidationError]:
-            for i in _path_push_iterator(path, x):
-                yield from validator(i, path)
+        def validate(x: list[Json], path: Path, errors: list[ValidationError]) -> None:
+            # Only look at each item when some of them are invalid
+            if bulk is not None and len(x) >= BULK_SIZE and bulk(x):
+                return
+
+            path.append(0)
+            for ix, i in enumerate(x):
+                path[-1] = ix
+                validator(i, path, errors)
+            path.pop()
 
     return validate
 
 
+@_register_check
+def items_check(defn: Schema, context: Context) -> Check | None:
+    value: list[Schema] | Schema = defn["items"]
+    if isinstance(value, list):
+        checkers = [_compile_check(d, context) for d in value]
+
+        @_array_check_guard(defn)
+        def check(x: list[Json]) -> bool:
+            for c, i in zip(checkers, x):
+                if not c(i):
+                    return False
+            return True
+
+    else:
+        checker = _compile_check(value, context)
+        bulk = _numbers_in_bulk(value)
+
+        @_array_check_guard(defn)
+        def check(x: list[Json]) -> bool:
+            if bulk is not None and len(x) >= BULK_SIZE:
+                valid = bulk(x)
+                if valid is not None:
+                    return valid
+
+            for i in x:
+                if not checker(i):
+                    return False
+            return True
+
+    return check
+
+
+def _numbers_in_bulk(defn: Schema | bool) -> Callable[[list[Json]], bool | None] | None:
+    """Check a whole array against a schema for plain numbers, if there is one.
+
+    Arrays of numbers are valid exactly when their least and greatest items are
+    in bounds, which `min` and `max` find without leaving C. The resulting check
+    says whether every item is valid, or None when it can't tell cheaply (e.g.
+    items of other types) and the items should be checked one by one.
+    """
+    if not isinstance(defn, dict) or not defn.keys() <= _BULK_KEYWORDS:
+        return None
+    type_ = defn.get("type")
+    types = _BULK_TYPES.get(type_) if isinstance(type_, str) else None
+    if types is None:
+        return None
+
+    minimum = defn.get("minimum")
+    maximum = defn.get("maximum")
+    exclusive_minimum = defn.get("exclusiveMinimum")
+    exclusive_maximum = defn.get("exclusiveMaximum")
+    multiple_of = defn.get("multipleOf")
+    multiples = None if multiple_of is None else _multiples_in_bulk(multiple_of)
+    remainders = isinstance(multiple_of, int)
+    if multiple_of is not None and multiples is None and not remainders:
+        return None  # every item would be checked one by one anyway
+
+    def bulk(x: list[Json]) -> bool | None:
+        present = set(map(type, x))
+        if not present:
+            return True
+        if not present <= types:
+            return None  # booleans, floats for integers etc.
+        numbers: list[float] = x  # type: ignore (all numbers, checked above)
+
+        if float in present:
+            try:
+                total = sum(numbers)
+            except OverflowError:
+                return None
+            if total != total:
+                return None  # NaN, which `min` and `max` may skip over
+
+        lo, hi = min(numbers), max(numbers)
+        if minimum is not None and lo < minimum:
+            return False
+        if maximum is not None and hi > maximum:
+            return False
+        if exclusive_minimum is not None and lo <= exclusive_minimum:
+            return False
+        if exclusive_maximum is not None and hi >= exclusive_maximum:
+            return False
+
+        if multiple_of is None:
+            return True
+        magnitude = max(-lo, hi)
+        if remainders and float not in present and magnitude <= _EXACT_REMAINDERS:
+            return not any(map(multiple_of.__rmod__, numbers))
+        if multiples is None or (int in present and magnitude > _EXACT_INTS):
+            return None
+        return multiples(numbers)
+
+    return bulk
+
+
+def _multiples_in_bulk(value: float) -> Callable[[list[float]], bool] | None:
+    np = _np
+    if np is None or (isinstance(value, int) and abs(value) > _EXACT_INTS):
+        return None
+
+    def multiples(x: list[float]) -> bool:
+        # As `basic._is_multiple`, for every item at once
+        with np.errstate(all="ignore"):
+            frac = np.asarray(x, dtype=np.float64) / value
+            return bool((np.isfinite(frac) & (np.trunc(frac) == frac)).all())
+
+    return multiples
+
+
 @_register
 def additional_items(defn: Schema, context: Context) -> Validator | None:
     item_spec: dict | list = defn.get("items", {})
@@ -118,81 +270,120 @@ def additional_items(defn: Schema, context: Context) -> Validator | None:
     validator = _compile(defn["additionalItems"], context)
 
     @_array_guard(defn)
-    def validate(x: list[Json], path: Path) -> Iterable[ValidationError]:
-        for i in _path_push_iterator(path, x[offset:], offset):
-            yield from validator(i, path)
+    def validate(x: list[Json], path: Path, errors: list[ValidationError]) -> None:
+        path.append(0)
+        for ix in range(offset, len(x)):
+            path[-1] = ix
+            validator(x[ix], path, errors)
+        path.pop()
 
     return validate
 
 
-@_register
-def contains(defn: Schema, context: Context) -> Validator | None:
-    validator = _compile(defn["contains"], context)
-    if validator is None:
+@_register_check
+def additional_items_check(defn: Schema, context: Context) -> Check | None:
+    item_spec: dict | list = defn.get("items", {})
+    if isinstance(item_spec, dict):
+        # this is a no-op
         return None
 
-    @_array_guard(defn)
-    def validate(x: list[Json], path: Path) -> Iterable[ValidationError]:
-        for i in x:
-            if not any(validator(i, path)):  # XXX: no error => item is in list
-                return ()
-
-        return (
-            ValidationError(
-                tuple(path),
-                f"{x!r} did not contain any items satisfying {defn['contains']!r}",
-                "contains",
-            ),
-        )
+    offset = len(item_spec)
+    checker = _compile_check(defn["additionalItems"], context)
 
-    return validate
+    @_array_check_guard(defn)
+    def check(x: list[Json]) -> bool:
+        for ix in range(offset, len(x)):
+            if not checker(x[ix]):
+                return False
+        return True
+
+    return check
+
+
+_CONTAINS_KEYWORDS = frozenset(("contains", "minContains", "maxContains"))
 
 
 @_register
-def max_contains(defn: Schema, context: Context) -> Validator | None:
-    if "contains" not in defn:
-        return None
+def contains(defn: Schema, context: Context) -> Validator | None:
+    """Validate `contains` along with `minContains` and `maxContains`.
 
-    validator = _compile(defn["contains"], context)
-    value: int = defn["maxContains"]
+    Matches are counted in one pass, which stops once every bound is decided.
+    """
+    checker = _compile_branch_check(defn["contains"], context)
+    lo: int | None = defn.get("minContains")
+    hi: int | None = defn.get("maxContains")
+    enough = max(1, lo or 0, -1 if hi is None else hi + 1)
 
     @_array_guard(defn)
-    def validate(x: list[Json], path: Path) -> Iterable[ValidationError]:
-        total = sum(not any(validator(i, path)) for i in x)
-        if total <= value:
-            return ()
-
-        return (
-            ValidationError(
-                tuple(path),
-                f"{x!r} contains more than {value!r} items satisfying {defn['contains']!r}",
-                "maxContains",
-            ),
-        )
+    def validate(x: list[Json], path: Path, errors: list[ValidationError]) -> None:
+        total = 0
+        for i in x:
+            if checker(i):
+                total += 1
+                if total == enough:
+                    break
+
+        if not total:
+            errors.append(
+                ValidationError(
+                    tuple(path),
+                    f"{x!r} did not contain any items satisfying {defn['contains']!r}",
+                    "contains",
+                )
+            )
+        if lo is not None and total < lo:
+            errors.append(
+                ValidationError(
+                    tuple(path),
+                    f"{x!r} contains less than {lo!r} items satisfying {defn['contains']!r}",
+                    "minContains",
+                )
+            )
+        if hi is not None and total > hi:
+            errors.append(
+                ValidationError(
+                    tuple(path),
+                    f"{x!r} contains more than {hi!r} items satisfying {defn['contains']!r}",
+                    "maxContains",
+                )
+            )
 
     return validate
 
 
-@_register
-def min_contains(defn: Schema, context: Context) -> Validator | None:
+@_register_check_group(*_CONTAINS_KEYWORDS)
+def contains_check(defn: Schema, context: Context) -> tuple[Check | None, set[str]]:
+    """Check `contains` along with `minContains` and `maxContains` in one pass."""
+    handled: set[str] = set(_CONTAINS_KEYWORDS.intersection(defn))
     if "contains" not in defn:
-        return None
+        return None, handled  # the bounds alone mean nothing
 
-    validator = _compile(defn["contains"], context)
-    value: int = defn["minContains"]
+    checker = _compile_branch_check(defn["contains"], context)
+    lo: int = max(1, defn.get("minContains", 1))
+    hi: int | None = defn.get("maxContains")
 
-    @_array_guard(defn)
-    def validate(x: list[Json], path: Path) -> Iterable[ValidationError]:
-        total = sum(not any(validator(i, path)) for i in x)
-        if total >= value:
-            return ()
-
-        return (
-            ValidationError(
-                tuple(path),
-                f"{x!r} contains less than {value!r} items satisfying {defn['contains']!r}",
-                "minContains",
-            ),
-        )
+    if hi is None:
 
-    return validate
+        @_array_check_guard(defn)
+        def check(x: list[Json]) -> bool:
+            needed = lo
+            for i in x:
+                if checker(i):
+                    needed -= 1
+                    if not needed:
+                        return True
+            return False
+
+    else:
+
+        @_array_check_guard(defn)
+        def check(x: list[Json]) -> bool:
+            total = 0
+            for i in x:
+                if checker(i):
+                    total += 1
+                    if total > hi:
+                        return False
+            return total >= lo
+
+    return check, handled
@@ -12,104 +12,95 @@ from __future__ import annotations
 
 import functools as _functools
 import logging as _logging
-import re as _re
 from typing import TYPE_CHECKING as _TYPE_CHECKING
 
-from .compile import register as _register
+from .compile import (
+    guarded as _guarded,
+    register as _register,
+    register_check as _register_check,
+)
+from .regex import searcher as _searcher
 from .types import ValidationError
 
 if _TYPE_CHECKING:
-    from collections.abc import Callable, Collection, Iterable
+    from collections.abc import Callable, Hashable, Iterable
     from typing import Any
 
-    from .types import Context, Json, Path, Schema, Validator
+    from .types import Check, Context, Json, Path, Schema, Validator
 
 
-class _StrictBool:
-    """Exists purely because 0 == False in python.
+class _Bool:
+    """Stands in for a boolean in `_freeze`, since `0 == False` in python."""
 
-    Casting to this type will ensure that 0 != False, [0] != [False] etc.
-    """
+    __slots__ = ("value",)
 
-    def __init__(self, value: float | bool) -> None:
+    def __init__(self, value: bool) -> None:
         self.value = value
 
-    def __str__(self) -> str:
-        return str(self.value)
-
     def __repr__(self) -> str:
-        return f"<_StrictBool({self.value!r})>"
-
-    def __hash__(self) -> int:
-        return hash(self.value)
-
-    def __eq__(self, other: object) -> bool:
-        return (
-            self.value is other
-            or (
-                self.value == other
-                and not isinstance(self.value, bool)
-                and not isinstance(other, bool)
-            )
-            or (
-                isinstance(other, self.__class__)
-                and (
-                    self.value is other.value
-                    or (
-                        self.value == other.value
-                        and not isinstance(self.value, bool)
-                        and not isinstance(other.value, bool)
-                    )
-                )
-            )
-        )
+        return f"<_Bool({self.value!r})>"
 
-    __req__ = __eq__
 
+__true = _Bool(True)
+__false = _Bool(False)
 
-__true = _StrictBool(True)
-__false = _StrictBool(False)
-__one = _StrictBool(1)
-__zero = _StrictBool(0)
 
+def _freeze(x: object) -> Hashable:
+    """A hashable form of a JSON value, equal only to that of an equal value.
 
-def _strict_bool_nested(x: object) -> object:
-    """Convert possible bools in nested data structures to _StrictBool"""
-    if isinstance(x, list):
-        return [_strict_bool_nested(v) for v in x]
-    elif isinstance(x, dict):
-        return {k: _strict_bool_nested(v) for k, v in x.items()}
-    elif x is True:
+    Lists become tuples and objects frozensets of their items, while booleans
+    are replaced so that `0 != False`, `[1] != [True]` etc. Numbers are compared
+    as usual, so `1 == 1.0`.
+    """
+    if x is True:
         return __true
     elif x is False:
         return __false
-    elif x == 1:
-        return __one
-    elif x == 0:
-        return __zero
-    return x
+    elif isinstance(x, list):
+        return tuple(map(_freeze, x))
+    elif isinstance(x, dict):
+        return frozenset(zip(x, map(_freeze, x.values())))
+    return x  # other JSON values are hashable
 
 
 def _min_len_validator(n: int, kind: str) -> Validator:
-    def validate(x: Json, path: Path) -> Iterable[ValidationError]:
+    def validate(x: Json, path: Path, errors: list[ValidationError]) -> None:
         if len(x) < n:  # type: ignore (assumption: sized object provided)
-            yield ValidationError(
-                tuple(path), f"{x!r} is too short (min length {n})", kind
+            errors.append(
+                ValidationError(
+                    tuple(path), f"{x!r} is too short (min length {n})", kind
+                )
             )
 
     return validate
 
 
 def _max_len_validator(n: int, kind: str) -> Validator:
-    def validate(x: Json, path: Path) -> Iterable[ValidationError]:
+    def validate(x: Json, path: Path, errors: list[ValidationError]) -> None:
         if len(x) > n:  # type: ignore (assumption: sized object provided)
-            yield ValidationError(
-                tuple(path), f"{x!r} is too long (max length {n})", kind
+            errors.append(
+                ValidationError(
+                    tuple(path), f"{x!r} is too long (max length {n})", kind
+                )
             )
 
     return validate
 
 
+def _min_len_check(n: int) -> Check:
+    def check(x: Json) -> bool:
+        return len(x) >= n  # type: ignore (assumption: sized object provided)
+
+    return check
+
+
+def _max_len_check(n: int) -> Check:
+    def check(x: Json) -> bool:
+        return len(x) <= n  # type: ignore (assumption: sized object provided)
+
+    return check
+
+
 @_register
 def min_length(defn: Schema, context: Context) -> Validator | None:
     value: int = defn["minLength"]
@@ -117,6 +108,12 @@ def min_length(defn: Schema, context: Context) -> Validator | None:
     return guard(_min_len_validator(value, "minLength"))
 
 
+@_register_check
+def min_length_check(defn: Schema, context: Context) -> Check | None:
+    guard = _string_check_guard(defn)
+    return guard(_min_len_check(defn["minLength"]))
+
+
 @_register
 def max_length(defn: Schema, context: Context) -> Validator | None:
     value: int = defn["maxLength"]
@@ -124,54 +121,91 @@ def max_length(defn: Schema, context: Context) -> Validator | None:
     return guard(_max_len_validator(value, "maxLength"))
 
 
+@_register_check
+def max_length_check(defn: Schema, context: Context) -> Check | None:
+    guard = _string_check_guard(defn)
+    return guard(_max_len_check(defn["maxLength"]))
+
+
 @_register
 def pattern(defn: Schema, context: Context) -> Validator | None:
     value: str = defn["pattern"]
-    rex = _re.compile(value)
+    search = _searcher(value)
 
     @_string_guard(defn)
-    def validate(x: str, path: Path) -> Iterable[ValidationError]:
-        if not rex.search(x):
-            yield ValidationError(
-                tuple(path), f"{x!r} does not match pattern {value!r}", "pattern"
+    def validate(x: str, path: Path, errors: list[ValidationError]) -> None:
+        if not search(x):
+            errors.append(
+                ValidationError(
+                    tuple(path), f"{x!r} does not match pattern {value!r}", "pattern"
+                )
             )
 
     return validate
 
 
+@_register_check
+def pattern_check(defn: Schema, context: Context) -> Check | None:
+    guard = _string_check_guard(defn)
+    return guard(_searcher(defn["pattern"]))
+
+
+def _member_check(values: Iterable[object]) -> Check:
+    frozen = frozenset(map(_freeze, values))
+    booleans = frozenset(m.value for m in frozen if isinstance(m, _Bool))
+    # Everything else hashable is its own frozen form
+    scalars = frozen - {__true, __false}
+    containers = any(isinstance(m, (tuple, frozenset)) for m in frozen)
+
+    def check(x: Json) -> bool:
+        if x is True or x is False:
+            return x in booleans
+        try:
+            return x in scalars
+        except TypeError:  # a list or an object
+            return containers and _freeze(x) in frozen
+
+    return check
+
+
 @_register
 def enum(defn: Schema, context: Context) -> Validator:
     value: list[object] = defn["enum"]
+    is_member = _member_check(value)
 
-    members: Collection[object] = list(map(_strict_bool_nested, value))
-    try:
-        members = set(members)
-    except TypeError:
-        pass  # Unhashable have to use O(n) lookup
-
-    def validate(x: Json, path: Path) -> Iterable[ValidationError]:
-        try:
-            if x not in members:
-                yield ValidationError(
-                    tuple(path), f"{x!r} is not one of {value!r}", "enum"
-                )
-        except TypeError:  # checking if unhashable type in a set of hashable objects
-            yield ValidationError(tuple(path), f"{x!r} is not one of {value!r}", "enum")
+    def validate(x: Json, path: Path, errors: list[ValidationError]) -> None:
+        if not is_member(x):
+            errors.append(
+                ValidationError(tuple(path), f"{x!r} is not one of {value!r}", "enum")
+            )
 
     return validate
 
 
+@_register_check
+def enum_check(defn: Schema, context: Context) -> Check:
+    return _member_check(defn["enum"])
+
+
 @_register
 def const(defn: Schema, context: Context) -> Validator:
-    value: object = _strict_bool_nested(defn["const"])
+    value: object = defn["const"]
+    is_value = _member_check((value,))
 
-    def validate(x: Json, path: Path) -> Iterable[ValidationError]:
-        if x != value:
-            yield ValidationError(tuple(path), f"{x!r} is not {value!r}", "const")
+    def validate(x: Json, path: Path, errors: list[ValidationError]) -> None:
+        if not is_value(x):
+            errors.append(
+                ValidationError(tuple(path), f"{x!r} is not {value!r}", "const")
+            )
 
     return validate
 
 
+@_register_check
+def const_check(defn: Schema, context: Context) -> Check:
+    return _member_check((defn["const"],))
+
+
 @_register
 def format_(defn: Schema, context: Context) -> Validator | None:
     value: str = defn["format"]
@@ -179,10 +213,12 @@ def format_(defn: Schema, context: Context) -> Validator | None:
         format = context.formats[value]
 
         @_string_guard(defn)
-        def validate(x: str, path: Path) -> Iterable[ValidationError]:
+        def validate(x: str, path: Path, errors: list[ValidationError]) -> None:
             if not format(x):
-                yield ValidationError(
-                    tuple(path), f"{x!r} does not match format {value!r}", "format"
+                errors.append(
+                    ValidationError(
+                        tuple(path), f"{x!r} does not match format {value!r}", "format"
+                    )
                 )
 
         return validate
@@ -190,79 +226,154 @@ def format_(defn: Schema, context: Context) -> Validator | None:
     _logging.warning(f"Unsupported format {value!r} will not be checked")
 
 
+@_register_check
+def format_check(defn: Schema, context: Context) -> Check | None:
+    value: str = defn["format"]
+    if value in context.formats:
+        format = context.formats[value]
+
+        # Custom formats may return any truthy value, e.g. a `re.Match`
+        @_string_check_guard(defn)
+        def check(x: str) -> bool:
+            return bool(format(x))
+
+        return check
+
+    return None  # the warning is already logged by `format_`
+
+
 @_register
 def minimum(defn: Schema, context: Context) -> Validator | None:
     value: float | int = defn["minimum"]
 
     @_number_guard(defn)
-    def validate(x: float, path: Path) -> Iterable[ValidationError]:
+    def validate(x: float, path: Path, errors: list[ValidationError]) -> None:
         if x < value:
-            yield ValidationError(tuple(path), f"{x!r} < {value!r}", "minimum")
+            errors.append(ValidationError(tuple(path), f"{x!r} < {value!r}", "minimum"))
 
     return validate
 
 
+@_register_check
+def minimum_check(defn: Schema, context: Context) -> Check | None:
+    value: float | int = defn["minimum"]
+
+    @_number_check_guard(defn)
+    def check(x: float) -> bool:
+        return x >= value
+
+    return check
+
+
 @_register
 def exclusive_minimum(defn: Schema, context: Context) -> Validator | None:
     value: float | int = defn["exclusiveMinimum"]
 
     @_number_guard(defn)
-    def validate(x: float, path: Path) -> Iterable[ValidationError]:
+    def validate(x: float, path: Path, errors: list[ValidationError]) -> None:
         if x <= value:
-            yield ValidationError(
-                tuple(path), f"{x!r} <= {value!r}", "exclusiveMinimum"
+            errors.append(
+                ValidationError(tuple(path), f"{x!r} <= {value!r}", "exclusiveMinimum")
             )
 
     return validate
 
 
+@_register_check
+def exclusive_minimum_check(defn: Schema, context: Context) -> Check | None:
+    value: float | int = defn["exclusiveMinimum"]
+
+    @_number_check_guard(defn)
+    def check(x: float) -> bool:
+        return x > value
+
+    return check
+
+
 @_register
 def maximum(defn: Schema, context: Context) -> Validator | None:
     value: float | int = defn["maximum"]
 
     @_number_guard(defn)
-    def validate(x: float, path: Path) -> Iterable[ValidationError]:
+    def validate(x: float, path: Path, errors: list[ValidationError]) -> None:
         if x > value:
-            yield ValidationError(tuple(path), f"{x!r} > {value!r}", "maximum")
+            errors.append(ValidationError(tuple(path), f"{x!r} > {value!r}", "maximum"))
 
     return validate
 
 
+@_register_check
+def maximum_check(defn: Schema, context: Context) -> Check | None:
+    value: float | int = defn["maximum"]
+
+    @_number_check_guard(defn)
+    def check(x: float) -> bool:
+        return x <= value
+
+    return check
+
+
 @_register
 def exclusive_maximum(defn: Schema, context: Context) -> Validator | None:
     value: float | int = defn["exclusiveMaximum"]
 
     @_number_guard(defn)
-    def validate(x: float, path: Path) -> Iterable[ValidationError]:
+    def validate(x: float, path: Path, errors: list[ValidationError]) -> None:
         if x >= value:
-            yield ValidationError(
-                tuple(path), f"{x!r} >= {value!r}", "exclusiveMaximum"
+            errors.append(
+                ValidationError(tuple(path), f"{x!r} >= {value!r}", "exclusiveMaximum")
             )
 
     return validate
 
 
+@_register_check
+def exclusive_maximum_check(defn: Schema, context: Context) -> Check | None:
+    value: float | int = defn["exclusiveMaximum"]
+
+    @_number_check_guard(defn)
+    def check(x: float) -> bool:
+        return x < value
+
+    return check
+
+
 @_register
 def multiple_of(defn: Schema, context: Context) -> Validator | None:
     value: float | int = defn["multipleOf"]
 
     @_number_guard(defn)
-    def validate(x: float, path: Path) -> Iterable[ValidationError]:
-        # More accurate than x % multiplier == 0
-        try:
-            frac = x / value
-            if int(frac) == frac:
-                return None
-        except OverflowError:
-            pass
-
-        yield ValidationError(
-            tuple(path), f"{x!r} is not a multiple of {value!r}", "multipleOf"
-        )
+    def validate(x: float, path: Path, errors: list[ValidationError]) -> None:
+        if not _is_multiple(x, value):
+            errors.append(
+                ValidationError(
+                    tuple(path), f"{x!r} is not a multiple of {value!r}", "multipleOf"
+                )
+            )
 
     return validate
 
 
+@_register_check
+def multiple_of_check(defn: Schema, context: Context) -> Check | None:
+    value: float | int = defn["multipleOf"]
+
+    @_number_check_guard(defn)
+    def check(x: float) -> bool:
+        return _is_multiple(x, value)
+
+    return check
+
+
+def _is_multiple(x: float, value: float) -> bool:
+    # More accurate than x % multiplier == 0
+    try:
+        frac = x / value
+        return int(frac) == frac
+    except OverflowError:
+        return False
+
+
 def _type_guard(
     defn: Schema, schema_types: tuple[str, ...], py_types: tuple[type, ...] | type
 ) -> ...:
@@ -280,27 +391,64 @@ def _type_guard(
     """
 
     def decorator(
-        validator: Callable[[Any, Path], Iterable[ValidationError]],
+        validator: Callable[[Any, Path, list[ValidationError]], None],
     ) -> Validator:
-        if "type" in defn:
-            types = (
-                {defn["type"]} if isinstance(defn["type"], str) else set(defn["type"])
-            )
-            if types.issubset(schema_types):
-                # we can omit type check as it's guaranteed by the schema
-                return validator  # pyright: ignore[reportReturnType] (protected by schema type)
+        if _type_guaranteed(defn, schema_types):
+            # we can omit type check as it's guaranteed by the schema
+            return validator  # pyright: ignore[reportReturnType] (protected by schema type)
 
         @_functools.wraps(validator)
-        def guarded(x: Json, path: Path) -> Iterable[ValidationError]:
+        def guarded(x: Json, path: Path, errors: list[ValidationError]) -> None:
             if isinstance(x, py_types):
-                yield from validator(x, path)
+                validator(x, path, errors)
 
-        return guarded
+        return _guarded(validator, guarded, _as_tuple(py_types))
 
     return decorator
 
 
+def _check_type_guard(
+    defn: Schema, schema_types: tuple[str, ...], py_types: tuple[type, ...] | type
+) -> ...:
+    """Create a type guard suitable for decorating a predicate check.
+
+    As with `_type_guard`, instances of other types are not our concern so they
+    are considered valid.
+    """
+
+    def decorator(check: Callable[[Any], bool]) -> Check:
+        if _type_guaranteed(defn, schema_types):
+            return check
+
+        @_functools.wraps(check)
+        def guarded(x: Json) -> bool:
+            return not isinstance(x, py_types) or check(x)
+
+        return _guarded(check, guarded, _as_tuple(py_types))
+
+    return decorator
+
+
+def _as_tuple(py_types: tuple[type, ...] | type) -> tuple[type, ...]:
+    return py_types if isinstance(py_types, tuple) else (py_types,)
+
+
+def _type_guaranteed(defn: Schema, schema_types: tuple[str, ...]) -> bool:
+    """Whether the schema's own type check already restricts to these types."""
+    if "type" not in defn:
+        return False
+
+    types = {defn["type"]} if isinstance(defn["type"], str) else set(defn["type"])
+    return types.issubset(schema_types)
+
+
 _number_guard = _functools.partial(
     _type_guard, schema_types=("number", "integer"), py_types=(int, float)
 )
 _string_guard = _functools.partial(_type_guard, schema_types=("string",), py_types=str)
+_number_check_guard = _functools.partial(
+    _check_type_guard, schema_types=("number", "integer"), py_types=(int, float)
+)
+_string_check_guard = _functools.partial(
+    _check_type_guard, schema_types=("string",), py_types=str
+)
@@ -0,0 +1,130 @@
+"""Validate many instances in one call, see `Validator.validate_many`.
+
+The instances are taken a chunk at a time, so a generator of records is never
+held in memory at once. Each chunk is checked by mapping the validator's check
+over it straight into a `bytearray`, so there is no per-instance Python loop,
+and only the invalid instances are revisited for their errors.
+
+With `workers` above 1 the chunks are validated by a pool of threads. Compiled
+validators are safe to share between threads: once built they are immutable
+closures, apart from state which is either per thread (see `memo`), guarded by
+the context's lock (lazy compilation and columnar plans) or only a hint (the
+counters of `adaptive` checks, which may miscount but never change an outcome).
+Under the GIL threads only help when the checks release it (e.g. custom formats
+doing I/O). On a free-threaded build (PEP 703) they run in parallel.
+"""
+
+from __future__ import annotations
+
+import collections as _collections
+import concurrent.futures as _futures
+import gc as _gc
+import itertools as _itertools
+from dataclasses import dataclass
+from typing import TYPE_CHECKING as _TYPE_CHECKING
+
+if _TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+    from .types import Check, Json, ValidationError
+
+# How many instances to take from the iterable at a time
+CHUNK_SIZE = 10_000
+
+# How many chunks to keep in flight per worker, so that reading the instances
+# never gets far ahead of validating them
+CHUNKS_PER_WORKER = 2
+
+
+@dataclass
+class BatchResult:
+    """The outcome of validating many instances."""
+
+    # One byte per instance, in order: 1 if it is valid and 0 if not
+    valid: bytearray
+    # The errors of the invalid instances by index, unless only flagged
+    errors: dict[int, list[ValidationError]]
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    def invalid(self) -> Iterator[int]:
+        """The indices of the invalid instances."""
+        ix = self.valid.find(0)
+        while ix != -1:
+            yield ix
+            ix = self.valid.find(0, ix + 1)
+
+
+def validate_many(
+    check: Check,
+    explain: Callable[[Json], list[ValidationError]] | None,
+    instances: Iterable[Json],
+    chunksize: int = CHUNK_SIZE,
+    pause_gc: bool = False,
+    workers: int = 1,
+) -> BatchResult:
+    """Check every instance, and `explain` those which are invalid (if given).
+
+    Pausing the garbage collector saves the collections triggered by the
+    objects created along the way (errors, or the instances themselves when
+    they come from a generator), which nothing here makes cyclic. With more
+    than one worker, chunks are validated by a thread pool, in order.
+    """
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be positive, not {chunksize!r}")
+    if workers < 1:
+        raise ValueError(f"workers must be positive, not {workers!r}")
+
+    result = BatchResult(bytearray(), {})
+    resume_gc = pause_gc and _gc.isenabled()
+    if resume_gc:
+        _gc.disable()
+
+    try:
+        iterator = iter(instances)
+        chunks = iter(lambda: list(_itertools.islice(iterator, chunksize)), [])
+        if workers == 1:
+            for chunk in chunks:
+                _merge(result, *_validate_chunk(check, explain, chunk))
+        else:
+            with _futures.ThreadPoolExecutor(workers) as pool:
+                pending: _collections.deque[_futures.Future] = _collections.deque()
+                for chunk in chunks:
+                    if len(pending) >= workers * CHUNKS_PER_WORKER:
+                        _merge(result, *pending.popleft().result())
+                    pending.append(pool.submit(_validate_chunk, check, explain, chunk))
+                while pending:
+                    _merge(result, *pending.popleft().result())
+    finally:
+        if resume_gc:
+            _gc.enable()
+
+    return result
+
+
+def _validate_chunk(
+    check: Check,
+    explain: Callable[[Json], list[ValidationError]] | None,
+    chunk: list[Json],
+) -> tuple[bytearray, dict[int, list[ValidationError]]]:
+    flags = bytearray(map(check, chunk))
+    errors = {}
+    if explain is not None:
+        ix = flags.find(0)
+        while ix != -1:
+            errors[ix] = explain(chunk[ix])
+            ix = flags.find(0, ix + 1)
+    return flags, errors
+
+
+def _merge(
+    result: BatchResult,
+    flags: bytearray,
+    errors: dict[int, list[ValidationError]],
+) -> None:
+    # Append the result of the next chunk
+    offset = len(result.valid)
+    result.valid += flags
+    for ix, errs in errors.items():
+        result.errors[offset + ix] = errs
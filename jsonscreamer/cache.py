@@ -0,0 +1,199 @@
+"""A process-wide cache of compiled validators.
+
+Building a `Validator` checks the schema, walks it for `$ref` targets and
+compiles every subschema. When the same schemas are used over and over (e.g.
+per-tenant schemas loaded in request handlers) we only want to pay that once:
+
+    >>> from jsonscreamer import Validator
+    >>> validator = Validator.cached({"type": "string"})
+    >>> validator is Validator.cached({"type": "string"})
+    True
+
+Entries are keyed by a canonical fingerprint of the schema and the options it
+was compiled with, so equal schemas hit the same entry even when they are
+different objects (or have their keys in a different order).
+
+Passing the very same schema object again skips the fingerprint, so cached
+schemas must not be mutated in place: build a new schema instead.
+"""
+
+from __future__ import annotations
+
+import collections as _collections
+import hashlib as _hashlib
+import json as _json
+import threading as _threading
+from typing import TYPE_CHECKING as _TYPE_CHECKING, NamedTuple as _NamedTuple
+
+if _TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+    from typing import Any
+
+    from . import Validator
+    from .types import Format, Json, Schema
+
+# Rough cost of a compiled validator: a fixed overhead plus a multiple of the
+# canonical schema size (measured with tracemalloc on a range of schemas).
+_BASE_BYTES = 4096
+_BYTES_PER_SCHEMA_BYTE = 40
+
+
+class CacheInfo(_NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    currsize: int
+    maxsize: int | None
+    nbytes: int
+    max_bytes: int | None
+
+
+class ValidatorCache:
+    """An LRU cache of validators, bounded by count and estimated memory.
+
+    Usage:
+        >>> cache = ValidatorCache(maxsize=1024, max_bytes=64 * 1024 * 1024)
+        >>> validator = cache.get({"type": "integer"}, formats=False)
+        >>> cache.cache_info().misses
+        1
+    """
+
+    def __init__(self, maxsize: int | None = 128, max_bytes: int | None = None) -> None:
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+
+        self._entries: _collections.OrderedDict[Hashable, tuple[Validator, int]] = (
+            _collections.OrderedDict()
+        )
+        # Schemas seen by identity, held so their ids can't be reused, and the
+        # identities under each entry's key (to forget them on eviction)
+        self._seen: dict[Hashable, tuple[Schema | bool, Hashable]] = {}
+        self._aliases: dict[Hashable, list[Hashable]] = {}
+        self._lock = _threading.Lock()
+        self._hits = self._misses = self._evictions = self._nbytes = 0
+
+    def get(
+        self,
+        schema: Schema | bool = True,
+        formats: dict[str, Format] | bool = True,
+        handlers: dict[str, Callable[[str], Json]] | None = None,
+        **options: Any,
+    ) -> Validator:
+        """Return a validator for the schema, building it on a miss.
+
+        Takes the same arguments as `Validator`.
+        """
+        seen_key = (id(schema), _options_key(formats, handlers, options))
+        with self._lock:
+            seen = self._seen.get(seen_key)
+            if seen is not None and seen[1] in self._entries:
+                self._entries.move_to_end(seen[1])
+                self._hits += 1
+                return self._entries[seen[1]][0]
+
+        key, nbytes = fingerprint(schema, formats, handlers, **options)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._remember(seen_key, schema, key)
+                self._hits += 1
+                return entry[0]
+
+            self._misses += 1
+
+        # XXX: import here must be deferred to prevent cyclic imports
+        from . import Validator
+
+        # Build outside of the lock: compilation can be slow, and racing to
+        # build the same validator twice is harmless.
+        validator = Validator(schema, formats=formats, handlers=handlers, **options)
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (validator, nbytes)
+                self._nbytes += nbytes
+                self._remember(seen_key, schema, key)
+                self._evict()
+
+            return self._entries.get(key, (validator, nbytes))[0]
+
+    def cache_info(self) -> CacheInfo:
+        """Report cache statistics, like `functools.lru_cache`."""
+        with self._lock:
+            return CacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                currsize=len(self._entries),
+                maxsize=self.maxsize,
+                nbytes=self._nbytes,
+                max_bytes=self.max_bytes,
+            )
+
+    def clear(self) -> None:
+        """Drop all entries and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._seen.clear()
+            self._aliases.clear()
+            self._hits = self._misses = self._evictions = self._nbytes = 0
+
+    def _evict(self) -> None:
+        # The newest entry is always kept, even if it alone is over budget
+        while len(self._entries) > 1 and (
+            (self.maxsize is not None and len(self._entries) > self.maxsize)
+            or (self.max_bytes is not None and self._nbytes > self.max_bytes)
+        ):
+            key, (_, nbytes) = self._entries.popitem(last=False)
+            for seen_key in self._aliases.pop(key, ()):
+                del self._seen[seen_key]
+            self._nbytes -= nbytes
+            self._evictions += 1
+
+    def _remember(
+        self, seen_key: Hashable, schema: Schema | bool, key: Hashable
+    ) -> None:
+        # Let the same schema object find its entry again without a fingerprint
+        if seen_key not in self._seen:
+            self._seen[seen_key] = (schema, key)
+            self._aliases.setdefault(key, []).append(seen_key)
+
+
+def fingerprint(
+    schema: Schema | bool,
+    formats: dict[str, Format] | bool = True,
+    handlers: dict[str, Callable[[str], Json]] | None = None,
+    **options: Any,
+) -> tuple[Hashable, int]:
+    """Build a cache key for a validator, and an estimate of its size in bytes.
+
+    The schema is hashed via its canonical JSON encoding, whereas format and
+    handler callables are compared by identity.
+    """
+    canonical = _json.dumps(schema, sort_keys=True, separators=(",", ":"))
+    digest = _hashlib.sha256(canonical.encode()).hexdigest()
+
+    key = (digest, *_options_key(formats, handlers, options))
+    return key, _BASE_BYTES + _BYTES_PER_SCHEMA_BYTE * len(canonical)
+
+
+def _options_key(
+    formats: dict[str, Format] | bool,
+    handlers: dict[str, Callable[[str], Json]] | None,
+    options: dict[str, Any],
+) -> tuple[Hashable, ...]:
+    return (
+        formats if isinstance(formats, bool) else tuple(sorted(formats.items())),
+        tuple(sorted((handlers or {}).items())),
+        tuple(sorted(options.items())),
+    )
+
+
+_DEFAULT_CACHE = ValidatorCache()
+
+
+def default_cache() -> ValidatorCache:
+    """The cache used by `Validator.cached`."""
+    return _DEFAULT_CACHE
@@ -0,0 +1,188 @@
+"""Validate a batch of records against an object schema, a column at a time.
+
+Tabular feeds are lists of objects with the same properties. Rather than walk
+every record, `suspects` transposes the batch into one column per property and
+checks each column as a whole: the values' types with `set(map(type, ...))`,
+numbers against their bounds with `min`/`max` (and NumPy for `multipleOf`, see
+`array._numbers_in_bulk`), strings against their lengths and an `enum` with set
+operations. Only the columns which fail are checked value by value, to find the
+records responsible. Those are then validated as usual for their errors, see
+`Validator.columnar_errors`.
+
+Schemas with keywords on the record other than `type`, `properties`, `required`
+and a boolean `additionalProperties` are checked one record at a time.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING as _TYPE_CHECKING
+
+from .array import ANNOTATION_KEYWORDS as _ANNOTATION_KEYWORDS, _numbers_in_bulk
+from .compile import compile_check as _compile_check
+
+if _TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from .types import Check, Context, Json, Schema
+
+    Bulk = Callable[[list[Json]], bool | None]
+
+# Failing columns are split in half down to this size, see `_failures`
+_SPLIT_SIZE = 16
+
+# Keywords on the record which a columnar plan can handle (or ignore)
+_RECORD_KEYWORDS = _ANNOTATION_KEYWORDS | {
+    "type",
+    "properties",
+    "required",
+    "additionalProperties",
+    "definitions",
+    "$schema",
+    "$id",
+}
+_SCALAR_KEYWORDS = _ANNOTATION_KEYWORDS | {
+    "type",
+    "enum",
+    "const",
+    "minLength",
+    "maxLength",
+}
+_PY_TYPES: dict[str, frozenset[type]] = {
+    "string": frozenset((str,)),
+    "number": frozenset((int, float)),
+    "integer": frozenset((int,)),
+    "boolean": frozenset((bool,)),
+    "null": frozenset((type(None),)),
+}
+# Values which compare in a set as they do in an `enum` (unlike booleans, as 1 == True)
+_SET_TYPES = frozenset((str, int, float, type(None)))
+
+
+def suspects(
+    defn: Schema | bool, context: Context
+) -> Callable[[Sequence[Json]], list[int]] | None:
+    """Compile a function finding the records of a batch which may be invalid.
+
+    The records it doesn't return are all valid. Returns None if the schema
+    doesn't lend itself to columns.
+    """
+    if not isinstance(defn, dict) or not defn.keys() <= _RECORD_KEYWORDS:
+        return None
+    if defn.get("type", "object") != "object":
+        return None
+    additional = defn.get("additionalProperties", True)
+    if not isinstance(additional, bool):
+        return None
+
+    properties: dict[str, Schema | bool] = defn.get("properties", {})
+    names = frozenset(properties)
+    required = frozenset(defn.get("required", ()))
+    record_check = _compile_check(defn, context)
+
+    columns: list[tuple[str, Check | None, Bulk | None]] = []
+    for k in [*properties, *(required - names)]:
+        subschema = properties.get(k, True)
+        if subschema is True or subschema == {}:
+            if k in required:
+                columns.append((k, None, None))  # only its presence is checked
+        else:
+            check = _compile_check(subschema, context)
+            columns.append((k, check, _in_bulk(subschema)))
+
+    def find(records: Sequence[Json]) -> list[int]:
+        if set(map(type, records)) != {dict}:
+            # Not a table after all (or an empty one)
+            return [ix for ix, r in enumerate(records) if not record_check(r)]
+
+        rows: Sequence[dict[str, Json]] = records  # type: ignore (checked above)
+        found: set[int] = set()
+
+        if additional is False and not set().union(*rows) <= names:
+            found.update(ix for ix, r in enumerate(rows) if not r.keys() <= names)
+
+        for k, check, bulk in columns:
+            values = [r[k] for r in rows if k in r]
+            owners = None
+            if len(values) < len(rows):
+                owners = [ix for ix, r in enumerate(rows) if k in r]
+                if k in required:
+                    found.update(ix for ix, r in enumerate(rows) if k not in r)
+            if check is None:
+                continue
+
+            failed = _failures(values, check, bulk)
+            found.update(failed if owners is None else (owners[i] for i in failed))
+
+        return sorted(found)
+
+    return find
+
+
+def _failures(values: list[Json], check: Check, bulk: Bulk | None) -> list[int]:
+    # The positions of the invalid values. Columns which fail in bulk are split
+    # in half until the halves pass, so a few bad values in a long column only
+    # cost a few more bulk checks.
+    failed: list[int] = []
+    spans = [(0, len(values))]
+    while spans:
+        start, stop = spans.pop()
+        valid = None
+        if bulk is not None and stop - start > _SPLIT_SIZE:
+            valid = bulk(values[start:stop])
+        if valid is None:
+            failed.extend(i for i in range(start, stop) if not check(values[i]))
+        elif not valid:
+            middle = (start + stop) // 2
+            spans += [(middle, stop), (start, middle)]
+    return sorted(failed)
+
+
+def _in_bulk(defn: Schema | bool) -> Bulk | None:
+    # Whether every value of a column is valid, if a whole column can tell
+    numbers = _numbers_in_bulk(defn)
+    if numbers is not None:
+        return numbers
+    if not isinstance(defn, dict) or not defn.keys() <= _SCALAR_KEYWORDS:
+        return None
+
+    type_ = defn.get("type")
+    if type_ is None:
+        types = _SET_TYPES
+    else:
+        names = [type_] if isinstance(type_, str) else type_
+        if not all(n in _PY_TYPES for n in names):
+            return None
+        types = frozenset().union(*(_PY_TYPES[n] for n in names))
+
+    members = None
+    if "enum" in defn:
+        members = frozenset(v for v in defn["enum"] if type(v) in _SET_TYPES)
+    if "const" in defn:
+        const = defn["const"]
+        allowed = frozenset((const,)) if type(const) in _SET_TYPES else frozenset()
+        members = allowed if members is None else members & allowed
+
+    lengths = "minLength" in defn or "maxLength" in defn
+    min_length: int = defn.get("minLength", 0)
+    max_length: int | None = defn.get("maxLength")
+
+    def bulk(values: list[Json]) -> bool | None:
+        present = set(map(type, values))
+        if not present <= types:
+            return None
+        if members is not None:
+            if not present <= _SET_TYPES:
+                return None  # booleans are told apart from numbers one by one
+            if not set(values) <= members:
+                return False
+        if lengths and values:
+            if present != {str}:
+                return None
+            sizes = list(map(len, values))  # type: ignore (all strings)
+            if min(sizes) < min_length:
+                return False
+            if max_length is not None and max(sizes) > max_length:
+                return False
+        return True
+
+    return bulk
@@ -1,19 +1,89 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING as _TYPE_CHECKING
-
+import inspect as _inspect
+import types as _types
+import warnings as _warnings
+from typing import (
+    TYPE_CHECKING as _TYPE_CHECKING,
+    Generic as _Generic,
+    TypeVar as _TypeVar,
+)
+
+from . import adaptive as _adaptive
 from .types import ValidationError
 
 if _TYPE_CHECKING:
-    from collections.abc import Callable, Iterable
-    from typing import TypeVar
-
-    from .types import Compiler, Context, Json, Path, Schema, Validator
-
-    _CT = TypeVar("_CT", bound=Compiler)
-
+    from collections.abc import Callable, Hashable, Iterable
+
+    from .types import (
+        Check,
+        CheckCompiler,
+        CheckGroupCompiler,
+        Compiler,
+        Context,
+        Json,
+        Path,
+        Schema,
+        Validator,
+    )
+
+    _CT = _TypeVar("_CT", bound=Compiler)
+    _CCT = _TypeVar("_CCT", bound=CheckCompiler)
+    _GCT = _TypeVar("_GCT", bound=CheckGroupCompiler)
+
+
+_T = _TypeVar("_T")
+
+# Rough relative cost of checking each keyword, so that a check can fail fast:
+# O(1) checks first, then linear scans, regexes and formats, then descending
+# into sub-instances, and finally combinators (which may run whole subschemas).
+_CHECK_COSTS = {
+    **dict.fromkeys(
+        (
+            "const",
+            "enum",
+            "minLength",
+            "maxLength",
+            "minimum",
+            "maximum",
+            "exclusiveMinimum",
+            "exclusiveMaximum",
+            "multipleOf",
+            "required",
+            "minProperties",
+            "maxProperties",
+            "minItems",
+            "maxItems",
+        ),
+        0,
+    ),
+    **dict.fromkeys(("pattern", "format", "uniqueItems", "dependencies"), 1),
+    **dict.fromkeys(
+        (
+            "properties",
+            "patternProperties",
+            "additionalProperties",
+            "propertyNames",
+            "items",
+            "additionalItems",
+            "contains",
+            "minContains",
+            "maxContains",
+        ),
+        2,
+    ),
+    **dict.fromkeys(("allOf", "anyOf", "oneOf", "not", "if"), 3),
+}
+_UNKNOWN_CHECK_COST = 2  # e.g. custom keywords
 
+# Ref chains are linked by compiling their targets recursively: past this many
+# we fall back to late binding, so long chains can't exhaust the stack
+_MAX_LINK_DEPTH = 32
+# The types of JSON scalars, whose reprs tell them apart (e.g. 1, 1.0 and True)
+_SCALARS = frozenset((str, int, float, bool, type(None)))
 _COMPILATION_FUNCTIONS: dict[str, Compiler] = {}
+_CHECK_FUNCTIONS: dict[str, CheckCompiler] = {}
+_CHECK_GROUPS: list[tuple[frozenset[str], CheckGroupCompiler]] = []
 _TYPE_CHECKERS = {
     "object": lambda x: isinstance(x, dict),
     "array": lambda x: isinstance(x, list),
@@ -21,11 +91,22 @@ _TYPE_CHECKERS = {
     "number": lambda x: (isinstance(x, (float, int)) and not isinstance(x, bool)),
     "integer": lambda x: (
         (isinstance(x, int) and not isinstance(x, bool))
-        or (isinstance(x, float) and x == int(x))
+        or (isinstance(x, float) and x.is_integer())
     ),
     "boolean": lambda x: isinstance(x, bool),
     "null": lambda x: x is None,
 }
+# The exact python types which `type(x)` dispatch is keyed on. Floats are only
+# integers if they have no fractional part, so they are left to the slow path.
+_DISPATCH_TYPES: dict[str, tuple[type, ...]] = {
+    "object": (dict,),
+    "array": (list,),
+    "string": (str,),
+    "number": (int, float),
+    "integer": (int,),
+    "boolean": (bool,),
+    "null": (type(None),),
+}
 
 
 def type_(
@@ -33,8 +114,9 @@ def type_(
 ) -> Callable[[Json, Path], ValidationError | None]:
     """Create a validator to check the type of an item.
 
-    Unlike other validators we do not yield a value, but return it, since we
-    want to break early and not run the other validations if they type check fails.
+    Unlike other validators we do not append to the errors, but return the error,
+    since we want to break early and not run the other validations if they type
+    check fails.
     """
     required_type: str | list[str] = defn["type"]
 
@@ -51,22 +133,103 @@ def type_(
         type_checkers = [_TYPE_CHECKERS[v] for v in required_type]
 
         def validate(x: Json, path: Path) -> ValidationError | None:
-            if not any(t(x) for t in type_checkers):
-                return ValidationError(
-                    tuple(path),
-                    f"{x!r} is not any of the types {required_type!r}",
-                    "type",
-                )
+            for t in type_checkers:
+                if t(x):
+                    return None
+
+            return ValidationError(
+                tuple(path),
+                f"{x!r} is not any of the types {required_type!r}",
+                "type",
+            )
 
     return validate
 
 
+def type_check(defn: Schema, context: Context) -> Check:
+    """Create a predicate to check the type of an item."""
+    required_type: str | list[str] = defn["type"]
+
+    if isinstance(required_type, str):
+        return _TYPE_CHECKERS[required_type]
+
+    type_checkers = [_TYPE_CHECKERS[v] for v in required_type]
+
+    def check(x: Json) -> bool:
+        for t in type_checkers:
+            if t(x):
+                return True
+        return False
+
+    return check
+
+
 def register(validator: _CT) -> _CT:
-    """Register a validator for compiling a given type."""
+    """Register a validator for compiling a given type.
+
+    Compiled validators used to be generators, `validate(x, path)` yielding
+    their errors. Compilers returning those still work (with a deprecation
+    warning): their validators are adapted to append to the errors instead.
+    """
     _COMPILATION_FUNCTIONS[_name_from_validator(validator)] = validator
     return validator
 
 
+def _adapted(key: str, validator: Validator) -> Validator:
+    # Validators returned by custom compilers, in the current style
+    if not _is_legacy(validator):
+        return validator
+
+    _warnings.warn(
+        f"the validator compiled for {key!r} takes (x, path): validators now take"
+        " (x, path, errors) and append to errors",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+    legacy: Callable[[Json, Path], Iterable[ValidationError]] = validator  # type: ignore (checked above)
+
+    def validate(x: Json, path: Path, errors: list[ValidationError]) -> None:
+        errors.extend(legacy(x, path))
+
+    return validate
+
+
+def _is_legacy(validator: Callable) -> bool:
+    # Whether a validator has the old `(x, path)` signature
+    if isinstance(validator, _types.FunctionType):
+        code = validator.__code__
+        return code.co_argcount == 2 and not code.co_flags & _inspect.CO_VARARGS
+    try:
+        parameters = _inspect.signature(validator).parameters
+    except (TypeError, ValueError):
+        return False
+    return len(parameters) == 2
+
+
+def register_check_group(*keywords: str) -> Callable[[_GCT], _GCT]:
+    """Register a predicate check compiled once for several keywords together.
+
+    The compiler returns the check (or None) along with the keywords it took
+    care of, which are then not compiled individually. This lets e.g. all the
+    keywords concerning an object's keys share the work of looking at them.
+    """
+
+    def decorator(group: _GCT) -> _GCT:
+        _CHECK_GROUPS.append((frozenset(keywords), group))
+        return group
+
+    return decorator
+
+
+def register_check(check: _CCT) -> _CCT:
+    """Register a predicate check for compiling a given type.
+
+    The keyword is taken from the function name, minus its "_check" suffix.
+    """
+    _CHECK_FUNCTIONS[_name_from_validator(check).removesuffix("Check")] = check
+    return check
+
+
 def compile_(defn: Schema | bool, context: Context) -> Validator:
     if defn is True or defn == {}:
         return _true
@@ -75,36 +238,70 @@ def compile_(defn: Schema | bool, context: Context) -> Validator:
     elif not isinstance(defn, dict):
         raise ValueError("definition must be a boolean or object")
 
+    # NOTE: `interned`, inlined to keep the stack shallow for deeply nested schemas
+    key = _intern_key(_compile_schema, defn, context)
+    validate = context.interned.get(key)
+    if validate is not None:
+        context.shared += 1
+    elif context.lazy:
+        validate = context.interned[key] = _lazy(defn, context)
+    else:
+        validate = context.interned[key] = _compile_schema(defn, context)
+
+    return validate
+
+
+def _compile_schema(defn: Schema, context: Context) -> Validator:
     if "$ref" in defn:
-        validate = compile_ref(defn, context)
+        return compile_ref(defn, context)
+
+    type_validator = None
+    validators = []
+    for key in defn:
+        if key == "type":
+            type_validator = type_(defn, context)
+        elif key in _COMPILATION_FUNCTIONS:
+            validator = _COMPILATION_FUNCTIONS[key](defn, context)
+            if validator is not None:
+                validators.append(_adapted(key, validator))
+
+    if type_validator:
+        if not validators:
+            return _type_only(type_validator)
+
+        def validate(x: Json, path: Path, errors: list[ValidationError]) -> None:
+            if err := type_validator(x, path):
+                errors.append(err)
+            else:
+                for v in validators:
+                    v(x, path, errors)
+
+        reject = _type_only(type_validator)
 
     else:
-        type_validator = None
-        validators = []
-        for key in defn:
-            if key == "type":
-                type_validator = type_(defn, context)
-            elif key in _COMPILATION_FUNCTIONS:
-                validator = _COMPILATION_FUNCTIONS[key](defn, context)
-                if validator is not None:
-                    validators.append(validator)
-
-        if type_validator:
-
-            def validate(x: Json, path: Path) -> Iterable[ValidationError]:
-                if err := type_validator(x, path):
-                    yield err
-                else:
-                    for v in validators:
-                        yield from v(x, path)
+        if not validators:
+            return _true
+        elif len(validators) == 1:
+            return validators[0]
 
-        else:
+        def validate(x: Json, path: Path, errors: list[ValidationError]) -> None:
+            for v in validators:
+                v(x, path, errors)
 
-            def validate(x: Json, path: Path) -> Iterable[ValidationError]:
-                for v in validators:
-                    yield from v(x, path)
+        reject = _true  # never used, as every type is allowed
 
-    return validate
+    # Instances of exactly the JSON types skip straight to the relevant keywords
+    table = fuse(defn, validators, reject)
+
+    def dispatch(x: Json, path: Path, errors: list[ValidationError]) -> None:
+        fused = table.get(type(x))
+        if fused is None:
+            validate(x, path, errors)
+        else:
+            for v in fused:
+                v(x, path, errors)
+
+    return dispatch
 
 
 def compile_ref(defn: Schema, context: Context) -> Validator:
@@ -112,15 +309,377 @@ def compile_ref(defn: Schema, context: Context) -> Validator:
 
     with tracker._resolver.in_scope(defn["$ref"]):
         uri = tracker._resolver.get_uri()
+        if context.lazy:
+            compiled = tracker.compiled
+
+            def validate(x: Json, path: Path, errors: list[ValidationError]) -> None:
+                validator = compiled.get(uri)
+                if validator is None:
+                    validator = _compile_uri_lazily(uri, context)[0]
+                validator(x, path, errors)
+
+            return validate
+
         if uri not in tracker._picked:
             tracker.queue(uri)
 
-        def validate(x: Json, path: Path) -> Iterable[ValidationError]:
-            yield from tracker.compiled[uri](x, path)
+        # Call the target directly, unless it's still being compiled (a cycle)
+        if (target := link(uri, compile_, tracker.compiled, context)) is not None:
+            return target
+
+        def validate(x: Json, path: Path, errors: list[ValidationError]) -> None:
+            tracker.compiled[uri](x, path, errors)
 
         return validate
 
 
+def compile_check(defn: Schema | bool, context: Context) -> Check:
+    """Compile a predicate which only answers whether an instance is valid.
+
+    This mirrors `compile_`, but the resulting checks track no paths, build no
+    errors and stop at the first failure.
+    """
+    if defn is True or defn == {}:
+        return _always
+    elif defn is False:
+        return _never
+    elif not isinstance(defn, dict):
+        raise ValueError("definition must be a boolean or object")
+
+    # NOTE: `interned`, inlined to keep the stack shallow for deeply nested schemas
+    key = _intern_key(_compile_schema_check, defn, context)
+    check = context.interned.get(key)
+    if check is not None:
+        context.shared += 1
+    elif context.lazy:
+        check = context.interned[key] = _lazy_check(defn, context)
+    else:
+        check = context.interned[key] = _compile_schema_check(defn, context)
+
+    return check
+
+
+def compile_branch_check(defn: Schema | bool, context: Context) -> Check:
+    """Compile the check for a combinator's subschema, see `memo`."""
+    check = compile_check(defn, context)
+    if context.memo is None or check is _always or check is _never:
+        return check
+    return context.memo.check(check)
+
+
+def _compile_schema_check(defn: Schema, context: Context) -> Check:
+    if "$ref" in defn:
+        return compile_ref_check(defn, context)
+
+    handled: set[str] = set()
+    costed: list[tuple[int, Check]] = []
+    for keywords, group in _CHECK_GROUPS:
+        if not keywords.isdisjoint(defn):
+            checker, group_handled = group(defn, context)
+            handled.update(group_handled)
+            if checker is not None:
+                costed.append((max(map(_check_cost, group_handled)), checker))
+
+    type_checker = None
+    for key in defn:
+        if key == "type":
+            type_checker = type_check(defn, context)
+        elif key in handled:
+            continue
+        elif key in _CHECK_FUNCTIONS:
+            checker = _CHECK_FUNCTIONS[key](defn, context)
+            if checker is not None:
+                costed.append((_check_cost(key), checker))
+        elif key in _COMPILATION_FUNCTIONS:
+            checker = _errors_check(key, defn, context)
+            if checker is not None:
+                costed.append((_check_cost(key), checker))
+
+    # Unlike errors, which are all collected, checks stop at the first failure
+    costed.sort(key=lambda pair: pair[0])
+    checks = [checker for _, checker in costed]
+
+    if not checks:
+        return _always if type_checker is None else type_checker
+    elif type_checker is None:
+        if len(checks) == 1:
+            return checks[0]
+
+        def check(x: Json) -> bool:
+            for c in checks:
+                if not c(x):
+                    return False
+            return True
+
+    else:
+
+        def check(x: Json) -> bool:
+            if not type_checker(x):
+                return False
+            for c in checks:
+                if not c(x):
+                    return False
+            return True
+
+    # Instances of exactly the JSON types skip straight to the relevant keywords
+    table = fuse(defn, checks, _never)
+    if context.adaptive:
+        return _adaptive.dispatch(table, check)
+
+    def dispatch(x: Json) -> bool:
+        fused = table.get(type(x))
+        if fused is None:
+            return check(x)
+        for c in fused:
+            if not c(x):
+                return False
+        return True
+
+    return dispatch
+
+
+def _errors_check(key: str, defn: Schema, context: Context) -> Check | None:
+    # A keyword registered without a check (e.g. a custom one): run its
+    # validator and see whether it found any errors
+    validator = _COMPILATION_FUNCTIONS[key](defn, context)
+    if validator is None:
+        return None
+    validator = _adapted(key, validator)
+
+    def check(x: Json) -> bool:
+        errors: list[ValidationError] = []
+        validator(x, [], errors)
+        return not errors
+
+    return check
+
+
+def compile_ref_check(defn: Schema, context: Context) -> Check:
+    tracker = context.tracker
+
+    with tracker._resolver.in_scope(defn["$ref"]):
+        uri = tracker._resolver.get_uri()
+        if context.lazy:
+            checks = tracker.checks
+
+            def check(x: Json) -> bool:
+                checker = checks.get(uri)
+                if checker is None:
+                    checker = _compile_uri_lazily(uri, context)[1]
+                return checker(x)
+
+            return check
+
+        if uri not in tracker._picked:
+            tracker.queue(uri)
+
+        if (target := link(uri, compile_check, tracker.checks, context)) is not None:
+            return target
+
+        def check(x: Json) -> bool:
+            return tracker.checks[uri](x)
+
+        return check
+
+
+def link(
+    uri: str,
+    compiler: Callable[[Schema | bool, Context], _T],
+    targets: dict[str, _T],
+    context: Context,
+) -> _T | None:
+    """Compile the schema at a uri into `targets`, if it isn't there already.
+
+    Refs call the result directly rather than looking it up on every call.
+    Returns None if the uri is already being compiled further up the stack
+    (i.e. the refs are cyclic), so the caller must bind to it late.
+    """
+    if uri in targets:
+        return targets[uri]
+
+    tracker = context.tracker
+    key = (compiler, uri)
+    if key in tracker._linking or len(tracker._linking) >= _MAX_LINK_DEPTH:
+        return None
+
+    tracker._linking.add(key)
+    try:
+        with tracker._resolver.resolving(uri) as sub_defn:
+            target = targets[uri] = compiler(sub_defn, context)
+    finally:
+        tracker._linking.discard(key)
+
+    return target
+
+
+def _compile_uri_lazily(uri: str, context: Context) -> tuple[Validator, Check]:
+    # As the tracker loop in `Validator.__init__` would have done, but on demand
+    tracker = context.tracker
+    with context.lock:
+        if uri not in tracker.checks:  # else another thread got here first
+            tracker._picked.add(uri)
+            link(uri, compile_, tracker.compiled, context)
+            link(uri, compile_check, tracker.checks, context)
+
+        return tracker.compiled[uri], tracker.checks[uri]
+
+
+def _lazy(defn: Schema, context: Context) -> Validator:
+    """Defer compiling a subschema until an instance first reaches it."""
+    deferred = _Deferred(_compile_schema, defn, context)
+    compiled = None
+
+    def validate(x: Json, path: Path, errors: list[ValidationError]) -> None:
+        nonlocal compiled
+        if compiled is None:
+            compiled = deferred.get()
+        compiled(x, path, errors)
+
+    return validate
+
+
+def _lazy_check(defn: Schema, context: Context) -> Check:
+    """Defer compiling a subschema's check until an instance first reaches it."""
+    deferred = _Deferred(_compile_schema_check, defn, context)
+    compiled = None
+
+    def check(x: Json) -> bool:
+        nonlocal compiled
+        if compiled is None:
+            compiled = deferred.get()
+        return compiled(x)
+
+    return check
+
+
+class _Deferred(_Generic[_T]):
+    """A compilation, run at most once and in the scope it was requested in."""
+
+    def __init__(
+        self, compiler: Callable[[Schema, Context], _T], defn: Schema, context: Context
+    ) -> None:
+        self.compiler = compiler
+        self.defn = defn
+        self.context = context
+        self.scope = context.tracker._resolver.snapshot()
+        self.result: _T | None = None
+
+    def get(self) -> _T:
+        resolver = self.context.tracker._resolver
+        with self.context.lock:
+            if self.result is None:
+                with resolver.restored(self.scope):
+                    self.result = self.compiler(self.defn, self.context)
+
+            return self.result
+
+
+def fuse(defn: Schema, compiled: list[_T], reject: _T) -> dict[type, tuple[_T, ...]]:
+    """Fuse a schema's keywords into one sequence of callables per JSON type.
+
+    The result is keyed on `type(x)`, mapping to `(reject,)` for types which the
+    schema does not allow. Type guarded keywords (see `guarded`) are included
+    unguarded for the types they apply to, and left out for the rest. Types not
+    in the table (e.g. subclasses) must fall back to the unfused keywords.
+    """
+    types = defn.get("type", list(_DISPATCH_TYPES))
+    types = [types] if isinstance(types, str) else types
+
+    allowed: set[type] = set()
+    for t in types:
+        allowed.update(_DISPATCH_TYPES[t])
+
+    table: dict[type, tuple[_T, ...]] = {}
+    for py_type in set().union(*_DISPATCH_TYPES.values()):
+        if py_type not in allowed:
+            table[py_type] = (reject,)
+            continue
+
+        fused = []
+        for c in compiled:
+            applies_to = getattr(c, "applies_to", None)
+            if applies_to is None:
+                fused.append(c)
+            elif issubclass(py_type, applies_to):  # as `isinstance` in the guard
+                fused.append(c.__wrapped__)  # type: ignore (set by guarded)
+
+        table[py_type] = tuple(fused)
+
+    if "integer" in types and "number" not in types:
+        del table[float]  # only some floats are integers: take the slow path
+
+    return table
+
+
+def guarded(wrapped: Callable, guard: _T, py_types: tuple[type, ...]) -> _T:
+    """Mark a type guarded keyword, so that `fuse` can dispatch around the guard.
+
+    The keyword `wrapped` must only apply to exactly the instances of the given
+    `py_types`, including their subclasses (so `bool` for `int`).
+    """
+    guard.__wrapped__ = wrapped  # type: ignore (function attribute)
+    guard.applies_to = py_types  # type: ignore (function attribute)
+    return guard
+
+
+def _type_only(
+    type_validator: Callable[[Json, Path], ValidationError | None],
+) -> Validator:
+    def validate(x: Json, path: Path, errors: list[ValidationError]) -> None:
+        if err := type_validator(x, path):
+            errors.append(err)
+
+    return validate
+
+
+def interned(
+    compiler: Callable[[Schema, Context], _T], defn: Schema, context: Context
+) -> _T:
+    """Compile a subschema, sharing the result with identical subschemas.
+
+    Real schemas repeat fragments like `{"type": "string", "maxLength": 255}`
+    many times over. These leaves are keyed by their contents and resolution
+    scope (which determines what a `$ref` points to), so each distinct fragment
+    is compiled once per compiler. `context.shared` counts the saves.
+
+    Errors are reported in the order the keywords are written, so only checks
+    are shared between fragments which differ just in the order of their keys.
+    """
+    key = _intern_key(compiler, defn, context)
+    compiled = context.interned.get(key)
+    if compiled is None:
+        compiled = context.interned[key] = compiler(defn, context)
+    else:
+        context.shared += 1
+
+    return compiled
+
+
+def _intern_key(compiler: Callable, defn: Schema, context: Context) -> Hashable:
+    # Only leaves (subschemas with no others inside) are shared: these are what
+    # schemas repeat, and their key is one repr where a whole subtree's key
+    # would cost time in its size at every level of a deep schema
+    for k, v in defn.items():
+        if type(k) is not str:
+            return object()
+        if type(v) not in _SCALARS and (
+            type(v) is not list or not all(type(i) in _SCALARS for i in v)
+        ):
+            return object()  # not a leaf (or not JSON), so never shared
+
+    ordered = compiler is not _compile_schema_check
+    scope = context.tracker._resolver.resolution_scope
+    return (
+        compiler,
+        scope,
+        repr(list(defn.items()) if ordered else sorted(defn.items())),
+    )
+
+
+def _check_cost(keyword: str) -> int:
+    return _CHECK_COSTS.get(keyword, _UNKNOWN_CHECK_COST)
+
+
 def _name_from_validator(validator: Callable) -> str:
     pieces = validator.__name__.strip("_").split("_")
     # JSON Scheam uses camelCase
@@ -130,9 +689,17 @@ def _name_from_validator(validator: Callable) -> str:
     return "".join(pieces)
 
 
-def _true(x: Json, path: Path) -> tuple[ValidationError, ...]:
-    return ()
+def _true(x: Json, path: Path, errors: list[ValidationError]) -> None:
+    pass
+
+
+def _false(x: Json, path: Path, errors: list[ValidationError]) -> None:
+    errors.append(ValidationError(tuple(path), f"{x!r} cannot satisfy false", "false"))
+
+
+def _always(x: Json) -> bool:
+    return True
 
 
-def _false(x: Json, path: Path) -> tuple[ValidationError]:
-    return (ValidationError(tuple(path), f"{x!r} cannot satisfy false", "false"),)
+def _never(x: Json) -> bool:
+    return False
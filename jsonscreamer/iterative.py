@@ -0,0 +1,676 @@
+"""Validation with an explicit work stack instead of Python recursion.
+
+The schema is compiled to a graph of `Node` objects: every keyword which only
+looks at the current instance is folded into a single predicate (`Node.leaf`),
+while keywords which descend into sub-instances or combine sub-schemas become
+`ops`. Instances are then walked by `check`, which keeps one suspended frame per
+open node on a list rather than on the interpreter stack, so the nesting depth
+of a document is limited only by memory.
+
+`$ref` targets are linked to the very same `Node` object, so recursive schemas
+are just cycles in the graph.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING as _TYPE_CHECKING
+
+from .compile import (
+    _always,
+    compile_ as _compile,
+    compile_check as _compile_check,
+    interned as _interned,
+)
+from .object_ import (
+    additional_keys as _additional_keys,
+    classify_keys as _classify_keys,
+)
+from .regex import compiled as _compiled
+from .types import ValidationError
+
+if _TYPE_CHECKING:
+    from collections.abc import Generator, Iterator
+
+    from .types import Check, Context, Json, Schema, Validator
+
+    Link = tuple["Link", str | int] | None
+    Frame = Generator[tuple["Node", Json, Link], bool | None, bool]
+    CollectFrame = Generator[tuple["Node", Json, Link, bool], bool | None, bool]
+
+
+# Keywords which are handled by the machine, rather than the leaf predicate
+_STRUCTURAL = frozenset(
+    (
+        "properties",
+        "patternProperties",
+        "additionalProperties",
+        "propertyNames",
+        "items",
+        "additionalItems",
+        "contains",
+        "minContains",
+        "maxContains",
+        "allOf",
+        "anyOf",
+        "oneOf",
+        "not",
+        "if",
+        "then",
+        "else",
+    )
+)
+
+
+# Ops whose failures are explained by their children's errors, when collecting
+# them all: the other ops are judged as a whole, see `_collect`
+_DESCENDING = frozenset(
+    (
+        "properties",
+        "patternProperties",
+        "additionalProperties",
+        "propertyNames",
+        "items",
+        "tupleItems",
+        "additionalItems",
+        "allOf",
+    )
+)
+
+
+class Node:
+    """A compiled schema: a leaf predicate followed by structural ops."""
+
+    __slots__ = (
+        "_alone",
+        "_leaf_validator",
+        "context",
+        "defn",
+        "leaf",
+        "leaf_defn",
+        "ops",
+    )
+
+    def __init__(self, context: Context) -> None:
+        self.context = context
+        self.defn: Schema | bool = True
+        self.leaf: Check | None = None
+        self.leaf_defn: Schema | bool = True
+        self.ops: list[tuple] = []
+        self._leaf_validator: Validator | None = None
+        self._alone: dict[int, Node] = {}
+
+    def alone(self, ix: int) -> Node:
+        """A node with just the op at `ix`, to judge that op on its own."""
+        node = self._alone.get(ix)
+        if node is None:
+            node = self._alone[ix] = Node(self.context)
+            node.defn = self.defn
+            node.ops = [self.ops[ix]]
+        return node
+
+    def leaf_errors(
+        self, x: Json, path: tuple[str | int, ...]
+    ) -> list[ValidationError]:
+        """Explain why `leaf` failed, using the regular error engine."""
+        if self._leaf_validator is None:
+            self._leaf_validator = _compile(self.leaf_defn, self.context)
+
+        errors: list[ValidationError] = []
+        self._leaf_validator(x, list(path), errors)
+        return errors
+
+
+def compile_uri(uri: str, defn: Schema | bool, context: Context) -> Node:
+    """Compile the schema for a resolved uri into its (possibly shared) node."""
+    node = _node_for(uri, context)
+    if isinstance(defn, dict) and "$ref" in defn:
+        node.defn = defn
+        node.ops = [("allOf", [compile_node(defn, context)])]
+    else:
+        _fill(node, defn, context)
+
+    return node
+
+
+def compile_node(defn: Schema | bool, context: Context) -> Node:
+    if isinstance(defn, dict) and "$ref" in defn:
+        tracker = context.tracker
+        with tracker._resolver.in_scope(defn["$ref"]):
+            uri = tracker._resolver.get_uri()
+            if uri not in tracker._picked:
+                tracker.queue(uri)
+
+            return _node_for(uri, context)
+    elif isinstance(defn, dict):
+        return _interned(_new_node, defn, context)
+
+    return _new_node(defn, context)
+
+
+def _new_node(defn: Schema | bool, context: Context) -> Node:
+    node = Node(context)
+    _fill(node, defn, context)
+    return node
+
+
+def _node_for(uri: str, context: Context) -> Node:
+    nodes = context.tracker.nodes
+    if uri not in nodes:
+        nodes[uri] = Node(context)  # filled in once the tracker reaches it
+
+    return nodes[uri]
+
+
+def _fill(node: Node, defn: Schema | bool, context: Context) -> None:
+    node.defn = defn
+    if defn is True or defn is False:
+        node.leaf_defn = defn
+        node.leaf = None if defn else _compile_check(defn, context)
+        return
+    elif not isinstance(defn, dict):
+        raise ValueError("definition must be a boolean or object")
+
+    leaf_defn = {k: v for k, v in defn.items() if k not in _STRUCTURAL}
+    dependencies = defn.get("dependencies") or {}
+    if dependencies:
+        # Only the list form is a leaf check, the schema form descends
+        leaf_defn["dependencies"] = {
+            k: v for k, v in dependencies.items() if isinstance(v, list)
+        }
+        schemas = [
+            (k, compile_node(v, context))
+            for k, v in dependencies.items()
+            if not isinstance(v, list)
+        ]
+        if schemas:
+            node.ops.append(("dependencies", schemas))
+
+    node.leaf_defn = leaf_defn
+    leaf = _compile_check(leaf_defn, context)
+    node.leaf = None if leaf is _always else leaf
+
+    for key, value in defn.items():
+        if key == "properties":
+            nodes = {k: compile_node(v, context) for k, v in value.items()}
+            node.ops.append(("properties", nodes))
+        elif key == "patternProperties":
+            classify = _classify_keys([_compiled(k) for k in value])
+            nodes = [compile_node(v, context) for v in value.values()]
+            node.ops.append(("patternProperties", classify, nodes))
+        elif key == "additionalProperties":
+            node.ops.append(
+                (
+                    "additionalProperties",
+                    compile_node(value, context),
+                    _additional_keys(defn),
+                )
+            )
+        elif key == "propertyNames":
+            node.ops.append(("propertyNames", compile_node(value, context)))
+        elif key == "items":
+            if isinstance(value, list):
+                nodes = [compile_node(v, context) for v in value]
+                node.ops.append(("tupleItems", nodes))
+            else:
+                node.ops.append(("items", compile_node(value, context)))
+        elif key == "additionalItems" and isinstance(defn.get("items"), list):
+            offset = len(defn["items"])
+            node.ops.append(("additionalItems", compile_node(value, context), offset))
+        elif key == "contains":
+            node.ops.append(
+                (
+                    "contains",
+                    compile_node(value, context),
+                    defn.get("minContains"),
+                    defn.get("maxContains"),
+                )
+            )
+        elif key in ("allOf", "anyOf", "oneOf"):
+            node.ops.append((key, [compile_node(v, context) for v in value]))
+        elif key == "not":
+            node.ops.append(("not", compile_node(value, context)))
+        elif key == "if" and ("then" in defn or "else" in defn):
+            node.ops.append(
+                (
+                    "if",
+                    compile_node(value, context),
+                    compile_node(defn.get("then", True), context),
+                    compile_node(defn.get("else", True), context),
+                )
+            )
+
+
+def check(node: Node, x: Json) -> bool:
+    """Whether the instance is valid against the compiled node."""
+    return _Machine().run(node, x)
+
+
+def all_errors(node: Node, x: Json) -> list[ValidationError]:
+    """Find every error for the instance, as `iter_errors` does."""
+    return _Machine().collect(node, x)
+
+
+def first_error(node: Node, x: Json) -> ValidationError | None:
+    """Find an error for the instance, or None if it is valid."""
+    machine = _Machine()
+    if machine.run(node, x):
+        return None
+
+    blame = machine.blame  # every failure records its blame
+    return blame.error() if blame is not None else None
+
+
+class _Machine:
+    """Drives the evaluation frames of a single validation.
+
+    Pairs of a node and an instance reached through combinators and refs are
+    evaluated at most once per run: finished outcomes are remembered, so
+    combinators which reach the same subschema along several paths don't
+    evaluate it again. A pair which is reached again while it is still being
+    evaluated can never finish, as with a `$ref` back to the schema under
+    `anyOf`, and raises a RecursionError like the other engines. Instances are
+    told apart by identity, and all stay alive (as parts of the root instance)
+    for the whole run.
+    """
+
+    __slots__ = ("blame",)
+
+    def __init__(self) -> None:
+        self.blame: _Blame | None = None
+
+    def run(self, root: Node, x: Json, link: Link = None) -> bool:
+        # Per frame on the stack: its instance, and the key and link of its pair
+        # if it is tracked. Only pairs reached without descending (through
+        # combinators and refs) can recur or be reached twice, so only those
+        # are tracked, as in progress and then done.
+        open_: list[tuple[Json, tuple[int, int] | None, Link]] = [(x, None, None)]
+        active: set[tuple[int, int]] = set()
+        done: dict[tuple[int, int], tuple[bool, Link, _Blame | None]] = {}
+
+        stack: list[Frame] = [_evaluate(root, x, link, self)]
+        result: bool | None = None
+        while stack:
+            try:
+                node, child, link = stack[-1].send(result)
+            except StopIteration as stop:
+                stack.pop()
+                result = bool(stop.value)
+                _, key, opened_at = open_.pop()
+                if key is not None:
+                    active.discard(key)
+                    done[key] = (result, opened_at, None if result else self.blame)
+                continue
+
+            if not node.ops:
+                if node.leaf is None or node.leaf(child):
+                    result = True  # leaf-only nodes need no frame of their own
+                else:
+                    self.blame = _Blame(link, node, child)
+                    result = False
+                continue
+
+            key = None
+            if child is open_[-1][0]:
+                key = (id(node), id(child))
+                if key in done:
+                    result, opened_at, blame = done[key]
+                    if not result:
+                        self.blame = _relinked(blame, opened_at, link)
+                    continue
+                elif key in active:
+                    raise RecursionError(
+                        f"schema recurses on the same instance: {node.defn!r}"
+                    )
+                active.add(key)
+
+            open_.append((child, key, link))
+            stack.append(_evaluate(node, child, link, self))
+            result = None
+
+        return bool(result)
+
+    def collect(self, root: Node, x: Json) -> list[ValidationError]:
+        """Collect every error, see `_collect`.
+
+        Children which are only judged (rather than explained) are each
+        evaluated with `run`, so the stack stays flat in either case. Shared
+        subtrees that pass are explained once, as in `run`.
+        """
+        errors: list[ValidationError] = []
+        # Per frame: its instance, its pair, and whether the pair is active
+        open_: list[tuple[Json, tuple[int, int], bool]] = [
+            (x, (id(root), id(x)), False)
+        ]
+        active: set[tuple[int, int]] = set()
+        passed: set[tuple[int, int]] = set()
+
+        stack: list[CollectFrame] = [_collect(root, x, None, errors, self)]
+        result: bool | None = None
+        while stack:
+            try:
+                node, child, link, explain = stack[-1].send(result)
+            except StopIteration as stop:
+                stack.pop()
+                result = stop.value
+                _, key, tracked = open_.pop()
+                if tracked:
+                    active.discard(key)
+                if result:
+                    passed.add(key)
+                continue
+
+            if not explain:
+                result = self.run(node, child, link)
+                continue
+            elif not node.ops:
+                result = node.leaf is None or node.leaf(child)
+                if not result:
+                    errors.extend(node.leaf_errors(child, _path(link)))
+                continue
+
+            key = (id(node), id(child))
+            if key in passed:
+                result = True
+                continue
+
+            # Only the same instance can recur, through combinators or refs
+            tracked = child is open_[-1][0]
+            if tracked:
+                if key in active:
+                    raise RecursionError(
+                        f"schema recurses on the same instance: {node.defn!r}"
+                    )
+                active.add(key)
+
+            open_.append((child, key, tracked))
+            stack.append(_collect(node, child, link, errors, self))
+            result = None
+
+        return errors
+
+
+def _relinked(blame: _Blame | None, old: Link, new: Link) -> _Blame | None:
+    # A remembered failure, blamed on the same place relative to a new link
+    if blame is None or old is new:
+        return blame
+
+    keys: list[str | int] = []
+    link = blame.link
+    while link is not old:
+        if link is None:
+            return blame  # blamed outside of the pair (not expected)
+        link, key = link
+        keys.append(key)
+    for key in reversed(keys):
+        new = (new, key)
+
+    return _Blame(new, blame.node, blame.x, blame.keyword, blame.causes, blame.detail)
+
+
+def _evaluate(node: Node, x: Json, link: Link, machine: _Machine) -> Frame:
+    """Evaluate one node, yielding each child (node, instance, link) needed.
+
+    The caller sends back whether each child was valid. A failure found here
+    records its own blame, whereas a failed child has already recorded one.
+    """
+    if node.leaf is not None and not node.leaf(x):
+        machine.blame = _Blame(link, node, x)
+        return False
+
+    for op in node.ops:
+        kind = op[0]
+        if kind == "properties":
+            if isinstance(x, dict):
+                nodes = op[1]
+                for k, v in x.items():
+                    if k in nodes and not (yield nodes[k], v, (link, k)):
+                        return False
+
+        elif kind == "patternProperties":
+            if isinstance(x, dict):
+                _, classify, nodes = op
+                for k, v in x.items():
+                    for ix in classify(k):
+                        if not (yield nodes[ix], v, (link, k)):
+                            return False
+
+        elif kind == "additionalProperties":
+            if isinstance(x, dict):
+                _, child, is_additional = op
+                for k, v in x.items():
+                    if is_additional(k) and not (yield child, v, (link, k)):
+                        return False
+
+        elif kind == "propertyNames":
+            if isinstance(x, dict):
+                for k in x:
+                    if not (yield op[1], k, link):
+                        return False
+
+        elif kind == "dependencies":
+            if isinstance(x, dict):
+                for dependent, child in op[1]:
+                    if dependent in x and not (yield child, x, link):
+                        machine.blame = _Blame(
+                            link, node, x, "dependencies", (machine.blame,), dependent
+                        )
+                        return False
+
+        elif kind == "items":
+            if isinstance(x, list):
+                for ix, v in enumerate(x):
+                    if not (yield op[1], v, (link, ix)):
+                        return False
+
+        elif kind == "tupleItems":
+            if isinstance(x, list):
+                for ix, (child, v) in enumerate(zip(op[1], x)):
+                    if not (yield child, v, (link, ix)):
+                        return False
+
+        elif kind == "additionalItems":
+            if isinstance(x, list):
+                _, child, offset = op
+                for ix in range(offset, len(x)):
+                    if not (yield child, x[ix], (link, ix)):
+                        return False
+
+        elif kind == "contains":
+            if isinstance(x, list):
+                _, child, lo, hi = op
+                # Stop counting once the outcome can no longer change
+                enough = max(1, lo or 0, -1 if hi is None else hi + 1)
+                total = 0
+                for v in x:
+                    if (yield child, v, link):
+                        total += 1
+                        if total == enough:
+                            break
+
+                if not total:
+                    machine.blame = _Blame(link, node, x, "contains")
+                    return False
+                elif lo is not None and total < lo:
+                    machine.blame = _Blame(link, node, x, "minContains")
+                    return False
+                elif hi is not None and total > hi:
+                    machine.blame = _Blame(link, node, x, "maxContains")
+                    return False
+
+        elif kind == "allOf":
+            for child in op[1]:
+                if not (yield child, x, link):
+                    return False
+
+        elif kind == "anyOf":
+            causes = []
+            for child in op[1]:
+                if (yield child, x, link):
+                    break
+                causes.append(machine.blame)
+            else:
+                machine.blame = _Blame(link, node, x, "anyOf", tuple(causes))
+                return False
+
+        elif kind == "oneOf":
+            passed = 0
+            for child in op[1]:
+                if (yield child, x, link):
+                    passed += 1
+                    if passed > 1:
+                        break  # a second match settles it
+
+            if passed != 1:
+                detail = "none" if passed == 0 else "more than one"
+                machine.blame = _Blame(link, node, x, "oneOf", (), detail)
+                return False
+
+        elif kind == "not":
+            if (yield op[1], x, link):
+                machine.blame = _Blame(link, node, x, "not")
+                return False
+
+        elif kind == "if":
+            _, if_child, then_child, else_child = op
+            if (yield if_child, x, link):
+                if not (yield then_child, x, link):
+                    return False
+            elif not (yield else_child, x, link):
+                return False
+
+    return True
+
+
+def _collect(
+    node: Node, x: Json, link: Link, errors: list[ValidationError], machine: _Machine
+) -> CollectFrame:
+    """Collect every error of one node, yielding each child needed.
+
+    Children are yielded along with whether to explain them (collecting their
+    errors too) or only judge them, and the caller sends back whether each was
+    valid. Ops which descend or take `allOf` are explained child by child, and
+    `if` explains its `then` or `else`. The other combinators fail as a whole,
+    explained as by `first_error`.
+    """
+    start = len(errors)
+    if node.leaf is not None and not node.leaf(x):
+        errors.extend(node.leaf_errors(x, _path(link)))
+
+    for ix, op in enumerate(node.ops):
+        kind = op[0]
+        if kind in _DESCENDING:
+            for child, v, child_link in _children(op, x, link):
+                yield child, v, child_link, True
+
+        elif kind == "if":
+            _, if_child, then_child, else_child = op
+            if (yield if_child, x, link, False):
+                yield then_child, x, link, True
+            else:
+                yield else_child, x, link, True
+
+        elif not (yield node.alone(ix), x, link, False):
+            blame = machine.blame  # every failure records its blame
+            if blame is not None:
+                errors.append(blame.error())
+
+    return len(errors) == start
+
+
+def _children(op: tuple, x: Json, link: Link) -> Iterator[tuple[Node, Json, Link]]:
+    # The (node, instance, link) of each child of a descending op
+    kind = op[0]
+    if kind == "allOf":
+        for child in op[1]:
+            yield child, x, link
+    elif isinstance(x, dict):
+        if kind == "properties":
+            nodes = op[1]
+            for k, v in x.items():
+                if k in nodes:
+                    yield nodes[k], v, (link, k)
+        elif kind == "patternProperties":
+            _, classify, nodes = op
+            for k, v in x.items():
+                for ix in classify(k):
+                    yield nodes[ix], v, (link, k)
+        elif kind == "additionalProperties":
+            _, child, is_additional = op
+            for k, v in x.items():
+                if is_additional(k):
+                    yield child, v, (link, k)
+        elif kind == "propertyNames":
+            for k in x:
+                yield op[1], k, link
+    elif isinstance(x, list):
+        if kind == "items":
+            for ix, v in enumerate(x):
+                yield op[1], v, (link, ix)
+        elif kind == "tupleItems":
+            for ix, (child, v) in enumerate(zip(op[1], x)):
+                yield child, v, (link, ix)
+        elif kind == "additionalItems":
+            _, child, offset = op
+            for ix in range(offset, len(x)):
+                yield child, x[ix], (link, ix)
+
+
+class _Blame:
+    """Records which node was responsible for the most recent failure."""
+
+    __slots__ = ("causes", "detail", "keyword", "link", "node", "x")
+
+    def __init__(
+        self,
+        link: Link,
+        node: Node,
+        x: Json,
+        keyword: str | None = None,
+        causes: tuple[_Blame | None, ...] = (),
+        detail: object = None,
+    ) -> None:
+        self.link = link
+        self.node = node
+        self.x = x
+        self.keyword = keyword  # None when the leaf predicate failed
+        self.causes = causes
+        self.detail = detail
+
+    def error(self) -> ValidationError:
+        path = _path(self.link)
+        if self.keyword is None:
+            errors = self.node.leaf_errors(self.x, path)
+            if errors:
+                return errors[0]
+            return ValidationError(path, f"{self.x!r} cannot satisfy false", "false")
+
+        defn: Schema = self.node.defn  # type: ignore (only object schemas have ops)
+        x, keyword = self.x, self.keyword
+        if keyword == "not":
+            message = f"{x!r} should not satisfy {defn['not']!r}"
+        elif keyword == "anyOf":
+            failures = ", ".join(c.error().message for c in self.causes if c)
+            message = f"{x!r} failed all conditions: {failures}"
+        elif keyword == "oneOf":
+            message = f"{x!r} satisfied {self.detail} of the conditions"
+        elif keyword == "contains":
+            message = f"{x!r} did not contain any items satisfying {defn['contains']!r}"
+        elif keyword == "minContains":
+            message = f"{x!r} contains less than {defn['minContains']!r} items satisfying {defn['contains']!r}"
+        elif keyword == "maxContains":
+            message = f"{x!r} contains more than {defn['maxContains']!r} items satisfying {defn['contains']!r}"
+        else:
+            cause = self.causes[0]
+            reason = cause.error().message if cause else ""
+            message = f"dependency for {self.detail!r} not satisfied: {reason}"
+
+        return ValidationError(path, message, keyword)
+
+
+def _path(link: Link) -> tuple[str | int, ...]:
+    keys: list[str | int] = []
+    while link is not None:
+        link, key = link
+        keys.append(key)
+
+    return tuple(reversed(keys))
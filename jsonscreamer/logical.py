@@ -2,85 +2,171 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, TypeVar as _TypeVar
 
-from .compile import compile_ as _compile, register as _register
+from .adaptive import first_match as _first_match
+from .basic import _freeze
+from .compile import (
+    compile_ as _compile,
+    compile_branch_check as _compile_branch_check,
+    compile_check as _compile_check,
+    register as _register,
+    register_check as _register_check,
+)
 from .types import ValidationError
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Callable, Hashable, Sequence
 
-    from .types import Context, Json, Path, Schema, Validator
+    from .types import Check, Context, Json, Path, Schema, Validator
+
+_T = _TypeVar("_T")
+
+# How many `$ref`s and `allOf`s deep to look for the values a property is pinned to
+_MAX_PIN_DEPTH = 8
+
+_IF_KEYWORDS = frozenset(("if", "then", "else"))
 
 
 @_register
 def not_(defn: Schema, context: Context) -> Validator:
-    validator = _compile(defn["not"], context)
+    checker = _compile_branch_check(defn["not"], context)
 
-    def validate(x: Json, path: Path) -> Iterable[ValidationError]:
-        if not any(validator(x, path)):
-            yield ValidationError(
-                tuple(path), f"{x!r} should not satisfy {defn['not']!r}", "not"
+    def validate(x: Json, path: Path, errors: list[ValidationError]) -> None:
+        if checker(x):
+            errors.append(
+                ValidationError(
+                    tuple(path), f"{x!r} should not satisfy {defn['not']!r}", "not"
+                )
             )
 
     return validate
 
 
+@_register_check
+def not_check(defn: Schema, context: Context) -> Check:
+    checker = _compile_branch_check(defn["not"], context)
+
+    def check(x: Json) -> bool:
+        return not checker(x)
+
+    return check
+
+
 @_register
 def all_of(defn: Schema, context: Context) -> Validator:
     validators = [_compile(s, context) for s in defn["allOf"]]
 
-    def validate(x: Json, path: Path) -> Iterable[ValidationError]:
+    def validate(x: Json, path: Path, errors: list[ValidationError]) -> None:
         for v in validators:
-            yield from v(x, path)
+            v(x, path, errors)
 
     return validate
 
 
+@_register_check
+def all_of_check(defn: Schema, context: Context) -> Check:
+    checkers = [_compile_check(s, context) for s in defn["allOf"]]
+
+    def check(x: Json) -> bool:
+        for c in checkers:
+            if not c(x):
+                return False
+        return True
+
+    return check
+
+
 @_register
 def any_of(defn: Schema, context: Context) -> Validator:
+    matches = any_of_check(defn, context)
     validators = [_compile(s, context) for s in defn["anyOf"]]
 
-    def validate(x: Json, path: Path) -> Iterable[ValidationError]:
-        messages = []
-        for v in validators:
-            errs = list(v(x, path))
-            if not errs:
-                return ()
+    def validate(x: Json, path: Path, errors: list[ValidationError]) -> None:
+        if matches(x):
+            return
 
-            messages.extend(err.message for err in errs)
+        # Only now do we need the errors, to explain every failed branch
+        failed: list[ValidationError] = []
+        for v in validators:
+            v(x, path, failed)
 
-        failures = ", ".join(messages)
-        return (
+        failures = ", ".join(err.message for err in failed)
+        errors.append(
             ValidationError(
                 tuple(path), f"{x!r} failed all conditions: {failures}", "anyOf"
-            ),
+            )
         )
 
     return validate
 
 
+@_register_check
+def any_of_check(defn: Schema, context: Context) -> Check:
+    checkers = [_compile_branch_check(s, context) for s in defn["anyOf"]]
+    candidates = _discriminated(defn["anyOf"], checkers, context)
+    if candidates is None:
+        if context.adaptive:
+            return _first_match(checkers)
+        candidates = _everything(checkers)
+
+    def check(x: Json) -> bool:
+        for c in candidates(x):
+            if c(x):
+                return True
+        return False
+
+    return check
+
+
 @_register
 def one_of(defn: Schema, context: Context) -> Validator:
-    validators = [_compile(s, context) for s in defn["oneOf"]]
+    checkers = [_compile_branch_check(s, context) for s in defn["oneOf"]]
+    candidates = _discriminated(defn["oneOf"], checkers, context) or _everything(
+        checkers
+    )
 
-    def validate(x: Json, path: Path) -> Iterable[ValidationError]:
+    def validate(x: Json, path: Path, errors: list[ValidationError]) -> None:
         passed = 0
 
-        for v in validators:
-            if not any(v(x, path)):
+        for c in candidates(x):
+            if c(x):
                 passed += 1
+                if passed > 1:
+                    break  # a second match settles it
 
         if passed != 1:
-            yield ValidationError(
-                tuple(path),
-                f"{x!r} satisfied {passed} (!= 1) of the conditions",
-                "oneOf",
+            detail = "none" if passed == 0 else "more than one"
+            errors.append(
+                ValidationError(
+                    tuple(path),
+                    f"{x!r} satisfied {detail} of the conditions",
+                    "oneOf",
+                )
             )
 
     return validate
 
 
+@_register_check
+def one_of_check(defn: Schema, context: Context) -> Check:
+    checkers = [_compile_branch_check(s, context) for s in defn["oneOf"]]
+    candidates = _discriminated(defn["oneOf"], checkers, context) or _everything(
+        checkers
+    )
+
+    def check(x: Json) -> bool:
+        passed = False
+        for c in candidates(x):
+            if c(x):
+                if passed:
+                    return False  # a second match settles it
+                passed = True
+        return passed
+
+    return check
+
+
 @_register
 def if_(defn: Schema, context: Context) -> Validator | None:
     if_schema = defn["if"]
@@ -90,14 +176,209 @@ def if_(defn: Schema, context: Context) -> Validator | None:
     if then_schema is True and else_schema is True:
         return None
 
-    if_validator = _compile(if_schema, context)
+    if_checker = _compile_branch_check(if_schema, context)
     then_validator = _compile(then_schema, context)
     else_validator = _compile(else_schema, context)
 
-    def validate(x: Json, path: Path) -> Iterable[ValidationError]:
-        if not any(if_validator(x, path)):  # XXX: no errors => if condition true
-            yield from then_validator(x, path)
+    def validate(x: Json, path: Path, errors: list[ValidationError]) -> None:
+        if if_checker(x):
+            then_validator(x, path, errors)
         else:
-            yield from else_validator(x, path)
+            else_validator(x, path, errors)
 
-    return validate
+    ladder = _ladder(defn, context)
+    if ladder is None:
+        return validate
+
+    key, table, otherwise = _rung_table(ladder, lambda s: _compile(s, context))
+
+    def dispatched(x: Json, path: Path, errors: list[ValidationError]) -> None:
+        if isinstance(x, dict) and key in x:
+            table.get(_freeze(x[key]), otherwise)(x, path, errors)
+        else:
+            validate(x, path, errors)
+
+    return dispatched
+
+
+@_register_check
+def if_check(defn: Schema, context: Context) -> Check | None:
+    then_schema = defn.get("then", True)
+    else_schema = defn.get("else", True)
+
+    if then_schema is True and else_schema is True:
+        return None
+
+    if_checker = _compile_branch_check(defn["if"], context)
+    then_checker = _compile_branch_check(then_schema, context)
+    else_checker = _compile_branch_check(else_schema, context)
+
+    def check(x: Json) -> bool:
+        if if_checker(x):
+            return then_checker(x)
+        return else_checker(x)
+
+    ladder = _ladder(defn, context)
+    if ladder is None:
+        return check
+
+    key, table, otherwise = _rung_table(
+        ladder, lambda s: _compile_branch_check(s, context)
+    )
+
+    def dispatched(x: Json) -> bool:
+        if isinstance(x, dict) and key in x:
+            return table.get(_freeze(x[key]), otherwise)(x)
+        return check(x)
+
+    return dispatched
+
+
+def _everything(branches: Sequence[_T]) -> Callable[[Json], Sequence[_T]]:
+    return lambda x: branches
+
+
+def _discriminated(
+    schemas: list[Schema], branches: Sequence[_T], context: Context
+) -> Callable[[Json], Sequence[_T]] | None:
+    """Pick out the branches which could match an object, by a discriminator.
+
+    Polymorphic schemas tell their branches apart by a property which each pins
+    to a `const` or `enum`, e.g. `"kind"`. Branches which don't pin it stay in
+    the running for every object, so the result doesn't change, but only the
+    branches left are evaluated (in their original order).
+    """
+    pins = [_pins(s, context, 0) for s in schemas]
+    counts: dict[str, int] = {}
+    for p in pins:
+        for k in p:
+            counts[k] = counts.get(k, 0) + 1
+    if not counts:
+        return None
+
+    key = max(counts, key=counts.__getitem__)
+    if counts[key] < 2:
+        return None
+
+    unpinned = tuple(b for b, p in zip(branches, pins) if key not in p)
+    index: dict[Hashable, tuple[_T, ...]] = {}
+    for value in {v for p in pins for v in p.get(key, ())}:
+        index[value] = tuple(
+            b for b, p in zip(branches, pins) if key not in p or value in p[key]
+        )
+
+    def candidates(x: Json) -> Sequence[_T]:
+        if isinstance(x, dict) and key in x:
+            return index.get(_freeze(x[key]), unpinned)
+        return branches
+
+    return candidates
+
+
+def _ladder(
+    defn: Schema, context: Context
+) -> tuple[str, list[tuple[frozenset, Schema | bool]], Schema | bool] | None:
+    """Flatten an `if`/`then`/`else if`... chain which tests a single property.
+
+    Returns that property, the values and `then` of each rung, and the final
+    `else`. Only chains of at least two rungs are worth dispatching on.
+    """
+    key: str | None = None
+    rungs: list[tuple[frozenset, Schema | bool]] = []
+    node: Schema | bool = defn
+    while isinstance(node, dict) and "if" in node:
+        if node is not defn and not node.keys() <= _IF_KEYWORDS:
+            break  # more than a rung, so evaluated as it is
+        pin = _pinned_by(node["if"], context)
+        if pin is None or key not in (None, pin[0]):
+            break
+        key = pin[0]
+        rungs.append((pin[1], node.get("then", True)))
+        node = node.get("else", True)
+
+    if key is None or len(rungs) < 2:
+        return None
+    return key, rungs, node
+
+
+def _pinned_by(defn: Schema | bool, context: Context) -> tuple[str, frozenset] | None:
+    # An `if` which holds for an object with the key exactly when its value is
+    # one of a few
+    if not isinstance(defn, dict) or not defn.keys() <= {"properties", "required"}:
+        return None
+    properties = defn.get("properties")
+    if not isinstance(properties, dict) or len(properties) != 1:
+        return None
+
+    ((key, subschema),) = properties.items()
+    if defn.get("required", []) not in ([], [key]):
+        return None
+    if not isinstance(subschema, dict) or not subschema.keys() <= {"const", "enum"}:
+        return None
+
+    values = _allowed(subschema, context, 0)
+    return None if values is None else (key, values)
+
+
+def _rung_table(
+    ladder: tuple[str, list[tuple[frozenset, Schema | bool]], Schema | bool],
+    compile_: Callable[[Schema | bool], _T],
+) -> tuple[str, dict[Hashable, _T], _T]:
+    key, rungs, otherwise = ladder
+    table: dict[Hashable, _T] = {}
+    for values, then in rungs:
+        compiled = compile_(then)
+        for value in values:
+            table.setdefault(value, compiled)  # the first rung to match wins
+    return key, table, compile_(otherwise)
+
+
+def _pins(defn: Schema | bool, context: Context, depth: int) -> dict[str, frozenset]:
+    # The properties which an object must take one of a few values for
+    if not isinstance(defn, dict) or depth > _MAX_PIN_DEPTH:
+        return {}
+    if "$ref" in defn:
+        return _resolved(defn["$ref"], context, depth, _pins) or {}
+
+    pins: dict[str, frozenset] = {}
+    for k, subschema in defn.get("properties", {}).items():
+        values = _allowed(subschema, context, depth)
+        if values is not None:
+            pins[k] = values
+
+    for subschema in defn.get("allOf", ()):
+        for k, values in _pins(subschema, context, depth + 1).items():
+            pins[k] = pins[k] & values if k in pins else values
+
+    return pins
+
+
+def _allowed(defn: Schema | bool, context: Context, depth: int) -> frozenset | None:
+    # The (frozen) values which a schema allows, if it only allows a few
+    if defn is False:
+        return frozenset()
+    if not isinstance(defn, dict) or depth > _MAX_PIN_DEPTH:
+        return None
+    if "$ref" in defn:
+        return _resolved(defn["$ref"], context, depth, _allowed)
+
+    values = None
+    if "const" in defn:
+        values = frozenset((_freeze(defn["const"]),))
+    if "enum" in defn:
+        enum = frozenset(map(_freeze, defn["enum"]))
+        values = enum if values is None else values & enum
+    return values
+
+
+def _resolved(
+    ref: str,
+    context: Context,
+    depth: int,
+    inspect: Callable[[Schema | bool, Context, int], _T],
+) -> _T | None:
+    try:
+        with context.tracker._resolver.resolving(ref) as target:
+            return inspect(target, context, depth + 1)
+    except (LookupError, ValueError):
+        return None  # left for the ref to report
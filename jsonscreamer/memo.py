@@ -0,0 +1,70 @@
+"""Remember whether subschemas passed, for the length of one validation.
+
+Enabled with `Validator(schema, memo=True)`. The subschemas of combinators
+(`not`, `anyOf`, `oneOf`, `if`/`then`/`else` and `contains`) are checked through
+`Memo.check`, which remembers the outcome per subschema and node of the instance.
+A schema which reaches the same subschema (usually a `$ref`) along several
+combinator paths then checks each node against it once, rather than once per
+path: without this, nesting such combinators is exponential in the depth.
+
+Nodes are told apart by identity. The memo holds on to them until the validation
+ends, so no other node can take the `id` of one in the meantime.
+"""
+
+from __future__ import annotations
+
+import threading as _threading
+from typing import TYPE_CHECKING as _TYPE_CHECKING, TypeVar as _TypeVar
+
+if _TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .types import Check, Json
+
+_T = _TypeVar("_T")
+
+
+class Memo:
+    """The outcomes of memoised checks, one table per thread and validation."""
+
+    def __init__(self) -> None:
+        self._local = _threading.local()
+
+    def check(self, checker: Check) -> Check:
+        """Remember the outcomes of a check during each validation."""
+        local = self._local
+        ident = id(checker)
+
+        def check(x: Json) -> bool:
+            table: dict[tuple[int, int], tuple[Json, bool]] | None = getattr(
+                local, "table", None
+            )
+            if table is None:  # called outside of `scoped`
+                return checker(x)
+
+            key = (ident, id(x))
+            hit = table.get(key)
+            if hit is not None:
+                return hit[1]
+
+            ok = checker(x)
+            table[key] = (x, ok)
+            return ok
+
+        return check
+
+    def scoped(self, entrypoint: Callable[..., _T]) -> Callable[..., _T]:
+        """Run an entrypoint with a fresh table, forgotten when it returns."""
+        local = self._local
+
+        def scoped(x: Json, *args: object) -> _T:
+            if getattr(local, "table", None) is not None:
+                return entrypoint(x, *args)  # re-entered, e.g. from a format
+
+            local.table = {}
+            try:
+                return entrypoint(x, *args)
+            finally:
+                local.table = None
+
+        return scoped
@@ -2,21 +2,115 @@ from __future__ import annotations
 
 import functools as _functools
 import re as _re
+import sys as _sys
 from typing import TYPE_CHECKING
 
-from .basic import _max_len_validator, _min_len_validator, _type_guard
-from .compile import compile_ as _compile, register as _register
+from .basic import (
+    _check_type_guard,
+    _max_len_validator,
+    _min_len_validator,
+    _type_guard,
+)
+from .compile import (
+    compile_ as _compile,
+    compile_check as _compile_check,
+    register as _register,
+    register_check_group as _register_check_group,
+)
+from .regex import compiled as _compiled
 from .types import ValidationError
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
-    from typing import TypeVar
+    from collections.abc import Callable, Iterable
+
+    from .types import Check, Context, Json, Path, Schema, Validator
+
+    Routes = tuple[tuple[str, tuple[Check, ...]], ...]
+
+# How many distinct sets of keys to remember the outcome of, per subschema
+SHAPE_CACHE_SIZE = 256
+# How many distinct keys to remember the classification of, per subschema
+KEY_CACHE_SIZE = 1024
+
+_OBJECT_KEYWORDS = frozenset(
+    (
+        "properties",
+        "patternProperties",
+        "additionalProperties",
+        "required",
+        "minProperties",
+        "maxProperties",
+        "propertyNames",
+        "dependencies",
+    )
+)
 
-    from .types import Context, Json, Path, Schema, Validator
+_object_guard = _functools.partial(_type_guard, schema_types=("object",), py_types=dict)
+_object_check_guard = _functools.partial(
+    _check_type_guard, schema_types=("object",), py_types=dict
+)
 
-    _VT = TypeVar("_VT")
 
-_object_guard = _functools.partial(_type_guard, schema_types=("object",), py_types=dict)
+def classify_keys(rexes: list[_re.Pattern]) -> Callable[[str], tuple[int, ...]]:
+    """Map a key to the indices of the patterns found in it (as in `re.search`).
+
+    Keys repeat across documents, so this is memoised per key. On a miss, all of
+    the patterns are tried in one go: each becomes a lookahead with a named group
+    in a single regex, and the groups which took part in the match say which
+    patterns were found.
+    """
+    combined = _combined_search(rexes)
+    if combined is None:
+
+        def classify(key: str) -> tuple[int, ...]:
+            return tuple(ix for ix, r in enumerate(rexes) if r.search(key))
+
+    else:
+
+        def classify(key: str) -> tuple[int, ...]:
+            match = combined(key)
+            if match is None:  # can't happen, every lookahead is optional
+                return ()
+            return tuple(ix for ix, g in enumerate(match.groups()) if g is not None)
+
+    return _functools.lru_cache(maxsize=KEY_CACHE_SIZE)(classify)
+
+
+def _combined_search(
+    rexes: Iterable[_re.Pattern],
+) -> Callable[[str], _re.Match | None] | None:
+    parts = []
+    for ix, r in enumerate(rexes):
+        # Groups would be renumbered and inline flags made global, so those
+        # patterns are searched one at a time instead
+        if r.groups or r.flags & ~_re.UNICODE:
+            return None
+        parts.append(f"(?:(?=(?P<p{ix}>[\\s\\S]*?(?:{r.pattern})))?)")
+
+    try:
+        return _compiled("".join(parts)).match
+    except _re.error:
+        return None
+
+
+def additional_keys(defn: Schema) -> Callable[[str], bool]:
+    """Whether a key is left to `additionalProperties`, memoised per key."""
+    names = frozenset(defn.get("properties", ()))
+    rexes = [_compiled(k) for k in defn.get("patternProperties", ())]
+    if not rexes:
+        return lambda key: key not in names
+
+    classify = classify_keys(rexes)
+
+    # NOTE: keys are excluded by the patterns which `match` them, whereas
+    # `patternProperties` applies to any key which they `search`
+    @_functools.lru_cache(maxsize=KEY_CACHE_SIZE)
+    def is_additional(key: str) -> bool:
+        if key in names:
+            return False
+        return not any(rexes[ix].match(key) for ix in classify(key))
+
+    return is_additional
 
 
 @_register
@@ -36,11 +130,13 @@ def min_properties(defn: Schema, context: Context) -> Validator:
 @_register
 def property_names(defn: Schema, context: Context) -> Validator:
     validator = _compile(defn["propertyNames"], context)
+    checker = _name_checker(defn, context)
 
     @_object_guard(defn)
-    def validate(x: dict[str, Json], path: Path) -> ...:
+    def validate(x: dict[str, Json], path: Path, errors: list[ValidationError]) -> None:
         for key in x:
-            yield from validator(key, path)
+            if not checker(key):
+                validator(key, path, errors)
 
     return validate
 
@@ -51,11 +147,15 @@ def required(defn: Schema, context: Context) -> Validator | None:
     if value:
 
         @_object_guard(defn)
-        def validate(x: dict[str, Json], path: Path) -> ...:
+        def validate(
+            x: dict[str, Json], path: Path, errors: list[ValidationError]
+        ) -> None:
             for v in value:
                 if v not in x:
-                    yield ValidationError(
-                        tuple(path), f"{v!r} is a required property", "required"
+                    errors.append(
+                        ValidationError(
+                            tuple(path), f"{v!r} is a required property", "required"
+                        )
                     )
 
         return validate
@@ -63,6 +163,15 @@ def required(defn: Schema, context: Context) -> Validator | None:
     return None
 
 
+def _dependency_schema(defn: Schema, requirement: list[str]) -> Schema:
+    # Has the effect of 'activating' a required directive
+    fake_schema: Schema = {"required": requirement}
+    if "type" in defn:
+        fake_schema["type"] = defn["type"]
+
+    return fake_schema
+
+
 @_register
 def dependencies(defn: Schema, context: Context) -> Validator | None:
     value: dict[str, list[str] | Schema] = defn["dependencies"]
@@ -73,12 +182,7 @@ def dependencies(defn: Schema, context: Context) -> Validator | None:
 
     for dependent, requirement in value.items():
         if isinstance(requirement, list):
-            # Has the effect of 'activating' a required directive
-            fake_schema = {"required": requirement}
-            if "type" in defn:
-                fake_schema["type"] = defn["type"]
-
-            checker = required(fake_schema, context)
+            checker = required(_dependency_schema(defn, requirement), context)
         else:
             checker = _compile(requirement, context)
 
@@ -86,43 +190,37 @@ def dependencies(defn: Schema, context: Context) -> Validator | None:
             checkers[dependent] = checker
 
     @_object_guard(defn)
-    def validate(x: dict[str, Json], path: Path) -> ...:
+    def validate(x: dict[str, Json], path: Path, errors: list[ValidationError]) -> None:
         for dependent, checker in checkers.items():
             if dependent in x:
-                for err in checker(x, path):
-                    yield ValidationError(
-                        tuple(path),
-                        f"dependency for {dependent!r} not satisfied: {err.message}",
-                        "dependencies",
+                unmet: list[ValidationError] = []
+                checker(x, path, unmet)
+                for err in unmet:
+                    errors.append(
+                        ValidationError(
+                            tuple(path),
+                            f"dependency for {dependent!r} not satisfied: {err.message}",
+                            "dependencies",
+                        )
                     )
 
-        return None
-
     return validate
 
 
-def _path_push_iterator(
-    path: list[str | int], obj: dict[str, _VT]
-) -> Iterable[tuple[str, _VT]]:
-    path.append("")  # front-load memory allocation
-    try:
-        for key, value in obj.items():
-            path[-1] = key
-            yield key, value
-    finally:
-        path.pop()
-
-
 @_register
 def properties(defn: Schema, context: Context) -> Validator:
     value = defn["properties"]
     validators = {k: _compile(v, context) for k, v in value.items()}
 
     @_object_guard(defn)
-    def validate(x: dict[str, Json], path: Path) -> Iterable[ValidationError]:
-        for k, v in _path_push_iterator(path, x):
-            if k in validators:
-                yield from validators[k](v, path)
+    def validate(x: dict[str, Json], path: Path, errors: list[ValidationError]) -> None:
+        path.append("")  # front-load memory allocation
+        for k, v in x.items():
+            validator = validators.get(k)
+            if validator is not None:
+                path[-1] = k
+                validator(v, path, errors)
+        path.pop()
 
     return validate
 
@@ -130,15 +228,17 @@ def properties(defn: Schema, context: Context) -> Validator:
 @_register
 def pattern_properties(defn: Schema, context: Context) -> Validator:
     value = defn["patternProperties"]
-    validators = [(_re.compile(k), _compile(v, context)) for k, v in value.items()]
+    classify = classify_keys([_compiled(k) for k in value])
+    validators = [_compile(v, context) for v in value.values()]
 
     @_object_guard(defn)
-    def validate(x: dict[str, Json], path: Path) -> Iterable[ValidationError]:
-        # ugh...
-        for rex, val in validators:
-            for k, v in _path_push_iterator(path, x):
-                if rex.search(k):
-                    yield from val(v, path)
+    def validate(x: dict[str, Json], path: Path, errors: list[ValidationError]) -> None:
+        path.append("")
+        for k, v in x.items():
+            for ix in classify(k):
+                path[-1] = k
+                validators[ix](v, path, errors)
+        path.pop()
 
     return validate
 
@@ -147,17 +247,149 @@ def pattern_properties(defn: Schema, context: Context) -> Validator:
 def additional_properties(defn: Schema, context: Context) -> Validator:
     value = defn["additionalProperties"]
     simple_validator = _compile(value, context)
-
-    excluded_names = set(defn.get("properties", ()))
-    excluded_rexes = [_re.compile(k) for k in defn.get("patternProperties", ())]
+    is_additional = additional_keys(defn)
 
     @_object_guard(defn)
-    def validate(x: dict[str, Json], path: Path) -> Iterable[ValidationError]:
-        for k, v in _path_push_iterator(path, x):
-            if k in excluded_names:
+    def validate(x: dict[str, Json], path: Path, errors: list[ValidationError]) -> None:
+        path.append("")
+        for k, v in x.items():
+            if not is_additional(k):
                 continue
-            if any(r.match(k) for r in excluded_rexes):
-                continue
-            yield from simple_validator(v, path)
+            path[-1] = k
+            simple_validator(v, path, errors)
+        path.pop()
 
     return validate
+
+
+@_register_check_group(*_OBJECT_KEYWORDS)
+def object_check(defn: Schema, context: Context) -> tuple[Check | None, set[str]]:
+    """Check all of an object's keywords in a single pass over its items.
+
+    Each key is routed to the checks for its value: its entry in `properties`,
+    any matching `patternProperties` and otherwise `additionalProperties`. The
+    `required` keys are a set comparison.
+
+    Objects of a given kind almost always have the same set of keys (their
+    "shape"), so when some keywords only depend on the keys (`propertyNames`,
+    pattern matches, etc.) those and the routing are memoised per shape.
+    """
+    handled: set[str] = set(_OBJECT_KEYWORDS.intersection(defn))
+
+    properties = {
+        k: _compile_check(v, context) for k, v in defn.get("properties", {}).items()
+    }
+    patterns = [
+        _compile_check(v, context) for v in defn.get("patternProperties", {}).values()
+    ]
+    additional = defn.get("additionalProperties", True)
+    additional_checker = (
+        None if isinstance(additional, bool) else _compile_check(additional, context)
+    )
+
+    required_keys = frozenset(defn.get("required", ()))
+    min_properties: int = defn.get("minProperties", 0)
+    max_properties: int = defn.get("maxProperties", _sys.maxsize)
+
+    key_dependencies: list[tuple[str, frozenset[str]]] = []
+    schema_dependencies: list[tuple[str, Check]] = []
+    for dependent, requirement in defn.get("dependencies", {}).items():
+        if isinstance(requirement, list):
+            key_dependencies.append((dependent, frozenset(requirement)))
+        else:
+            schema_dependencies.append(
+                (dependent, _compile_check(requirement, context))
+            )
+
+    if not (
+        "propertyNames" in defn or patterns or additional is False or key_dependencies
+    ):
+        routed = bool(properties) or additional_checker is not None
+
+        @_object_check_guard(defn)
+        def check(x: dict[str, Json]) -> bool:
+            if not required_keys <= x.keys():
+                return False
+            if not min_properties <= len(x) <= max_properties:
+                return False
+
+            if routed:
+                for k, v in x.items():
+                    checker = properties.get(k, additional_checker)
+                    if checker is not None and not checker(v):
+                        return False
+
+            for dependent, checker in schema_dependencies:
+                if dependent in x and not checker(x):
+                    return False
+            return True
+
+        return check, handled
+
+    key_checks: list[Callable[[frozenset[str]], bool]] = []
+    if "propertyNames" in defn:
+        name_checker = _name_checker(defn, context)
+        key_checks.append(lambda keys: all(map(name_checker, keys)))
+    if key_dependencies:
+        key_checks.append(
+            lambda keys: all(k not in keys or v <= keys for k, v in key_dependencies)
+        )
+
+    rexes = [_compiled(k) for k in defn.get("patternProperties", ())]
+    classify = classify_keys(rexes)
+    is_additional = additional_keys(defn)
+
+    def route(k: str) -> tuple[Check, ...] | None:
+        checkers = [patterns[ix] for ix in classify(k)]
+        if k in properties:
+            checkers.insert(0, properties[k])
+        elif is_additional(k):
+            if additional is False:
+                return None
+            if additional_checker is not None:
+                checkers.append(additional_checker)
+        return tuple(checkers)
+
+    @_functools.lru_cache(maxsize=SHAPE_CACHE_SIZE)
+    def shape(keys: frozenset[str]) -> Routes | None:
+        if not required_keys <= keys:
+            return None
+        if not min_properties <= len(keys) <= max_properties:
+            return None
+        for key_check in key_checks:
+            if not key_check(keys):
+                return None
+
+        routes = []
+        for k in keys:
+            checkers = route(k)
+            if checkers is None:
+                return None
+            elif checkers:
+                routes.append((k, checkers))
+        return tuple(routes)
+
+    @_object_check_guard(defn)
+    def shape_check(x: dict[str, Json]) -> bool:
+        routes = shape(frozenset(x))
+        if routes is None:
+            return False
+
+        for k, checkers in routes:
+            v = x[k]
+            for checker in checkers:
+                if not checker(v):
+                    return False
+
+        for dependent, checker in schema_dependencies:
+            if dependent in x and not checker(x):
+                return False
+        return True
+
+    return shape_check, handled
+
+
+def _name_checker(defn: Schema, context: Context) -> Callable[[str], bool]:
+    # Keys repeat across documents, so are only checked once
+    checker = _compile_check(defn["propertyNames"], context)
+    return _functools.lru_cache(maxsize=KEY_CACHE_SIZE)(checker)
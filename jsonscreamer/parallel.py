@@ -0,0 +1,176 @@
+"""Validate batches across processes, see `ParallelValidator`.
+
+Compiled validators are nested closures, which can't be pickled. Instead each
+worker process is handed the schema and the options to compile it with, once,
+when it starts, and compiles its own `Validator`. Only the chunks of instances
+and their results travel between processes from then on.
+
+Under the `fork` start method the workers inherit the schema without pickling
+it. Under `spawn` and `forkserver` the schema, and any custom `formats` and
+`handlers`, are pickled: these must then be module-level functions rather than
+lambdas or closures.
+
+Processes pay off when checking an instance costs more than pickling it: large
+schemas, formats or patterns, or deeply nested instances. Cheap checks of small
+records are faster with `Validator.validate_many` in a single process.
+"""
+
+from __future__ import annotations
+
+import collections as _collections
+import concurrent.futures as _futures
+import itertools as _itertools
+import multiprocessing as _multiprocessing
+import os as _os
+from typing import TYPE_CHECKING as _TYPE_CHECKING
+
+from .batch import CHUNK_SIZE, CHUNKS_PER_WORKER, BatchResult, _merge
+
+if _TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from types import TracebackType
+    from typing import Any, Literal
+
+    from . import Validator
+    from .types import Format, Json, Schema, ValidationError
+
+# The validator of this worker process, see `_start_worker`
+_validator: Validator | None = None
+
+
+class ParallelValidator:
+    """A pool of worker processes, each with its own validator for a schema.
+
+    Usage:
+        >>> with ParallelValidator({"type": "integer"}, workers=2) as validator:
+        ...     result = validator.validate_many([1, "2", 3], chunksize=2)
+        >>> list(result.invalid())
+        [1]
+
+    Takes the same `schema`, `formats`, `handlers` and options as `Validator`.
+    The workers are started on first use and stop on `close` (or on leaving a
+    `with` block).
+    """
+
+    def __init__(
+        self,
+        schema: Schema | bool = True,
+        formats: dict[str, Format] | bool = True,
+        handlers: dict[str, Callable[[str], Json]] | None = None,
+        workers: int | None = None,
+        start_method: str | None = None,
+        **options: Any,
+    ) -> None:
+        if workers is not None and workers < 1:
+            raise ValueError(f"workers must be positive, not {workers!r}")
+
+        # Compile here once, so that a bad schema or option raises here rather
+        # than breaking the pool, and let the workers skip checking the schema
+        from . import Validator
+
+        Validator(schema, formats, handlers, **options)
+
+        self.workers = workers or _os.cpu_count() or 1
+        self._spec = (schema, formats, handlers, {**options, "check_schema": False})
+        self._start_method = start_method
+        self._pool: _futures.ProcessPoolExecutor | None = None
+
+    def validate_many(
+        self,
+        instances: Iterable[Json],
+        mode: Literal["flag", "first", "all"] = "flag",
+        chunksize: int = CHUNK_SIZE,
+    ) -> BatchResult:
+        """Validate many instances across the workers, as `Validator.validate_many`.
+
+        Chunks of `chunksize` instances are sent to the workers as they become
+        free, and the results are put back in the order of the instances.
+        """
+        if chunksize < 1:
+            raise ValueError(f"chunksize must be positive, not {chunksize!r}")
+        if mode not in ("flag", "first", "all"):
+            raise ValueError(f"unknown mode: {mode!r}")
+
+        pool = self._started()
+        result = BatchResult(bytearray(), {})
+        pending: _collections.deque[_futures.Future] = _collections.deque()
+
+        iterator = iter(instances)
+        while chunk := list(_itertools.islice(iterator, chunksize)):
+            if len(pending) >= self.workers * CHUNKS_PER_WORKER:
+                _merge(result, *pending.popleft().result())
+            pending.append(pool.submit(_validate_chunk, chunk, mode))
+
+        while pending:
+            _merge(result, *pending.popleft().result())
+
+        return result
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> ParallelValidator:  # noqa: PYI034 (not subclassed)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _started(self) -> _futures.ProcessPoolExecutor:
+        if self._pool is None:
+            context = None
+            if self._start_method is not None:
+                context = _multiprocessing.get_context(self._start_method)
+            self._pool = _futures.ProcessPoolExecutor(
+                self.workers,
+                mp_context=context,
+                initializer=_start_worker,
+                initargs=self._spec,
+            )
+        return self._pool
+
+
+def validate_parallel(
+    schema: Schema | bool,
+    instances: Iterable[Json],
+    mode: Literal["flag", "first", "all"] = "flag",
+    chunksize: int = CHUNK_SIZE,
+    workers: int | None = None,
+    **options: Any,
+) -> BatchResult:
+    """Validate many instances with a one-off `ParallelValidator`.
+
+    Starting the workers and compiling the schema in each is paid on every
+    call: keep a `ParallelValidator` around to validate several batches.
+    """
+    with ParallelValidator(schema, workers=workers, **options) as validator:
+        return validator.validate_many(instances, mode, chunksize)
+
+
+def _start_worker(
+    schema: Schema | bool,
+    formats: dict[str, Format] | bool,
+    handlers: dict[str, Callable[[str], Json]] | None,
+    options: dict[str, Any],
+) -> None:
+    # Compile the validator once, when the worker starts
+    global _validator
+    from . import Validator
+
+    _validator = Validator(schema, formats, handlers, **options)
+
+
+def _validate_chunk(
+    chunk: list[Json], mode: Literal["flag", "first", "all"]
+) -> tuple[bytearray, dict[int, list[ValidationError]]]:
+    if _validator is None:
+        raise RuntimeError("not a worker process")
+    result = _validator.validate_many(chunk, mode, chunksize=len(chunk))
+    return result.valid, result.errors
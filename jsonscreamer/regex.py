@@ -0,0 +1,175 @@
+"""Regexes shared by every validator in the process.
+
+Patterns are compiled once, however many schemas (or validators) use them, and
+`searcher` turns a pattern into the cheapest predicate equivalent to searching
+for it. Patterns which are really just literals are lowered to `str` methods:
+
+    >>> searcher("^abc")("abcdef")
+    True
+    >>> searcher("^abc$")("abcdef")
+    False
+
+Two opt-in extras are read when a validator is compiled:
+
+- `MEMO_SIZE`: remember the outcome for this many recent strings, per pattern.
+  Worth it for expensive patterns on fields which take few distinct values.
+- `PROFILE`: record calls and time per pattern, see `stats`.
+"""
+
+from __future__ import annotations
+
+import functools as _functools
+import re as _re
+import string as _string
+import threading as _threading
+import time as _time
+from typing import TYPE_CHECKING as _TYPE_CHECKING, NamedTuple as _NamedTuple
+
+if _TYPE_CHECKING:
+    from collections.abc import Callable
+
+MEMO_SIZE = 0
+PROFILE = False
+
+# How many distinct patterns to keep compiled
+CACHE_SIZE = 4096
+
+# Escaped characters which stand for themselves, e.g. `\.`
+_LITERAL_ESCAPES = frozenset(_string.punctuation + " ")
+_SPECIAL = frozenset(".^$*+?{}[]()|\\")
+
+
+class PatternStats(_NamedTuple):
+    pattern: str
+    strategy: str
+    calls: int
+    memo_hits: int
+    seconds: float
+
+
+# Per pattern: strategy, calls, seconds and the (possibly memoised) search
+_stats: dict[str, list] = {}
+_stats_lock = _threading.Lock()
+
+
+@_functools.lru_cache(maxsize=CACHE_SIZE)
+def compiled(pattern: str) -> _re.Pattern[str]:
+    """Compile a pattern, or reuse it if it was compiled already."""
+    return _re.compile(pattern)
+
+
+def searcher(pattern: str) -> Callable[[str], bool]:
+    """A predicate equivalent to `bool(re.search(pattern, x))`."""
+    strategy, search = _lowered(pattern)
+    if MEMO_SIZE:
+        search = _memoised(pattern, MEMO_SIZE)
+    if PROFILE:
+        search = _profiled(pattern, strategy, search)
+    return search
+
+
+def stats() -> list[PatternStats]:
+    """Calls and time spent per pattern while `PROFILE` was on, slowest first.
+
+    Counts from concurrent threads may be slightly off.
+    """
+    with _stats_lock:
+        rows = [
+            PatternStats(pattern, strategy, calls, _memo_hits(search), seconds)
+            for pattern, (strategy, calls, seconds, search) in _stats.items()
+        ]
+    return sorted(rows, key=lambda row: -row.seconds)
+
+
+def reset_stats() -> None:
+    """Forget everything recorded by `stats`."""
+    with _stats_lock:
+        _stats.clear()
+
+
+@_functools.lru_cache(maxsize=CACHE_SIZE)
+def _lowered(pattern: str) -> tuple[str, Callable[[str], bool]]:
+    starts = pattern.startswith("^")
+    body = pattern[1:] if starts else pattern
+    ends = body.endswith("$") and not body.endswith("\\$")
+    literal = _literal(body[:-1] if ends else body)
+
+    if literal is None:
+        search = compiled(pattern).search
+
+        def matches(x: str) -> bool:
+            return search(x) is not None
+
+        return "regex", matches
+
+    # NOTE: `$` also matches before a trailing newline
+    ending = (literal, literal + "\n")
+    if starts and ends:
+        return "exact", frozenset(ending).__contains__
+    elif starts:
+
+        def prefixed(x: str) -> bool:
+            return x.startswith(literal)
+
+        return "prefix", prefixed
+    elif ends:
+
+        def suffixed(x: str) -> bool:
+            return x.endswith(ending)
+
+        return "suffix", suffixed
+    else:
+
+        def contains(x: str) -> bool:
+            return literal in x
+
+        return "substring", contains
+
+
+def _literal(body: str) -> str | None:
+    chars = []
+    escaped = False
+    for c in body:
+        if escaped:
+            if c not in _LITERAL_ESCAPES:
+                return None  # e.g. `\d`
+            chars.append(c)
+            escaped = False
+        elif c == "\\":
+            escaped = True
+        elif c in _SPECIAL:
+            return None
+        else:
+            chars.append(c)
+
+    return None if escaped else "".join(chars)
+
+
+@_functools.lru_cache(maxsize=CACHE_SIZE)
+def _memoised(pattern: str, size: int) -> Callable[[str], bool]:
+    # One memo per pattern, shared by every validator using it
+    return _functools.lru_cache(maxsize=size)(_lowered(pattern)[1])
+
+
+def _memo_hits(search: Callable[[str], bool]) -> int:
+    cache_info = getattr(search, "cache_info", None)
+    return 0 if cache_info is None else cache_info().hits
+
+
+def _profiled(
+    pattern: str, strategy: str, search: Callable[[str], bool]
+) -> Callable[[str], bool]:
+    with _stats_lock:
+        row = _stats.setdefault(pattern, [strategy, 0, 0.0, search])
+
+    clock = _time.perf_counter
+
+    def profiled(x: str) -> bool:
+        start = clock()
+        try:
+            return search(x)
+        finally:
+            row[1] += 1
+            row[2] += clock() - start
+
+    return profiled
@@ -21,9 +21,10 @@ from fastjsonschema.ref_resolver import (
 )
 
 if _TYPE_CHECKING:
-    from collections.abc import Callable, Iterator
+    from collections.abc import Callable, Generator, Iterator
 
-    from .types import Json, Schema, Validator
+    from .iterative import Node
+    from .types import Check, Json, Schema, Validator
 
 
 class RefTracker:
@@ -41,6 +42,9 @@ class RefTracker:
         self._queued: list[str] = []
         self._picked: set[str] = set()
         self.compiled: dict[str, Validator] = {}
+        self.checks: dict[str, Check] = {}
+        self.nodes: dict[str, Node] = {}
+        self._linking: set[tuple[Callable, str]] = set()  # see `compile.link`
 
         self._resolver = RefResolver.from_schema(schema, store={}, handlers=handlers)
 
@@ -52,7 +56,8 @@ class RefTracker:
         return bool(self._queued)
 
     def queue(self, uri: str) -> None:
-        self._queued.append(uri)
+        if uri not in self._queued:  # both engines queue the same refs
+            self._queued.append(uri)
 
     def pop(self) -> str:
         uri = self._queued.pop()
@@ -66,6 +71,14 @@ class RefTracker:
     def entrypoint(self) -> Validator:
         return self.compiled[self._entrypoint_uri]
 
+    @property
+    def entrypoint_check(self) -> Check:
+        return self.checks[self._entrypoint_uri]
+
+    @property
+    def entrypoint_node(self) -> Node:
+        return self.nodes[self._entrypoint_uri]
+
 
 def request_handler(uri: str) -> Json:
     request = _request.Request(uri, headers={"User-Agent": "jsonscreamer"})  # noqa: S310
@@ -148,6 +161,20 @@ class RefResolver(_FastRefResolver):
         finally:
             self.base_uri, self.schema = old_base_uri, old_schema
 
+    def snapshot(self) -> tuple[str, Schema | bool, str]:
+        """Capture the document and scope being resolved, see `restored`."""
+        return self.base_uri, self.schema, self.resolution_scope
+
+    @_contextlib.contextmanager
+    def restored(self, snapshot: tuple[str, Schema | bool, str]) -> Generator[None]:
+        """Context manager which returns to a snapshot, to resolve refs later on."""
+        old = self.snapshot()
+        self.base_uri, self.schema, self.resolution_scope = snapshot
+        try:
+            yield
+        finally:
+            self.base_uri, self.schema, self.resolution_scope = old
+
     def walk(self, node: dict, arbitrary_keys: bool = False) -> None:
         """
         Walk thru schema and dereferencing ``id`` and ``$ref`` instances
@@ -1,16 +1,17 @@
 from __future__ import annotations
 
+import threading as _threading
 from collections.abc import (
     Callable as _Callable,
+    Collection as _Collection,
     Mapping as _Mapping,
     Sequence as _Sequence,
 )
-from dataclasses import dataclass
+from dataclasses import dataclass, field as _field
 from typing import TYPE_CHECKING, Any as _Any, Protocol as _Protocol
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
-
+    from .memo import Memo
     from .resolve import RefTracker
 
 Json = None | bool | int | float | str | _Sequence["Json"] | _Mapping[str, "Json"]
@@ -35,13 +36,30 @@ class Context:
     formats: dict[str, Format]
     tracker: RefTracker
 
+    # Compiled subschemas by canonical form, see `compile.interned`
+    interned: dict[_Any, _Any] = _field(default_factory=dict)
+    shared: int = 0  # number of compilations saved by interning
+
+    # Compile subschemas on first use, see `compile._lazy`
+    lazy: bool = False
+    lock: _threading.RLock = _field(default_factory=_threading.RLock)
+
+    # Let checks learn their order from traffic, see `adaptive`
+    adaptive: bool = False
+
+    # Remember combinators' subschema outcomes within a validation, see `memo`
+    memo: Memo | None = None
+
 
 Schema = dict[str, _Any]
 Result = ValidationError | None
 
 
 class Validator(_Protocol):
-    def __call__(self, x: Json, path: Path) -> Iterable[ValidationError]: ...
+    def __call__(self, x: Json, path: Path, errors: list[ValidationError]) -> None: ...
 
 
+Check = _Callable[[Json], bool]
 Compiler = _Callable[[Schema, Context], Validator | None]
+CheckCompiler = _Callable[[Schema, Context], Check | None]
+CheckGroupCompiler = _Callable[[Schema, Context], tuple[Check | None, _Collection[str]]]
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from jsonscreamer.format import FORMATS
+from jsonscreamer.resolve import RefTracker
+from jsonscreamer.types import Context
+
+if TYPE_CHECKING:
+    from jsonscreamer.types import Format, Json, Schema, ValidationError, Validator
+
+
+def errors_for(validator: Validator, instance: Json) -> list[ValidationError]:
+    """Run a compiled validator from the root of an instance."""
+    errors: list[ValidationError] = []
+    validator(instance, [], errors)
+    return errors
+
+
+def make_context(
+    schema: Schema | bool = True, formats: dict[str, Format] = FORMATS
+) -> Context:
+    """A real compilation context, for compilers which recurse into subschemas."""
+    return Context(formats, RefTracker(schema, {}))
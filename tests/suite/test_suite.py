@@ -7,6 +7,7 @@ import pathlib
 import pytest
 
 from jsonscreamer import Validator
+from jsonscreamer.types import ValidationError
 
 HERE = pathlib.Path(__file__).parent
 TEST_SUITE = HERE / "JSON-Schema-Test-Suite" / "tests"
@@ -30,16 +31,22 @@ def _enumerate_test_cases():
 
 
 @pytest.mark.usefixtures("_remote_ref_server")
+@pytest.mark.parametrize("mode", ("eager", "iterative", "lazy"))
 @pytest.mark.parametrize("test_case", _enumerate_test_cases())
-def test_draft7(test_case):
+def test_draft7(test_case, mode):
     if (description := test_case["description"]) in XFAILS:
         pytest.xfail(f"{description} is not yet supported")
 
     schema = test_case["schema"]
-    validator = Validator(schema)
+    validator = Validator(schema, iterative=mode == "iterative", lazy=mode == "lazy")
 
     for test in test_case["tests"]:
+        errors = list(validator.iter_errors(test["data"]))
         if test["valid"]:
             assert validator.is_valid(test["data"]), test["description"]
+            assert not errors, test["description"]
         else:
             assert not validator.is_valid(test["data"]), test["description"]
+            assert errors, test["description"]
+            with pytest.raises(ValidationError):
+                validator.validate(test["data"])
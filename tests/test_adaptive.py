@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import pytest
+
+from jsonscreamer import Validator, adaptive
+
+
+@pytest.fixture()
+def _short_window(monkeypatch):
+    monkeypatch.setattr(adaptive, "WINDOW", 10)
+
+
+def _counting_formats(calls: list[str], *names: str) -> dict:
+    def counter(name: str):
+        def check(x: str) -> bool:
+            calls.append(name)
+            return x.startswith(name)
+
+        return check
+
+    return {name: counter(name) for name in names}
+
+
+@pytest.mark.usefixtures("_short_window")
+def test_any_of_learns_branch_order():
+    calls: list[str] = []
+    schema = {"anyOf": [{"format": "a"}, {"format": "b"}, {"format": "c"}]}
+    formats = _counting_formats(calls, "a", "b", "c")
+    validator = Validator(schema, formats=formats, adaptive=True)
+
+    for _ in range(10):
+        assert validator.is_valid("c...")
+    assert calls[-3:] == ["a", "b", "c"]
+
+    calls.clear()
+    assert validator.is_valid("c...")
+    assert calls == ["c"]
+
+    # still correct for the other branches
+    assert validator.is_valid("a...")
+    assert not validator.is_valid("d...")
+    assert [e.validator for e in validator.iter_errors("d...")] == ["anyOf"]
+
+
+@pytest.mark.usefixtures("_short_window")
+def test_keywords_learn_failure_order():
+    calls: list[str] = []
+    schema = {"type": "string", "format": "a", "pattern": "z$"}
+    formats = _counting_formats(calls, "a")
+    validator = Validator(schema, formats=formats, adaptive=True)
+
+    for _ in range(10):
+        assert not validator.is_valid("a...")
+    assert len(calls) == 10
+
+    # the pattern fails every time, so now runs before the format
+    calls.clear()
+    assert not validator.is_valid("a...")
+    assert calls == []
+    assert validator.is_valid("a..z")
+    assert not validator.is_valid(42)
+
+
+def test_adaptive_agrees_with_default():
+    schema = {
+        "type": "object",
+        "properties": {"id": {"anyOf": [{"type": "string"}, {"type": "integer"}]}},
+        "required": ["id"],
+        "maxProperties": 2,
+    }
+    instances = [{"id": 1}, {"id": "1"}, {"id": None}, {}, {"id": 1, "a": 1, "b": 2}]
+
+    default = Validator(schema)
+    validator = Validator(schema, adaptive=True)
+    for _ in range(adaptive.WINDOW // len(instances) + 1):
+        for instance in instances:
+            assert validator.is_valid(instance) == default.is_valid(instance)
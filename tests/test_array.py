@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from jsonscreamer import Validator
+import pytest
+
+from jsonscreamer import Validator, array
 
 
 def test_contains():
@@ -23,3 +25,106 @@ def test_max_contains():
     assert validator.is_valid([1])
     assert validator.is_valid([1, 2])
     assert not validator.is_valid([1, 2, 3])
+
+
+@pytest.mark.parametrize(
+    ("bounds", "calls"),
+    [({}, 1), ({"minContains": 3}, 3), ({"minContains": 2, "maxContains": 3}, 4)],
+)
+def test_contains_single_pass(bounds: dict, calls: int):
+    seen: list[str] = []
+
+    def counted(x: str) -> bool:
+        seen.append(x)
+        return True
+
+    schema = {"contains": {"format": "counted"}, **bounds}
+    validator = Validator(schema, formats={"counted": counted})
+
+    # each item is checked at most once, and only until the outcome is known
+    validator.is_valid(["a"] * 10)
+    assert len(seen) == calls
+
+    seen.clear()
+    list(validator.iter_errors(["a"] * 10))
+    assert len(seen) == calls
+
+
+def test_contains_bounds_agree():
+    schema = {"contains": {"type": "integer"}, "minContains": 2, "maxContains": 3}
+    validator = Validator(schema)
+    iterative = Validator(schema, iterative=True)
+
+    for n in range(6):
+        instance = [*range(n), "a"]
+        expected = 2 <= n <= 3
+        assert validator.is_valid(instance) == expected
+        assert iterative.is_valid(instance) == expected
+        assert (not list(validator.iter_errors(instance))) == expected
+
+    errors = list(validator.iter_errors(["a"]))
+    assert [e.validator for e in errors] == ["contains", "minContains"]
+
+
+def test_unique_items():
+    validator = Validator({"uniqueItems": True})
+
+    assert validator.is_valid([0, False, 1, True, [0], [False], {"a": 0}, {"a": False}])
+    assert not validator.is_valid([1, 1.0])
+    assert not validator.is_valid([{"a": [1], "b": 2}, {"b": 2, "a": [1]}])
+
+    items = [{"id": i, "tags": ["x", i % 2 == 0]} for i in range(50_000)]
+    assert validator.is_valid(items)
+    assert not validator.is_valid([*items, {"id": 7, "tags": ["x", False]}])
+
+
+NUMBERS = [float(i) for i in range(40)]
+BULK_INSTANCES = [
+    NUMBERS,
+    list(range(40)),
+    [*NUMBERS, -1],
+    [*NUMBERS, 100],
+    [*NUMBERS, 2.5],
+    [*NUMBERS, 1.5],
+    [*NUMBERS, True],
+    [*NUMBERS, "1"],
+    [*NUMBERS, float("inf")],
+    [*range(0, 80, 2), 3 * 2**50, -(2**52)],
+    [*range(40), 2**52 - 1],
+    [*range(40), 2**60],
+    [*range(40), 2**60 + 1],
+]
+
+
+@pytest.mark.parametrize(
+    "schema",
+    [
+        {"type": "number", "minimum": 0, "maximum": 50},
+        {"type": "number", "exclusiveMinimum": -1, "exclusiveMaximum": 2**61},
+        {"type": "integer", "minimum": 0},
+        {"type": "number", "multipleOf": 0.5},
+        {"type": "integer", "multipleOf": 2},
+        {"type": "number", "multipleOf": 3},
+        {"type": "number", "minimum": 0, "description": "annotations are ignored"},
+    ],
+)
+@pytest.mark.parametrize("vectorised", [True, False])
+def test_items_in_bulk(monkeypatch, schema: dict, vectorised: bool):
+    if not vectorised:
+        monkeypatch.setattr(array, "_np", None)
+
+    validator = Validator({"items": schema})
+    single = Validator(schema)
+
+    for instance in BULK_INSTANCES:
+        expected = [ix for ix, i in enumerate(instance) if not single.is_valid(i)]
+        assert validator.is_valid(instance) == (not expected), instance
+
+        errors = list(validator.iter_errors(instance))
+        assert [e.absolute_path[0] for e in errors] == expected
+
+
+def test_bulk_ignores_annotations():
+    schema = {"type": "number", "minimum": 0, "title": "Price", "default": 0}
+    assert array._numbers_in_bulk(schema) is not None
+    assert array._numbers_in_bulk({**schema, "format": "price"}) is None
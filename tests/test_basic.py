@@ -7,22 +7,26 @@ import pytest
 
 from jsonscreamer import Validator
 from jsonscreamer.basic import (
-    _StrictBool,
+    _freeze,
     const,
     enum,
     exclusive_maximum,
     exclusive_minimum,
     format_,
     max_length,
+    max_length_check,
     maximum,
     min_length,
+    min_length_check,
     minimum,
     multiple_of,
     pattern,
 )
-from jsonscreamer.compile import type_
+from jsonscreamer.compile import type_, type_check
 from jsonscreamer.format import FORMATS
 
+from .helpers import errors_for
+
 TYPENAMES = ("boolean", "integer", "null", "number", "string", "zzzzzz")
 _VALID = {
     "boolean": (bool,),
@@ -68,22 +72,49 @@ def test_validate_type(typename):
             assert result
 
 
+@pytest.mark.parametrize("typename", _VALID)
+def test_type_check(typename):
+    check = type_check({"type": typename}, mock.Mock())
+    valid = _VALID[typename]
+
+    for value in (-100, 0, 3.14, None, "lol", {}, [], True):
+        expected = isinstance(value, valid) and (
+            typename == "boolean" or not isinstance(value, bool)
+        )
+        assert check(value) == expected, f"{value!r} as {typename}"
+
+
 def test_min_max_length():
     defn = {"type": "string", "minLength": 3}
     validator = min_length(defn, mock.Mock())
     assert validator
 
-    assert list(validator("fo", []))
-    assert list(validator("foo", [])) == []
-    assert list(validator("fooooo", [])) == []
+    assert errors_for(validator, "fo")
+    assert errors_for(validator, "foo") == []
+    assert errors_for(validator, "fooooo") == []
 
     defn = {"type": "string", "maxLength": 3}
     validator = max_length(defn, mock.Mock())
     assert validator
 
-    assert list(validator("fo", [])) == []
-    assert list(validator("foo", [])) == []
-    assert list(validator("fooooo", []))
+    assert errors_for(validator, "fo") == []
+    assert errors_for(validator, "foo") == []
+    assert errors_for(validator, "fooooo")
+
+
+def test_min_max_length_check():
+    check = min_length_check({"minLength": 3}, mock.Mock())
+    assert check
+
+    assert not check("fo")
+    assert check("foo")
+    assert check(12)  # other types are not constrained
+
+    check = max_length_check({"type": "string", "maxLength": 3}, mock.Mock())
+    assert check
+
+    assert check("foo")
+    assert not check("fooooo")
 
 
 def test_pattern():
@@ -96,50 +127,50 @@ def test_pattern():
     validator = pattern(defn, mock.Mock())
     assert validator
 
-    assert list(validator("", []))
-    assert list(validator("foo@bar.com", [])) == []
-    assert list(validator(" foo@bar.com", []))
-    assert list(validator("foo@bar.com etc", []))
+    assert errors_for(validator, "")
+    assert errors_for(validator, "foo@bar.com") == []
+    assert errors_for(validator, " foo@bar.com")
+    assert errors_for(validator, "foo@bar.com etc")
 
 
 def test_min():
     defn = {"type": "number", "minimum": 3}
     validator = minimum(defn, mock.Mock())
     assert validator
-    assert list(validator(0, []))
-    assert list(validator(3, [])) == []
-    assert list(validator(5, [])) == []
-    assert list(validator(7, [])) == []
-    assert list(validator(10, [])) == []
+    assert errors_for(validator, 0)
+    assert errors_for(validator, 3) == []
+    assert errors_for(validator, 5) == []
+    assert errors_for(validator, 7) == []
+    assert errors_for(validator, 10) == []
 
     defn = {"type": "number", "exclusiveMinimum": 3}
     validator = exclusive_minimum(defn, mock.Mock())
     assert validator
-    assert list(validator(0, []))
-    assert list(validator(3, []))
-    assert list(validator(5, [])) == []
-    assert list(validator(7, [])) == []
-    assert list(validator(10, [])) == []
+    assert errors_for(validator, 0)
+    assert errors_for(validator, 3)
+    assert errors_for(validator, 5) == []
+    assert errors_for(validator, 7) == []
+    assert errors_for(validator, 10) == []
 
 
 def test_max():
     defn = {"type": "number", "maximum": 7}
     validator = maximum(defn, mock.Mock())
     assert validator
-    assert list(validator(0, [])) == []
-    assert list(validator(3, [])) == []
-    assert list(validator(5, [])) == []
-    assert list(validator(7, [])) == []
-    assert list(validator(10, []))
+    assert errors_for(validator, 0) == []
+    assert errors_for(validator, 3) == []
+    assert errors_for(validator, 5) == []
+    assert errors_for(validator, 7) == []
+    assert errors_for(validator, 10)
 
     defn = {"type": "number", "exclusiveMaximum": 7}
     validator = exclusive_maximum(defn, mock.Mock())
     assert validator
-    assert list(validator(0, [])) == []
-    assert list(validator(3, [])) == []
-    assert list(validator(5, [])) == []
-    assert list(validator(7, []))
-    assert list(validator(10, []))
+    assert errors_for(validator, 0) == []
+    assert errors_for(validator, 3) == []
+    assert errors_for(validator, 5) == []
+    assert errors_for(validator, 7)
+    assert errors_for(validator, 10)
 
 
 def test_multiple():
@@ -147,40 +178,40 @@ def test_multiple():
     validator = multiple_of(defn, mock.Mock())
 
     assert validator
-    assert list(validator(6, [])) == []
-    assert list(validator(1, []))
-    assert list(validator(-9, [])) == []
-    assert list(validator(-7, []))
+    assert errors_for(validator, 6) == []
+    assert errors_for(validator, 1)
+    assert errors_for(validator, -9) == []
+    assert errors_for(validator, -7)
 
     defn = {"type": "number", "multipleOf": 3.14}
     validator = multiple_of(defn, mock.Mock())
 
     assert validator
-    assert list(validator(6.28, [])) == []
-    assert list(validator(1, []))
-    assert list(validator(-9.42, [])) == []
-    assert list(validator(-7, []))
+    assert errors_for(validator, 6.28) == []
+    assert errors_for(validator, 1)
+    assert errors_for(validator, -9.42) == []
+    assert errors_for(validator, -7)
 
 
 def test_enum():
     defn = {"type": "string", "enum": list("ab")}
     validator = enum(defn, mock.Mock())
 
-    assert list(validator("a", [])) == []
-    assert list(validator("b", [])) == []
-    assert list(validator("c", []))
+    assert errors_for(validator, "a") == []
+    assert errors_for(validator, "b") == []
+    assert errors_for(validator, "c")
 
 
 def test_const():
     defn = {"type": "string", "const": "a"}
     validator = const(defn, mock.Mock())
-    assert list(validator("a", [])) == []
-    assert list(validator("b", []))
+    assert errors_for(validator, "a") == []
+    assert errors_for(validator, "b")
 
     defn = {"type": "integer", "const": 3}
     validator = const(defn, mock.Mock())
-    assert list(validator(3, [])) == []
-    assert list(validator(5, []))
+    assert errors_for(validator, 3) == []
+    assert errors_for(validator, 5)
 
 
 def test_format():
@@ -188,8 +219,8 @@ def test_format():
     validator = format_(defn, mock.Mock(formats=FORMATS))
 
     assert validator
-    assert list(validator("2020-01-01", [])) == []
-    assert list(validator("oops", []))
+    assert errors_for(validator, "2020-01-01") == []
+    assert errors_for(validator, "oops")
 
     # Unkown format ignored
     defn = {"type": "string", "format": "oops"}
@@ -225,7 +256,7 @@ def test_format_overrides():
     assert validator.is_valid({"date": "2020-01-01"})
 
 
-@pytest.mark.parametrize("wrap_testcase", (True, False))
+@pytest.mark.parametrize("nest", (lambda x: x, lambda x: [x], lambda x: {"a": x}))
 @pytest.mark.parametrize(
     "wrapped,testcase,equal",
     (
@@ -236,6 +267,7 @@ def test_format_overrides():
         (False, False, True),
         (False, 0, False),
         (1, 1, True),
+        (1, 1.0, True),
         (1, True, False),
         (1, 5, False),
         (0, 0, True),
@@ -244,13 +276,26 @@ def test_format_overrides():
         (0, 1, False),
     ),
 )
-def test_strict_bool(wrapped, testcase, equal, wrap_testcase):
-    if wrap_testcase:
-        testcase = _StrictBool(testcase)
+def test_freeze(wrapped, testcase, equal, nest):
+    wrapped, testcase = _freeze(nest(wrapped)), _freeze(nest(testcase))
 
     if equal:
-        assert _StrictBool(wrapped) == testcase
-        assert len({_StrictBool(wrapped), testcase}) == 1
+        assert wrapped == testcase
+        assert len({wrapped, testcase}) == 1
     else:
-        assert _StrictBool(wrapped) != testcase
-        assert len({_StrictBool(wrapped), testcase}) == 2
+        assert wrapped != testcase
+        assert len({wrapped, testcase}) == 2
+
+
+def test_enum_and_const_containers():
+    validator = Validator({"enum": [[0], {"a": False}, 1], "const": [0]})
+    assert validator.is_valid([0])
+    assert validator.is_valid([0.0])
+    assert not validator.is_valid([False])
+    assert not validator.is_valid(1)
+
+    validator = Validator({"enum": [{"a": [1, {"b": None}]}, "x"]})
+    assert validator.is_valid({"a": [1, {"b": None}]})
+    assert not validator.is_valid({"a": [True, {"b": None}]})
+    assert not validator.is_valid({"a": [1, {"b": None}], "c": 1})
+    assert not validator.is_valid(["x"])
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import gc
+import re
+from typing import TYPE_CHECKING
+
+import pytest
+
+from jsonscreamer import Validator
+
+if TYPE_CHECKING:
+    from typing import Any
+
+SCHEMA = {"type": "object", "required": ["a", "b"], "maxProperties": 2}
+INSTANCES = [{"a": 1, "b": 2}, {}, {"a": 1}, {"a": 1, "b": 2}, 4, {"a": 1, "b": 2}]
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 4, 100])
+@pytest.mark.parametrize("iterative", [False, True])
+@pytest.mark.parametrize("workers", [1, 3])
+def test_validate_many(chunksize: int, iterative: bool, workers: int):
+    validator = Validator(SCHEMA, iterative=iterative)
+
+    flagged = validator.validate_many(
+        iter(INSTANCES), chunksize=chunksize, workers=workers
+    )
+    assert flagged.valid == bytearray([1, 0, 0, 1, 0, 1])
+    assert list(flagged.invalid()) == [1, 2, 4]
+    assert flagged.errors == {}
+    assert len(flagged) == len(INSTANCES)
+
+    first = validator.validate_many(
+        INSTANCES, mode="first", chunksize=chunksize, workers=workers
+    )
+    assert first.valid == flagged.valid
+    assert {ix: len(errs) for ix, errs in first.errors.items()} == {1: 1, 2: 1, 4: 1}
+
+    every = validator.validate_many(
+        INSTANCES, mode="all", chunksize=chunksize, workers=workers
+    )
+    assert every.valid == flagged.valid
+    assert {ix: [e.message for e in errs] for ix, errs in every.errors.items()} == {
+        ix: [e.message for e in validator.iter_errors(INSTANCES[ix])]
+        for ix in (1, 2, 4)
+    }
+
+
+def test_validate_many_options():
+    # formats may return any truthy value
+    formats: dict[str, Any] = {"digits": re.compile(r"\d+").fullmatch}
+    validator = Validator({"format": "digits"}, formats=formats)
+    assert validator.validate_many(["1", "a", "22"]).valid == bytearray([1, 0, 1])
+    assert validator.is_valid("1") is True
+    assert validator.is_valid("a") is False
+    assert validator.validate_many([]).valid == bytearray()
+
+    assert gc.isenabled()
+    validator.validate_many(["1"], pause_gc=True)
+    assert gc.isenabled()
+
+    with pytest.raises(ValueError, match="unknown mode"):
+        validator.validate_many([], mode="some")  # type: ignore (checked at runtime)
+    with pytest.raises(ValueError, match="chunksize"):
+        validator.validate_many([], chunksize=0)
+    with pytest.raises(ValueError, match="workers"):
+        validator.validate_many([], workers=0)
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from jsonscreamer import Validator
+from jsonscreamer.cache import ValidatorCache, fingerprint
+
+
+def test_cached():
+    validator = Validator.cached({"type": "string", "maxLength": 3})
+    assert validator is Validator.cached({"maxLength": 3, "type": "string"})
+    assert validator is not Validator.cached({"type": "string", "maxLength": 4})
+
+    assert validator.is_valid("foo")
+    assert not validator.is_valid("fooo")
+
+
+def test_fingerprint_distinguishes_options():
+    schema = {"type": "string", "format": "date"}
+
+    def is_date(x: str) -> bool:
+        return True
+
+    key, _ = fingerprint(schema)
+    assert key == fingerprint(dict(schema))[0]
+    assert key != fingerprint(schema, formats=False)[0]
+    assert key != fingerprint(schema, formats={"date": is_date})[0]
+    assert key != fingerprint(schema, iterative=True)[0]
+    # 1, 1.0 and True are different schema values
+    assert fingerprint({"const": 1})[0] != fingerprint({"const": True})[0]
+    assert fingerprint({"const": 1})[0] != fingerprint({"const": 1.0})[0]
+
+
+def test_lru_eviction():
+    cache = ValidatorCache(maxsize=2)
+    first = cache.get({"minimum": 1})
+    cache.get({"minimum": 2})
+    assert cache.get({"minimum": 1}) is first  # now most recently used
+    cache.get({"minimum": 3})  # evicts {"minimum": 2}
+
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.evictions, info.currsize) == (1, 3, 1, 2)
+
+    assert cache.get({"minimum": 1}) is first
+    assert cache.cache_info().hits == 2
+    cache.get({"minimum": 2})
+    assert cache.cache_info().misses == 4
+
+
+def test_memory_budget():
+    small = {"type": "string"}
+    _, nbytes = fingerprint(small)
+    cache = ValidatorCache(maxsize=None, max_bytes=2 * nbytes)
+
+    cache.get(small)
+    cache.get({"type": "number"})
+    assert cache.cache_info().currsize == 2
+
+    # too big for the budget: everything else goes, but the newest is kept
+    cache.get({"enum": list(range(1000))})
+    info = cache.cache_info()
+    assert info.currsize == 1
+    assert info.evictions == 2
+    assert info.nbytes > 2 * nbytes
+
+    cache.clear()
+    assert cache.cache_info() == (0, 0, 0, 0, None, 0, 2 * nbytes)
+
+
+def test_same_schema_skips_fingerprint(monkeypatch):
+    calls = []
+
+    def counted(*args, **kwargs):
+        calls.append(args)
+        return fingerprint(*args, **kwargs)
+
+    monkeypatch.setattr("jsonscreamer.cache.fingerprint", counted)
+    cache = ValidatorCache(maxsize=1)
+    schema = {"type": "integer"}
+
+    validator = cache.get(schema)
+    assert cache.get(schema) is validator
+    assert cache.get(dict(schema)) is validator
+    assert cache.get(schema, formats=False) is not validator
+    assert len(calls) == 3
+    assert cache.cache_info().hits == 2
+
+    # evicted entries forget their schemas too
+    assert cache.get(schema) is not validator
+    assert len(calls) == 4
+    assert len(cache._seen) == 1
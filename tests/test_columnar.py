@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import pytest
+
+from jsonscreamer import Validator, columnar
+
+from .helpers import make_context
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "integer", "minimum": 1},
+        "name": {"type": "string", "minLength": 1, "maxLength": 8},
+        "currency": {"enum": ["GBP", "EUR", None]},
+        "price": {"type": "number", "exclusiveMinimum": 0, "multipleOf": 0.01},
+        "active": {"type": "boolean"},
+        "tags": {"type": "array", "items": {"type": "string"}},
+        "anything": True,
+    },
+    "required": ["id", "name", "sku"],
+    "additionalProperties": False,
+}
+VALID = {
+    "id": 1,
+    "name": "spam",
+    "currency": "GBP",
+    "price": 1.5,
+    "active": True,
+    "tags": [],
+    "sku": "a",
+}
+INVALID = [
+    {"id": 0},
+    {"id": 1.5},
+    {"id": True},
+    {"name": ""},
+    {"name": "spam and eggs"},
+    {"name": 1},
+    {"currency": "USD"},
+    {"currency": 1},
+    {"price": 0},
+    {"price": 1.001},
+    {"active": 1},
+    {"tags": [1]},
+    {"extra": 1},
+]
+
+
+def _batch() -> list:
+    batch = [{**VALID, "id": i + 1} for i in range(50)]
+    for ix, change in enumerate(INVALID):
+        batch[3 * ix + 1] = {**VALID, **change}
+    batch[2] = {k: v for k, v in VALID.items() if k != "sku"}
+    batch[5] = {k: v for k, v in VALID.items() if k not in ("currency", "tags")}
+    return batch
+
+
+def _expected(validator: Validator, records: list) -> dict[int, list[str]]:
+    errors = {ix: list(validator.iter_errors(r)) for ix, r in enumerate(records)}
+    return {ix: [e.message for e in errs] for ix, errs in errors.items() if errs}
+
+
+def _messages(errors: dict) -> dict[int, list[str]]:
+    return {ix: [e.message for e in errs] for ix, errs in errors.items()}
+
+
+@pytest.mark.parametrize(
+    "records",
+    [_batch(), [VALID] * 10, [], [VALID, "spam", None, {"id": 1}]],
+)
+def test_columnar_errors(records: list):
+    validator = Validator(SCHEMA)
+
+    errors = validator.columnar_errors(records)
+    assert _messages(errors) == _expected(validator, records)
+
+
+def test_columnar_plan():
+    batch = _batch()
+    find = columnar.suspects(SCHEMA, make_context(SCHEMA))
+    assert find is not None
+    assert find(batch) == sorted(_expected(Validator(SCHEMA), batch))
+
+    # keywords beyond the properties: checked record by record
+    assert columnar.suspects({**SCHEMA, "minProperties": 1}, make_context()) is None
+    assert columnar.suspects({"type": "array"}, make_context()) is None
+
+    validator = Validator({**SCHEMA, "maxProperties": 6})
+    assert _messages(validator.columnar_errors(batch)) == _expected(validator, batch)
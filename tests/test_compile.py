@@ -1,6 +1,23 @@
 from __future__ import annotations
 
-from jsonscreamer.compile import _name_from_validator
+import collections
+import concurrent.futures
+
+import pytest
+
+from jsonscreamer import Validator, compile
+from jsonscreamer.basic import max_length_check, minimum_check
+from jsonscreamer.compile import (
+    _COMPILATION_FUNCTIONS,
+    _name_from_validator,
+    _never,
+    compile_,
+    compile_check,
+    fuse,
+)
+from jsonscreamer.types import ValidationError
+
+from .helpers import errors_for, make_context
 
 
 def test_name_from_validator() -> None:
@@ -16,3 +33,290 @@ def test_name_from_validator() -> None:
     assert _name_from_validator(not_) == "not"
     assert _name_from_validator(a_long_name) == "aLongName"
     assert _name_from_validator(x_123_a) == "x123A"
+
+
+def test_legacy_validators_are_adapted(monkeypatch) -> None:
+    monkeypatch.setattr(compile, "_COMPILATION_FUNCTIONS", dict(_COMPILATION_FUNCTIONS))
+
+    def even_length(defn, context):
+        def validate(x, path):
+            if len(x) % 2:
+                yield ValidationError(tuple(path), f"{x!r} is odd", "evenLength")
+
+        return validate
+
+    compile.register(even_length)  # type: ignore (the legacy signature)
+    with pytest.warns(DeprecationWarning, match="evenLength"):
+        validator = compile_({"items": {"evenLength": True}}, make_context())
+
+    errors = errors_for(validator, ["ab", "abc"])
+    assert [(e.absolute_path, e.message) for e in errors] == [((1,), "'abc' is odd")]
+
+
+def test_custom_keywords_are_checked(monkeypatch) -> None:
+    monkeypatch.setattr(compile, "_COMPILATION_FUNCTIONS", dict(_COMPILATION_FUNCTIONS))
+
+    def even(defn, context):
+        def validate(x, path, errors):
+            if isinstance(x, int) and x % 2:
+                errors.append(ValidationError(tuple(path), f"{x!r} is odd", "even"))
+
+        return validate
+
+    def even_length(defn, context):
+        def validate(x, path):
+            if len(x) % 2:
+                yield ValidationError(tuple(path), f"{x!r} is odd", "evenLength")
+
+        return validate
+
+    compile.register(even)
+    compile.register(even_length)  # type: ignore (the legacy signature)
+
+    for iterative in False, True:
+        validator = Validator({"even": True, "minimum": 0}, iterative=iterative)
+        assert validator.is_valid(2) is True
+        assert validator.is_valid(3) is False
+        with pytest.raises(ValidationError, match="3 is odd"):
+            validator.validate(3)
+
+    with pytest.warns(DeprecationWarning, match="evenLength"):
+        validator = Validator({"items": {"evenLength": True}})
+    assert validator.is_valid(["ab"]) is True
+    assert validator.is_valid(["ab", "abc"]) is False
+    with pytest.raises(ValidationError, match="'abc' is odd"):
+        validator.validate(["ab", "abc"])
+
+
+def test_interning_shares_identical_subschemas() -> None:
+    short = {"type": "string", "maxLength": 3}
+    schema = {
+        "properties": {
+            "a": short,
+            "b": {"maxLength": 3, "type": "string"},  # same, reordered
+            "c": {"type": "string", "maxLength": 4},
+        }
+    }
+    context = make_context(schema)
+
+    validator = compile_(schema, context)
+    assert context.shared == 0  # errors follow the order of the keys
+    assert compile_(dict(short), context) is compile_(short, context)
+
+    assert errors_for(validator, {"a": "abc", "b": "abc", "c": "abcd"}) == []
+    assert len(errors_for(validator, {"a": "abcd", "b": "abcd", "c": "abcd"})) == 2
+
+    shared = context.shared
+    check = compile_check(schema, context)
+    assert context.shared == shared + 1  # checks don't
+    assert check({"a": "abc", "b": "abc", "c": "abcd"})
+    assert not check({"a": "abc", "b": "abcd"})
+
+
+def test_interning_keeps_error_order() -> None:
+    schema = {
+        "properties": {
+            "a": {"minLength": 5, "pattern": "^x"},
+            "b": {"pattern": "^x", "minLength": 5},  # same, reordered
+        }
+    }
+    validator = Validator(schema)
+    assert [e.validator for e in validator.iter_errors({"a": "abc"})] == [
+        "minLength",
+        "pattern",
+    ]
+    assert [e.validator for e in validator.iter_errors({"b": "abc"})] == [
+        "pattern",
+        "minLength",
+    ]
+
+
+def test_interning_respects_resolution_scope() -> None:
+    # The two `$ref`s are identical but point at different definitions
+    schema = {
+        "properties": {
+            "a": {
+                "$id": "http://example.com/a.json",
+                "properties": {"x": {"$ref": "#/definitions/x"}},
+                "definitions": {"x": {"type": "string"}},
+            },
+            "b": {
+                "$id": "http://example.com/b.json",
+                "properties": {"x": {"$ref": "#/definitions/x"}},
+                "definitions": {"x": {"type": "integer"}},
+            },
+        }
+    }
+    validator = Validator(schema)
+
+    assert validator.is_valid({"a": {"x": "spam"}, "b": {"x": 42}})
+    assert not validator.is_valid({"a": {"x": 42}})
+    assert not validator.is_valid({"b": {"x": "spam"}})
+
+
+def test_lazy_compiles_on_demand() -> None:
+    schema = {
+        "properties": {
+            "a": {"$ref": "#/definitions/a"},
+            "b": {"$ref": "#/definitions/b"},
+        },
+        "definitions": {
+            "a": {"type": "string"},
+            "b": {"type": "integer"},
+        },
+    }
+    validator = Validator(schema, lazy=True)
+    compiled = validator._context.tracker.compiled
+    assert list(compiled) == [""]  # just the entrypoint
+
+    assert validator.is_valid({"a": "spam"})
+    assert len(compiled) == 2
+
+    assert not validator.is_valid({"a": "spam", "b": "eggs"})
+    assert len(compiled) == 3
+    assert [e.absolute_path for e in validator.iter_errors({"b": "eggs"})] == [("b",)]
+
+
+def test_lazy_is_thread_safe() -> None:
+    schema = {
+        "type": "array",
+        "items": {"$ref": "#/definitions/node"},
+        "definitions": {
+            "node": {
+                "type": "object",
+                "properties": {f"p{i}": {"maxLength": i} for i in range(50)},
+            }
+        },
+    }
+    instance = [{f"p{i}": "x" * i for i in range(50)}]
+    invalid = [{f"p{i}": "x" * (i + 1) for i in range(50)}]
+    validator = Validator(schema, lazy=True)
+
+    with concurrent.futures.ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(validator.is_valid, [instance, invalid] * 100))
+
+    assert results == [True, False] * 100
+
+
+def test_refs_are_linked_directly() -> None:
+    schema = {
+        "properties": {"a": {"$ref": "#/definitions/a"}},
+        "definitions": {"a": {"$ref": "#/definitions/b"}, "b": {"maxLength": 3}},
+    }
+    context = make_context(schema)
+    tracker = context.tracker
+
+    validator = compile_(schema["properties"]["a"], context)
+    assert validator is tracker.compiled["#/definitions/b"]
+    assert tracker.compiled["#/definitions/a"] is validator
+
+    check = compile_check(schema["properties"]["a"], context)
+    assert check is tracker.checks["#/definitions/b"]
+
+
+def test_cyclic_and_long_ref_chains() -> None:
+    # every definition refers to the next, and the last back to the root
+    chain = 100
+    schema: dict = {
+        "properties": {"next": {"$ref": "#/definitions/d0"}},
+        "definitions": {
+            f"d{i}": {"properties": {"next": {"$ref": f"#/definitions/d{i + 1}"}}}
+            for i in range(chain)
+        },
+        "maxProperties": 1,
+    }
+    schema["definitions"][f"d{chain}"] = {"$ref": "#"}
+    validator = Validator(schema)
+
+    def nested(depth: int, leaf: dict) -> dict:
+        for _ in range(depth):
+            leaf = {"next": leaf}
+        return leaf
+
+    assert validator.is_valid(nested(2 * chain, {}))
+    # only the root (reached again via the end of the chain) limits properties
+    assert validator.is_valid(nested(chain, {"next": {}, "spam": 42}))
+    assert not validator.is_valid(nested(chain + 1, {"next": {}, "spam": 42}))
+
+
+def test_type_dispatch() -> None:
+    schema = {"type": ["string", "integer"], "maxLength": 3, "minimum": 0}
+    validator = Validator(schema)
+
+    for valid in ("abc", 5, 5.0, _Str("abc"), _Int(5)):
+        assert validator.is_valid(valid), valid
+        assert list(validator.iter_errors(valid)) == [], valid
+
+    invalid = ("abcd", -1, 1.5, float("inf"), True, None, _Str("abcd"))
+    for value in invalid:
+        assert not validator.is_valid(value), value
+        assert list(validator.iter_errors(value)), value
+
+
+def test_type_dispatch_subclasses() -> None:
+    validator = Validator({"required": ["a"], "maxLength": 1})
+
+    assert validator.is_valid(collections.OrderedDict(a=1))
+    assert not validator.is_valid(collections.OrderedDict(b=1))
+    assert not validator.is_valid(_Str("ab"))
+    assert [e.validator for e in validator.iter_errors(_Str("ab"))] == ["maxLength"]
+
+
+def test_fuse() -> None:
+    schema = {"type": ["string", "integer"], "maxLength": 3, "minimum": 0}
+    context = make_context(schema)
+    short = max_length_check(schema, context)
+    positive = minimum_check(schema, context)
+    table = fuse(schema, [short, positive], _never)
+
+    assert table[str] == (short.__wrapped__,)  # type: ignore
+    assert table[int] == (positive.__wrapped__,)  # type: ignore
+    assert table[bool] == table[dict] == (_never,)
+    assert float not in table  # not every float is an integer
+
+
+@pytest.mark.parametrize("keyword", [{"minimum": 2}, {"multipleOf": 3}])
+@pytest.mark.parametrize("sibling", [{}, {"maxLength": 5}, {"maxProperties": 2}])
+@pytest.mark.parametrize(
+    "options", [{}, {"iterative": True}, {"lazy": True}, {"adaptive": True}]
+)
+def test_fuse_keeps_bools_numeric(keyword, sibling, options) -> None:
+    # Fusing must not change what the numeric guards accept: `bool` is an `int`
+    validator = Validator({**keyword, **sibling}, **options)
+    errors = list(validator.iter_errors(True))
+
+    assert validator.is_valid(True) is False
+    assert [e.validator for e in errors] == list(keyword)
+
+
+class _Int(int):
+    pass
+
+
+class _Str(str):
+    pass
+
+
+def test_cheap_checks_run_first() -> None:
+    calls = []
+
+    def expensive(x: str) -> bool:
+        calls.append(x)
+        return True
+
+    schema = {
+        "properties": {"a": {"type": "integer"}},
+        "format": "expensive",
+        "pattern": "^a",
+        "maxLength": 3,
+        "required": ["a"],
+    }
+    validator = Validator(schema, formats={"expensive": expensive})
+
+    assert not validator.is_valid("much too long")
+    assert not validator.is_valid({})
+    assert calls == []
+
+    # errors are still reported in schema order
+    errors = validator.iter_errors("much too long")
+    assert [e.validator for e in errors] == ["pattern", "maxLength"]
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import pytest
+
 from jsonscreamer import Validator
-from jsonscreamer.compile import compile_
+from jsonscreamer.compile import compile_, compile_check
 from jsonscreamer.resolve import RefTracker
-from jsonscreamer.types import Context
+from jsonscreamer.types import Context, ValidationError
+
+from .helpers import errors_for
 
 POST_BODY = {
     "id": 0,
@@ -63,11 +67,32 @@ SCHEMA = {
 def test_complex():
     validator = compile_(SCHEMA, Context({}, RefTracker(SCHEMA, {})))
 
-    assert list(validator("fish", []))
-    assert list(validator({}, []))
-    assert list(validator(POST_BODY, [])) == []
-    assert list(validator({**POST_BODY, "name": 3}, []))
-    assert list(validator({**POST_BODY, "category": {"name": "fish"}}, []))
+    assert errors_for(validator, "fish")
+    assert errors_for(validator, {})
+    assert errors_for(validator, POST_BODY) == []
+    assert errors_for(validator, {**POST_BODY, "name": 3})
+    assert errors_for(validator, {**POST_BODY, "category": {"name": "fish"}})
+
+
+def test_complex_check():
+    check = compile_check(SCHEMA, Context({}, RefTracker(SCHEMA, {})))
+
+    assert not check("fish")
+    assert not check({})
+    assert check(POST_BODY)
+    assert not check({**POST_BODY, "name": 3})
+    assert not check({**POST_BODY, "category": {"name": "fish"}})
+
+
+def test_validate_raises_first_error():
+    validator = Validator(SCHEMA)
+    validator.validate(POST_BODY)
+
+    with pytest.raises(ValidationError) as exc_info:
+        validator.validate({**POST_BODY, "name": 3})
+
+    assert exc_info.value.absolute_path == ("name",)
+    assert exc_info.value.validator == "type"
 
 
 def test_iter_errors():
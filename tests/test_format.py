@@ -4,7 +4,7 @@ import sys
 
 import pytest
 
-from jsonscreamer import format
+from jsonscreamer import Validator, format
 
 _TEST_CASES = {
     "is_date_time": [
@@ -186,3 +186,34 @@ def test_tests():
 )
 def test_is_date_time_iso(value, valid):
     assert format.is_date_time_iso(value) == valid
+
+
+def test_format_memo():
+    calls: list[str] = []
+
+    @format.pure
+    def is_currency(x: str) -> bool:
+        calls.append(x)
+        return x in {"GBP", "EUR"}
+
+    def is_impure(x: str) -> bool:
+        calls.append(x)
+        return True
+
+    schema = {"items": [{"format": "currency"}, {"format": "impure"}]}
+    formats = {"currency": is_currency, "impure": is_impure}
+    validator = Validator(schema, formats=formats, format_memo=2)
+
+    for _ in range(3):
+        assert validator.is_valid(["GBP", "x"])
+    assert not validator.is_valid(["USD", "x"])
+    assert calls == ["GBP", "x", "x", "x", "USD"]
+
+    info = validator.format_info()
+    assert "impure" not in info
+    assert info["currency"].hits == 2
+    assert info["currency"].misses == 2
+    assert info["date-time"].misses == 0  # built in formats are pure
+
+    # without the option, nothing is memoised
+    assert Validator(schema, formats=formats).format_info() == {}
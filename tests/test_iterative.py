@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+from jsonscreamer import Validator
+from jsonscreamer.types import ValidationError
+
+TREE = {
+    "type": "object",
+    "required": ["name"],
+    "properties": {
+        "name": {"type": "string", "maxLength": 8},
+        "children": {"type": "array", "items": {"$ref": "#"}},
+    },
+}
+
+
+def _deep_tree(depth: int, leaf_name: str = "leaf") -> dict:
+    tree: dict = {"name": leaf_name}
+    for _ in range(depth):
+        tree = {"name": "node", "children": [tree]}
+    return tree
+
+
+def test_deep_document():
+    validator = Validator(TREE, iterative=True)
+    deep = _deep_tree(20_000)
+
+    assert validator.is_valid(deep)
+    validator.validate(deep)
+
+    with pytest.raises(RecursionError):
+        Validator(TREE).is_valid(deep)
+
+
+def test_deep_document_error_path():
+    validator = Validator(TREE, iterative=True)
+    deep = _deep_tree(5_000, leaf_name="much too long")
+
+    assert not validator.is_valid(deep)
+    with pytest.raises(ValidationError) as exc_info:
+        validator.validate(deep)
+
+    err = exc_info.value
+    assert err.absolute_path == ("children", 0) * 5_000 + ("name",)
+    assert err.validator == "maxLength"
+
+
+def test_deep_document_all_errors():
+    validator = Validator(TREE, iterative=True)
+    deep = _deep_tree(20_000, leaf_name="much too long")
+    deep["name"] = 1
+
+    errors = list(validator.iter_errors(deep))
+    assert [(e.validator, e.absolute_path) for e in errors] == [
+        ("type", ("name",)),
+        ("maxLength", ("children", 0) * 20_000 + ("name",)),
+    ]
+
+    batch = validator.validate_many([deep, {"name": "leaf"}], mode="all")
+    assert [len(batch.errors[0])] == [2]
+    assert list(batch.invalid()) == [0]
+    assert list(validator.columnar_errors([deep])) == [0]
+
+
+@pytest.mark.parametrize(
+    "schema,instance",
+    (
+        (TREE, {"name": 1, "children": [{"name": "much too long"}, {}, 3]}),
+        (
+            {"items": {"type": "integer"}, "allOf": [{"minItems": 3}, {"maxItems": 1}]},
+            ["a", 1, "b"],
+        ),
+        (
+            {
+                "properties": {"a": {"minimum": 3}},
+                "patternProperties": {"^b": {"type": "string"}},
+                "additionalProperties": {"type": "null"},
+                "propertyNames": {"maxLength": 2},
+            },
+            {"a": 1, "bb": 2, "ccc": 3},
+        ),
+        (
+            {"items": [{"type": "string"}], "additionalItems": {"type": "null"}},
+            [1, 2, None, 3],
+        ),
+        ({"if": {"type": "integer"}, "then": {"minimum": 3}, "else": False}, 1),
+        ({"anyOf": [{"type": "string"}, {"minimum": 3}], "maximum": 0}, 1),
+    ),
+)
+def test_all_errors_match_error_engine(schema, instance):
+    def summary(validator):
+        errors = validator.iter_errors(instance)
+        return sorted((e.absolute_path, e.validator, e.message) for e in errors)
+
+    assert summary(Validator(schema, iterative=True)) == summary(Validator(schema))
+
+
+@pytest.mark.parametrize(
+    "schema,instance,keyword",
+    (
+        ({"anyOf": [{"type": "string"}, {"minimum": 3}]}, 1, "anyOf"),
+        ({"oneOf": [{"minimum": 1}, {"maximum": 3}]}, 2, "oneOf"),
+        ({"not": {"type": "integer"}}, 1, "not"),
+        ({"contains": {"type": "string"}}, [1, 2], "contains"),
+        ({"dependencies": {"a": {"required": ["b"]}}}, {"a": 1}, "dependencies"),
+        ({"dependencies": {"a": ["b"]}}, {"a": 1}, "dependencies"),
+        ({"if": {"type": "integer"}, "then": {"minimum": 3}}, 1, "minimum"),
+        ({"propertyNames": {"maxLength": 1}}, {"ab": 1}, "maxLength"),
+    ),
+)
+def test_matches_error_engine(schema, instance, keyword):
+    expected = next(Validator(schema).iter_errors(instance))
+
+    with pytest.raises(ValidationError) as exc_info:
+        Validator(schema, iterative=True).validate(instance)
+
+    assert exc_info.value.validator == keyword
+    assert exc_info.value.absolute_path == expected.absolute_path
+    assert exc_info.value.message == expected.message
+
+
+def test_left_recursion_terminates():
+    # Run apart, so that a regression can be killed rather than hang the suite
+    script = """if True:
+        from jsonscreamer import Validator
+        schema = {"anyOf": [{"$ref": "#"}, {"type": "string"}]}
+        validator = Validator(schema, iterative=True)
+        for check in validator.is_valid, validator.validate:
+            try:
+                check(1)
+            except RecursionError:
+                pass
+            else:
+                raise AssertionError("expected a RecursionError")
+    """
+    subprocess.run([sys.executable, "-c", script], check=True, timeout=30)
+
+
+def test_shared_subtrees_evaluated_once():
+    # Each level reaches the next one along two paths
+    depth = 16
+    definitions: dict = {f"d{depth}": {"format": "counted"}}
+    for i in range(depth):
+        ref = {"$ref": f"#/definitions/d{i + 1}"}
+        definitions[f"d{i}"] = {"oneOf": [ref, {"not": ref}]}
+    schema = {"definitions": definitions, "$ref": "#/definitions/d0"}
+
+    seen: list[str] = []
+
+    def counted(x: str) -> bool:
+        seen.append(x)
+        return True
+
+    validator = Validator(schema, formats={"counted": counted}, iterative=True)
+    assert validator.is_valid("spam")
+    assert len(seen) <= 2
+
+
+def test_remembered_failures_keep_their_path():
+    # The pair first fails under "a", where `not` turns it into a success, and
+    # is remembered when it fails again under "b"
+    small = {"items": {"maximum": 1}}
+    schema = {"properties": {"a": {"not": small}, "b": {"allOf": [small]}}}
+    shared = [0, 5]
+    instance = {"a": shared, "b": shared}
+
+    with pytest.raises(ValidationError) as info:
+        Validator(schema, iterative=True).validate(instance)
+    assert info.value.absolute_path == ("b", 1)
+    assert info.value.message == "5 > 1"
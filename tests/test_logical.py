@@ -2,13 +2,17 @@ from __future__ import annotations
 
 from unittest import mock
 
-from jsonscreamer.format import FORMATS
-from jsonscreamer.logical import all_of, any_of, not_, one_of
+import pytest
+
+from jsonscreamer import Validator
+from jsonscreamer.logical import all_of, any_of, not_, one_of, one_of_check
+
+from .helpers import errors_for, make_context
 
 
 def test_not():
-    assert list(not_({"not": False}, mock.Mock())("spam", [])) == []
-    assert list(not_({"not": True}, mock.Mock())("spam", []))
+    assert errors_for(not_({"not": False}, mock.Mock()), "spam") == []
+    assert errors_for(not_({"not": True}, mock.Mock()), "spam")
 
 
 def test_all_of():
@@ -20,12 +24,12 @@ def test_all_of():
                 True,
             ],
         },
-        mock.Mock(formats=FORMATS),
+        make_context(),
     )
 
-    assert list(validator("alice@bob.com", [])) == []
-    assert list(validator("alice", []))
-    assert list(validator(42, []))
+    assert errors_for(validator, "alice@bob.com") == []
+    assert errors_for(validator, "alice")
+    assert errors_for(validator, 42)
 
 
 def test_any_of():
@@ -37,12 +41,12 @@ def test_any_of():
                 False,
             ]
         },
-        mock.Mock(),
+        make_context(),
     )
 
-    assert list(validator("42", [])) == []
-    assert list(validator(42, [])) == []
-    assert list(validator(True, []))
+    assert errors_for(validator, "42") == []
+    assert errors_for(validator, 42) == []
+    assert errors_for(validator, True)
 
 
 def test_one_of():
@@ -53,10 +57,129 @@ def test_one_of():
                 {"required": ["eggs"]},
             ]
         },
-        mock.Mock(),
+        make_context(),
+    )
+
+    assert errors_for(validator, {"spam": 42}) == []
+    assert errors_for(validator, {"eggs": 42}) == []
+    assert errors_for(validator, {"spam": 42, "eggs": 42})
+    assert errors_for(validator, {})
+
+
+def test_one_of_check():
+    check = one_of_check(
+        {
+            "oneOf": [
+                {"required": ["spam"]},
+                {"required": ["eggs"]},
+                {"required": ["ham"]},
+            ]
+        },
+        make_context(),
     )
 
-    assert list(validator({"spam": 42}, [])) == []
-    assert list(validator({"eggs": 42}, [])) == []
-    assert list(validator({"spam": 42, "eggs": 42}, []))
-    assert list(validator({}, []))
+    assert check({"spam": 42})
+    assert check({"eggs": 42})
+    assert not check({"spam": 42, "eggs": 42})
+    assert not check({"spam": 42, "eggs": 42, "ham": 42})
+    assert not check({})
+
+
+POLYMORPHIC = {
+    "definitions": {"circle": {"properties": {"kind": {"enum": ["circle", "disc"]}}}},
+    "oneOf": [
+        {"$ref": "#/definitions/circle"},
+        {"properties": {"kind": {"const": "square"}}, "required": ["side"]},
+        {"allOf": [{"properties": {"kind": {"enum": ["square", "rect"]}}}]},
+        {"properties": {"kind": {"const": 1}, "n": {"format": "counted"}}},
+        {"required": ["custom"]},
+    ],
+}
+INSTANCES = [
+    {"kind": "circle"},
+    {"kind": "disc", "custom": 1},
+    {"kind": "square"},
+    {"kind": "square", "side": 1},
+    {"kind": "rect"},
+    {"kind": 1.0},
+    {"kind": True},
+    {"kind": [1]},
+    {"kind": "hexagon", "custom": 1},
+    {"kind": "hexagon"},
+    {"custom": 1},
+    {},
+    "square",
+]
+
+
+def _undiscriminated(schema: dict, keyword: str) -> dict:
+    # Hides the branches' pins from the compiler
+    branches = [{"not": {"not": s}} for s in schema[keyword]]
+    return {**schema, keyword: branches}
+
+
+@pytest.mark.parametrize("keyword", ["oneOf", "anyOf"])
+def test_discriminator_agrees(keyword: str):
+    schema = {"definitions": POLYMORPHIC["definitions"], keyword: POLYMORPHIC["oneOf"]}
+    validator = Validator(schema, formats={"counted": lambda x: True})
+    reference = Validator(
+        _undiscriminated(schema, keyword), formats={"counted": lambda x: True}
+    )
+
+    for instance in INSTANCES:
+        expected = reference.is_valid(instance)
+        assert validator.is_valid(instance) == expected, instance
+        assert (not list(validator.iter_errors(instance))) == expected, instance
+
+
+def test_discriminator_skips_branches():
+    calls: list[str] = []
+
+    def counted(x: str) -> bool:
+        calls.append(x)
+        return True
+
+    validator = Validator(POLYMORPHIC, formats={"counted": counted})
+
+    assert validator.is_valid({"kind": 1, "n": "a"})
+    assert not validator.is_valid({"kind": "square", "side": 1, "n": "b"})
+    assert calls == ["a"]
+
+
+def test_if_ladder():
+    schema = {
+        "type": "object",
+        "if": {"properties": {"kind": {"const": "a"}}, "required": ["kind"]},
+        "then": {"required": ["x"]},
+        "else": {
+            "if": {"properties": {"kind": {"enum": ["a", "b"]}}},
+            "then": {"required": ["y"]},
+            "else": {
+                "if": {"properties": {"kind": {"const": "c"}}},
+                "then": False,
+                "else": {"required": ["z"]},
+            },
+        },
+    }
+    reference = {**schema, "if": {"not": {"not": schema["if"]}}}
+    instances = [
+        {"kind": "a", "x": 1},
+        {"kind": "a", "y": 1},
+        {"kind": "b", "y": 1},
+        {"kind": "b", "x": 1},
+        {"kind": "c", "z": 1},
+        {"kind": "d", "z": 1},
+        {"kind": "d"},
+        {"x": 1},
+        {"z": 1},
+        [],
+    ]
+
+    validator, expected = Validator(schema), Validator(reference)
+    for instance in instances:
+        assert validator.is_valid(instance) == expected.is_valid(instance), instance
+        assert _messages(validator, instance) == _messages(expected, instance)
+
+
+def _messages(validator: Validator, instance: object) -> list[str]:
+    return [e.message for e in validator.iter_errors(instance)]
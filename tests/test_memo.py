@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import pytest
+
+from jsonscreamer import Validator
+
+DEPTH = 12
+
+
+def _nested(depth: int) -> dict:
+    # Each level reaches the next one along two paths
+    definitions: dict = {f"d{depth}": {"format": "counted"}}
+    for i in range(depth):
+        ref = {"$ref": f"#/definitions/d{i + 1}"}
+        definitions[f"d{i}"] = {"oneOf": [ref, {"not": ref}]}
+    return {"definitions": definitions, "$ref": "#/definitions/d0"}
+
+
+@pytest.mark.parametrize(("memo", "calls"), [(False, 2**DEPTH), (True, 1)])
+def test_memo_stops_blowup(memo: bool, calls: int):
+    seen: list[str] = []
+
+    def counted(x: str) -> bool:
+        seen.append(x)
+        return True
+
+    validator = Validator(_nested(DEPTH), formats={"counted": counted}, memo=memo)
+
+    assert validator.is_valid("spam")
+    assert len(seen) == calls
+
+    # nothing is remembered between validations
+    seen.clear()
+    assert list(validator.iter_errors("eggs")) == []
+    assert len(seen) == calls
+
+
+def test_memo_iterative():
+    seen: list[str] = []
+
+    def counted(x: str) -> bool:
+        seen.append(x)
+        return True
+
+    validator = Validator(
+        _nested(DEPTH), formats={"counted": counted}, memo=True, iterative=True
+    )
+
+    # the machine remembers outcomes itself, errors included
+    assert validator.is_valid("spam")
+    calls = len(seen)
+    assert calls <= 2
+
+    validator.validate("spam")
+    assert list(validator.iter_errors("spam")) == []
+    assert len(seen) == 3 * calls
+
+
+def test_memo_agrees():
+    schema = {
+        "definitions": {"positive": {"type": "integer", "minimum": 1}},
+        "type": "array",
+        "items": {
+            "oneOf": [
+                {"$ref": "#/definitions/positive"},
+                {"not": {"$ref": "#/definitions/positive"}, "type": "integer"},
+                {"type": "string"},
+            ]
+        },
+        "contains": {"$ref": "#/definitions/positive"},
+    }
+    instances = [[1, 2], [1, -1, "a"], [-1], [], [1, None], [True, 1]]
+
+    default, memoised = Validator(schema), Validator(schema, memo=True)
+    for instance in instances:
+        assert memoised.is_valid(instance) == default.is_valid(instance), instance
+        assert [e.message for e in memoised.iter_errors(instance)] == [
+            e.message for e in default.iter_errors(instance)
+        ]
+
+
+def test_one_of_stops_at_second_match():
+    seen: list[str] = []
+
+    def counted(x: str) -> bool:
+        seen.append(x)
+        return True
+
+    validator = Validator(
+        {"oneOf": [{"type": "string"}, True, {"format": "counted"}]},
+        formats={"counted": counted},
+    )
+
+    (error,) = validator.iter_errors("spam")
+    assert error.message == "'spam' satisfied more than one of the conditions"
+    assert seen == []
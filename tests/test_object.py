@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from jsonscreamer import Validator
+from jsonscreamer.object_ import additional_keys, classify_keys
+
+SCHEMA = {
+    "type": "object",
+    "properties": {"id": {"type": "integer"}},
+    "patternProperties": {"^x_": {"type": "string"}, "^n_": {"type": "number"}},
+    "additionalProperties": False,
+    "propertyNames": {"format": "counted"},
+    "required": ["id"],
+    "dependencies": {"x_a": ["x_b"]},
+    "maxProperties": 4,
+}
+
+
+def test_shape_check():
+    calls: list[str] = []
+
+    def counted(x: str) -> bool:
+        calls.append(x)
+        return True
+
+    validator = Validator(SCHEMA, formats={"counted": counted})
+
+    assert validator.is_valid({"id": 1, "x_a": "a", "x_b": "b", "n_m": 1})
+    assert len(calls) == 4
+
+    # same keys: the property names are not checked again, but values are
+    assert validator.is_valid({"id": 2, "x_a": "c", "x_b": "d", "n_m": 2.5})
+    assert not validator.is_valid({"id": 2, "x_a": "c", "x_b": "d", "n_m": "e"})
+    assert not validator.is_valid({"id": 2, "x_a": 3, "x_b": "d", "n_m": 2.5})
+    assert len(calls) == 4
+
+    assert not validator.is_valid({"x_b": "b"})  # required
+    assert not validator.is_valid({"id": 1, "x_a": "a"})  # dependencies
+    assert not validator.is_valid({"id": 1, "spam": "a"})  # additionalProperties
+    assert not validator.is_valid({"id": 1, "x_1": "", "x_2": "", "x_3": "", "x_4": ""})
+
+
+def test_shape_check_agrees_with_errors():
+    validator = Validator(SCHEMA, formats={"counted": lambda x: x != "x_bad"})
+    instances = [
+        {"id": 1},
+        {"id": 1, "x_bad": "a"},
+        {"id": 1, "n_m": "a"},
+        {"id": 1, "x_a": "a", "x_b": "b"},
+        {"id": 1, "x_a": "a"},
+        {"x_a": "a"},
+        [],
+    ]
+
+    for instance in instances * 2:  # both cold and cached
+        errors = list(validator.iter_errors(instance))
+        assert validator.is_valid(instance) == (not errors), instance
+
+
+def test_object_check_single_pass():
+    seen: list[str] = []
+
+    def counted(x: str) -> bool:
+        seen.append(x)
+        return True
+
+    schema = {
+        "type": "object",
+        "properties": {"a": {"format": "counted"}, "b": {"type": "integer"}},
+        "additionalProperties": {"type": "string", "format": "counted"},
+        "required": ["a", "b"],
+        "dependencies": {"c": {"required": ["d"]}},
+        "minProperties": 2,
+    }
+    validator = Validator(schema, formats={"counted": counted})
+
+    assert validator.is_valid({"a": "1", "b": 2, "c": "3", "d": "4"})
+    assert seen == ["1", "3", "4"]  # each value is visited once
+
+    assert not validator.is_valid({"a": "1"})  # required
+    assert not validator.is_valid({"a": "1", "b": "2"})  # properties
+    assert not validator.is_valid({"a": "1", "b": 2, "c": 3})  # additionalProperties
+    assert not validator.is_valid({"a": "1", "b": 2, "c": "3"})  # dependencies
+
+    errors = list(validator.iter_errors({"b": 2, "c": "3"}))
+    assert sorted(e.validator for e in errors) == ["dependencies", "required"]
+
+
+@pytest.mark.parametrize(
+    "patterns",
+    [
+        ["^x_", "_y$", "z", "^$"],
+        ["^(x)_", "z"],  # groups: searched one at a time
+        ["(?i)^X_", "z"],  # inline flags: searched one at a time
+    ],
+)
+def test_classify_keys(patterns: list[str]):
+    rexes = [re.compile(p) for p in patterns]
+    classify = classify_keys(rexes)
+
+    for key in ["x_y", "x_", "az", "", "X_z", "y_x", "zz\nx_"] * 2:
+        expected = tuple(ix for ix, r in enumerate(rexes) if r.search(key))
+        assert classify(key) == expected, key
+
+
+def test_additional_keys():
+    is_additional = additional_keys(
+        {"properties": {"a": True}, "patternProperties": {"^x_": True, "y": True}}
+    )
+    assert not is_additional("a")
+    assert not is_additional("x_a")
+    assert not is_additional("yy")
+    assert is_additional("b")
+    assert is_additional("ab")
+
+
+def test_property_names_checked_once():
+    calls: list[str] = []
+
+    def counted(x: str) -> bool:
+        calls.append(x)
+        return x != "bad"
+
+    validator = Validator(
+        {"propertyNames": {"format": "counted"}}, formats={"counted": counted}
+    )
+    for i in range(3):
+        assert validator.is_valid({"a": 1, str(i): 2})
+    assert sorted(calls) == ["0", "1", "2", "a"]
+
+    errors = list(validator.iter_errors({"a": 1, "bad": 2}))
+    assert [e.validator for e in errors] == ["format"]
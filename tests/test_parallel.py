@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import pytest
+
+from jsonscreamer import Validator, parallel
+from jsonscreamer.types import ValidationError
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "integer", "minimum": 0},
+        "tags": {"type": "array", "items": {"type": "string", "maxLength": 3}},
+    },
+    "required": ["id"],
+}
+INSTANCES = [
+    {"id": 1, "tags": ["a"]},
+    {"id": -1},
+    {"tags": []},
+    {"id": 2, "tags": ["abcd", 5]},
+    "nope",
+    {"id": 3},
+] * 7
+
+
+def _messages(errors: dict[int, list[ValidationError]]) -> dict[int, list[str]]:
+    return {ix: [err.message for err in errs] for ix, errs in errors.items()}
+
+
+@pytest.mark.parametrize("start_method", [None, "spawn"])
+@pytest.mark.parametrize("mode", ["flag", "first", "all"])
+def test_agrees_with_validate_many(start_method, mode):
+    expected = Validator(SCHEMA).validate_many(INSTANCES, mode)
+
+    with parallel.ParallelValidator(
+        SCHEMA, workers=2, start_method=start_method
+    ) as validator:
+        result = validator.validate_many(iter(INSTANCES), mode, chunksize=4)
+        again = validator.validate_many(INSTANCES, mode, chunksize=100)
+
+    for got in result, again:
+        assert got.valid == expected.valid
+        assert _messages(got.errors) == _messages(expected.errors)
+
+
+def test_validate_parallel():
+    result = parallel.validate_parallel(
+        {"type": "integer"}, range(10), mode="first", chunksize=3, workers=2
+    )
+    assert len(result) == 10
+    assert list(result.invalid()) == []
+
+    assert len(parallel.validate_parallel(True, [], workers=1)) == 0
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValidationError):
+        parallel.ParallelValidator({"type": 12})
+    with pytest.raises(TypeError, match="processes"):
+        parallel.ParallelValidator(True, processes=2)
+    with pytest.raises(ValueError, match="lazily"):
+        parallel.ParallelValidator(True, iterative=True, lazy=True)
+    with pytest.raises(ValueError, match="workers"):
+        parallel.ParallelValidator(True, workers=0)
+
+    with parallel.ParallelValidator(True, workers=1) as validator:
+        with pytest.raises(ValueError, match="chunksize"):
+            validator.validate_many([1], chunksize=0)
+        with pytest.raises(ValueError, match="mode"):
+            validator.validate_many([1], mode="some")  # type: ignore (invalid)
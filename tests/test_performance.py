@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import datetime
+import ipaddress
 import time
+import uuid
 
 import pytest
 
-from jsonscreamer import Validator
+from jsonscreamer import Validator, format
 
 from .test_complex import POST_BODY, SCHEMA
 
@@ -47,3 +50,127 @@ def test_validate(variant: str):
     for _ in range(10_000):
         validator.is_valid(POST_BODY)
     print(time.monotonic() - t0)
+
+
+def _nested(depth: int) -> tuple[dict, dict]:
+    """A schema nested `depth` objects deep, with an error at every level."""
+    schema: dict = {"type": "string", "maxLength": 3}
+    instance: dict | str = "too long"
+    for _ in range(depth):
+        schema = {
+            "type": "object",
+            "properties": {"child": schema, "other": {"type": "integer"}},
+        }
+        instance = {"child": instance, "other": "not an integer"}
+
+    return schema, instance  # type: ignore
+
+
+@pytest.mark.parametrize("depth", (1, 10, 50, 100, 200))
+def test_iter_errors_depth(depth: int):
+    schema, instance = _nested(depth)
+    # the metaschema check itself recurses through every level of the schema
+    validator = Validator(schema, check_schema=False)
+    assert len(list(validator.iter_errors(instance))) == depth + 1
+
+    t0 = time.monotonic()
+    for _ in range(1_000):
+        list(validator.iter_errors(instance))
+    print(depth, time.monotonic() - t0)
+
+
+def test_compile_repeated_fragments():
+    # Like large generated schemas: many records built from the same fragments
+    fragments = [
+        {"type": "string", "maxLength": 255},
+        {"type": "number", "minimum": 0},
+        {"type": "string", "format": "date"},
+    ]
+    record = {
+        "type": "object",
+        "properties": {f"field{i}": fragments[i % 3] for i in range(30)},
+        "required": ["field0"],
+    }
+    schema = {
+        "type": "object",
+        "properties": {
+            f"record{i}": {"type": "array", "items": dict(record, title=f"{i}")}
+            for i in range(100)
+        },
+    }
+
+    t0 = time.monotonic()
+    validator = Validator(schema, check_schema=False)
+    print(time.monotonic() - t0, "compilations saved:", validator._context.shared)
+    assert validator._context.shared >= 100 * 27
+
+
+def test_compile_depth():
+    # Compiling a level should cost the same however deep it sits
+    def best_time(depth: int) -> float:
+        schema, _ = _nested(depth)
+        times = []
+        for _ in range(3):
+            t0 = time.perf_counter()
+            Validator(schema, check_schema=False)
+            times.append(time.perf_counter() - t0)
+        return min(times)
+
+    shallow, deep = best_time(20), best_time(200)
+    print(shallow, deep)
+    assert deep < 25 * shallow  # (rather than 100 times, if it were quadratic)
+
+
+def _raises_value_error(parse):
+    # How the format checkers used to work: parse, and catch the failure
+    def check(x: str) -> bool:
+        try:
+            parse(x)
+            return True
+        except ValueError:
+            return False
+
+    return check
+
+
+_STRPTIME = _raises_value_error(
+    lambda x: datetime.datetime.strptime(x, "%Y-%m-%dT%H:%M:%S%z")
+)
+_PARSING_FORMATS = {
+    "date-time": _STRPTIME,
+    "date": _raises_value_error(datetime.date.fromisoformat),
+    "time": lambda x: _STRPTIME("1970-01-01T" + x),
+    "uuid": _raises_value_error(uuid.UUID),
+    "ipv4": _raises_value_error(ipaddress.IPv4Address),
+    "ipv6": _raises_value_error(ipaddress.IPv6Address),
+}
+
+
+@pytest.mark.parametrize(
+    ("name", "valid", "invalid"),
+    (
+        ("date-time", "2020-01-02T03:04:05+01:00", "2020-02-30T03:04:05Z"),
+        ("date", "2020-01-02", "2020-13-02"),
+        ("time", "03:04:05Z", "03:04:60Z"),
+        ("uuid", "6e6659ec-4503-4428-9f03-2e2ea4d6c278", "6e6659ec-4503-4428"),
+        ("ipv4", "192.168.0.1", "192.168.0.256"),
+        ("ipv6", "2001:db8::8a2e:370:7334", "2001:db8::8a2e::7334"),
+        ("duration", "P1Y2M3DT4H5M6S", "P1Y2M3DT"),
+    ),
+)
+def test_format_checkers(name: str, valid: str, invalid: str):
+    variants = {"scanning": format.FORMATS[name]}
+    if name in _PARSING_FORMATS:
+        variants["parsing"] = _PARSING_FORMATS[name]
+    if name == "date-time":
+        variants["fromisoformat"] = format.is_date_time_iso
+
+    for variant, checker in variants.items():
+        assert checker(valid)
+        assert not checker(invalid)
+
+        t0 = time.monotonic()
+        for _ in range(10_000):
+            checker(valid)
+            checker(invalid)
+        print(name, variant, time.monotonic() - t0)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from jsonscreamer import Validator, regex
+
+STRINGS = ["", "abc", "abc\n", "xabc", "abcx", "xabcx", "ab", "a.c", "a\\c", "ABC"]
+
+
+@pytest.mark.parametrize(
+    ("pattern", "strategy"),
+    [
+        ("^abc", "prefix"),
+        ("abc$", "suffix"),
+        ("^abc$", "exact"),
+        ("abc", "substring"),
+        (r"^a\.c$", "exact"),
+        (r"abc\$", "substring"),
+        ("^", "prefix"),
+        ("a.c", "regex"),
+        (r"^\d+$", "regex"),
+        (r"a\\$", "regex"),
+        ("(?i)abc", "regex"),
+    ],
+)
+def test_searcher(pattern: str, strategy: str):
+    assert regex._lowered(pattern)[0] == strategy
+
+    search = regex.searcher(pattern)
+    for x in STRINGS:
+        assert search(x) == bool(re.search(pattern, x)), x
+
+
+def test_compiled_is_shared():
+    assert regex.compiled("^[a-z]+$") is regex.compiled("^[a-z]+$")
+
+
+def test_memo(monkeypatch):
+    monkeypatch.setattr(regex, "MEMO_SIZE", 2)
+    monkeypatch.setattr(regex, "PROFILE", True)
+    regex.reset_stats()
+
+    validator = Validator({"pattern": "^[A-Z]{3}[0-9]?$"})
+    for x in ["GBP", "EUR", "GBP", "GBP", "gbp"]:
+        validator.is_valid(x)
+
+    (row,) = regex.stats()
+    assert row.pattern == "^[A-Z]{3}[0-9]?$"
+    assert row.calls == 5
+    assert row.memo_hits == 2
+
+    regex.reset_stats()
+    assert regex.stats() == []
+
+
+def test_stats_order(monkeypatch):
+    monkeypatch.setattr(regex, "PROFILE", True)
+    regex.reset_stats()
+
+    validator = Validator(
+        {
+            "properties": {
+                "a": {"pattern": "^a"},
+                "b": {"pattern": "(x+x+)+y"},
+            }
+        }
+    )
+    validator.is_valid({"a": "abc", "b": "x" * 18})
+
+    assert [row.pattern for row in regex.stats()] == ["(x+x+)+y", "^a"]
+    regex.reset_stats()
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from jsonscreamer import Validator
+
+SCHEMA = {
+    "definitions": {
+        "node": {
+            "anyOf": [
+                {"type": "integer", "minimum": 0},
+                {"type": "array", "items": {"$ref": "#/definitions/node"}},
+            ]
+        }
+    },
+    "type": "object",
+    "properties": {"tree": {"$ref": "#/definitions/node"}, "name": {"type": "string"}},
+    "required": ["tree"],
+}
+INSTANCES = [
+    {"tree": [1, [2, [3]]], "name": "a"},
+    {"tree": [1, [-2]]},
+    {"name": "b"},
+    {"tree": 5, "name": 6},
+] * 50
+
+
+def _hammer(target, threads: int = 8) -> None:
+    # Start every thread at once, to make races as likely as possible
+    barrier = threading.Barrier(threads)
+    failures: list[BaseException] = []
+
+    def run() -> None:
+        barrier.wait()
+        try:
+            target()
+        except BaseException as exc:  # reported below
+            failures.append(exc)
+
+    workers = [threading.Thread(target=run) for _ in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    assert failures == []
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"lazy": True}, {"adaptive": True}, {"memo": True}, {"iterative": True}],
+)
+def test_shared_between_threads(options):
+    expected = [Validator(SCHEMA).is_valid(x) for x in INSTANCES]
+    validator = Validator(SCHEMA, **options)
+
+    def target() -> None:
+        for _ in range(5):
+            assert [validator.is_valid(x) for x in INSTANCES] == expected
+            result = validator.validate_many(INSTANCES, mode="first", chunksize=7)
+            assert list(result.valid) == expected
+            assert validator.columnar_errors(INSTANCES).keys() == set(result.invalid())
+
+    _hammer(target)
+
+
+def test_metavalidator_built_once(monkeypatch):
+    monkeypatch.setattr(Validator, "_metavalidator", None)
+    built: list[Validator] = []
+
+    def target() -> None:
+        built.append(Validator.metavalidator())
+
+    _hammer(target)
+    assert len({id(v) for v in built}) == 1